@@ -129,7 +129,7 @@ class AadharAgent(BaseSpecialistAgent):
     @traceable(name="AADHAAR_AGENT_HANDLE_STEP")
     async def handle_step(self, state, user_message):
         config = {"configurable": {"thread_id": state["session_id"]}}
-        checkpoint = self.graph.get_state(config)
+        checkpoint = await self.graph.aget_state(config)
         final_graph_state = None
 
         if checkpoint and checkpoint.next:
@@ -140,7 +140,7 @@ class AadharAgent(BaseSpecialistAgent):
                 else:
                     final_graph_state = await self.graph.ainvoke(None, config=config)
             except Interrupt:
-                checkpoint = self.graph.get_state(config)
+                checkpoint = await self.graph.aget_state(config)
                 final_graph_state = checkpoint.values
 
         else:
@@ -158,7 +158,7 @@ class AadharAgent(BaseSpecialistAgent):
             try:
                 final_graph_state = await self.graph.ainvoke(graph_input, config=config)
             except Interrupt:
-                checkpoint = self.graph.get_state(config)
+                checkpoint = await self.graph.aget_state(config)
                 final_graph_state = checkpoint.values
             
         state["verified_data"] = final_graph_state.get("verified_data", {})
@@ -382,15 +382,15 @@ import time
 from pathlib import Path
 
 from langgraph.graph import StateGraph, START, END
-from langgraph.checkpoint.memory import InMemorySaver # Use a persistent checkpointer in production
 from langgraph.types import Command, Interrupt
 from langsmith import traceable
 
 # Assuming these are in the correct paths
 from agent.base_agent import BaseSpecialistAgent
+from agent.checkpointer import get_checkpointer
 from tools import aadhar_tools
 from state import OverallState, AadharGraphState, AadharDetailsState, VerificationState
-from llm import LLMFactory
+from llm import get_llm_factory
 from tools.ocr_tool import OCR
 from api.ocr_api import DocumentIntelligenceService
 from prompts.aadhar_prompts import (
@@ -409,10 +409,11 @@ class AadharAgent(BaseSpecialistAgent):
     """
     An expert agent for Aadhaar verification, implemented as a robust, interruptible LangGraph state machine.
     """
+    graph_name = "aadhaar"
+
     def __init__(self):
         self.all_workflows: Set[str] = {"aadhaar", "pan", "form60", "passport", "dl"}
-        self.llm_client = LLMFactory()
-        self.full_workflow_retry = 0  # Added for image processing retry counter
+        self.llm_client = get_llm_factory()
         
         # OCR related components
         self.ocr = OCR()
@@ -531,7 +532,7 @@ class AadharAgent(BaseSpecialistAgent):
         builder.add_edge("handle_data_mismatch", END) 
         
         # --- Graph Compilation with UPDATED Interruption Pattern ---
-        checkpointer = InMemorySaver()
+        checkpointer = get_checkpointer()
         self.graph = builder.compile(
             checkpointer=checkpointer,
             interrupt_after=["choose_method", "prompt_for_aadhaar", "prompt_for_confirmation", "prompt_for_otp", 
@@ -540,8 +541,8 @@ class AadharAgent(BaseSpecialistAgent):
 
     @traceable(name="AADHAAR_AGENT_HANDLE_STEP")
     async def handle_step(self, state, user_message):
-        config = {"configurable": {"thread_id": state["session_id"]}}
-        checkpoint = self.graph.get_state(config)
+        config = self.graph_config(state["session_id"])
+        checkpoint = await self.graph.aget_state(config)
         final_graph_state = None
 
         if checkpoint and checkpoint.next:
@@ -552,7 +553,7 @@ class AadharAgent(BaseSpecialistAgent):
                 else:
                     final_graph_state = await self.graph.ainvoke(None, config=config)
             except Interrupt:
-                checkpoint = self.graph.get_state(config)
+                checkpoint = await self.graph.aget_state(config)
                 final_graph_state = checkpoint.values
 
         else:
@@ -563,6 +564,7 @@ class AadharAgent(BaseSpecialistAgent):
                 "decision": None,
                 "otp_retries": state.get("otp_retries", 0),
                 "verified_data": state.get("verified_data",{}),
+                "full_workflow_retry": 0,
                 "last_executed_node": state.get("last_executed_node",""),
                 "status":"IN_PROGRESS"
             }
@@ -570,7 +572,7 @@ class AadharAgent(BaseSpecialistAgent):
             try:
                 final_graph_state = await self.graph.ainvoke(graph_input, config=config)
             except Interrupt:
-                checkpoint = self.graph.get_state(config)
+                checkpoint = await self.graph.aget_state(config)
                 final_graph_state = checkpoint.values
             
         state["verified_data"] = final_graph_state.get("verified_data", {})
@@ -734,7 +736,7 @@ class AadharAgent(BaseSpecialistAgent):
     @traceable
     def _accept_aadhar_image(self, state: AadharGraphState) -> AadharGraphState:
         """Prompts user to upload Aadhaar card image for OCR processing."""
-        if self.full_workflow_retry == 0:
+        if state.get("full_workflow_retry", 0) == 0:
             message = """The database verification didn't work. Let's try with your Aadhaar card image.
 
 Please upload a clear photo of your Aadhaar card (front side). Make sure:
@@ -758,11 +760,11 @@ Please re-upload your Aadhaar card photo ensuring:
     def _aadhar_ocr_extract(self, state: AadharGraphState) -> AadharGraphState:
         """Processes the uploaded Aadhaar card image using OCR."""
         print("Processing Aadhaar card image...")
-        self.full_workflow_retry += 1
+        full_workflow_retry = state.get("full_workflow_retry", 0) + 1
         
         time.sleep(2.0)  # Simulate processing time
         
-        if self.full_workflow_retry < 2:  # Allow up to 2 retries
+        if full_workflow_retry < 2:  # Allow up to 2 retries
             # Mock OCR response (in production, replace with actual OCR call)
             mock_details = {
                 "aadhar_number": "123456789012",
@@ -775,12 +777,14 @@ Please re-upload your Aadhaar card photo ensuring:
                 "response_to_user": "Aadhaar card image processed successfully. Let me show you the extracted details.",
                 "last_executed_node": "aadhar_ocr_extract",
                 "verified_data": mock_details,
+                "full_workflow_retry": full_workflow_retry,
                 "decision": "proceed"
             }
         else:
             return {
                 "response_to_user": "I'm having trouble processing your Aadhaar card image. Please contact customer support for assistance.",
                 "last_executed_node": "aadhar_ocr_extract",
+                "full_workflow_retry": full_workflow_retry,
                 "decision": "terminate"
             }
 
@@ -815,7 +819,7 @@ Are these details correct? Please reply with:
                 "verified_data": state["verified_data"],
                 "last_executed_node": "acknowledge_aadhar_details"
             }
-        elif "no" in user_response and self.full_workflow_retry < 2:
+        elif "no" in user_response and state.get("full_workflow_retry", 0) < 2:
             return {
                 "decision": "retry",
                 "last_executed_node": "acknowledge_aadhar_details"
@@ -1,9 +1,19 @@
 from abc import ABC, abstractmethod
-from typing import Tuple
+from typing import Tuple, Callable, Awaitable, Optional
 from state import OverallState
 
+# Optional per-turn listener used by the streaming endpoint; receives dicts like
+# {"type": "token", "content": "..."} or {"type": "progress", "stage": "..."}
+EventCallback = Optional[Callable[[dict], Awaitable[None]]]
+
 class BaseSpecialistAgent(ABC):
-    """Abstract base class defining the contract for all specialist document agents."""
+    """
+    Abstract base class defining the contract for all specialist document agents.
+    One instance serves every session, so per-session data must live in the graph state, never on the agent.
+    """
+
+    # Prefix of this agent's checkpoint threads in the shared checkpointer (agent/checkpointer.py)
+    graph_name: str = None
 
     @abstractmethod
     async def handle_step(self, state: OverallState, user_message: str):
@@ -11,4 +21,13 @@ class BaseSpecialistAgent(ABC):
         Handles the current step of its specific workflow.
         Receives the full state and returns the updated state and a user-facing message.
         """
-        pass
\ No newline at end of file
+        pass
+
+    def graph_config(self, session_id: str) -> dict:
+        return {"configurable": {"thread_id": f"{self.graph_name}:{session_id}"}}
+
+    async def clear_session(self, session_id: str) -> None:
+        """Drops the session's checkpoints; agents without a graph have nothing to clear."""
+        graph = getattr(self, "graph", None)
+        if graph is not None:
+            await graph.checkpointer.adelete_thread(self.graph_config(session_id)["configurable"]["thread_id"])
@@ -0,0 +1,531 @@
+# One LangGraph checkpointer shared by every specialist graph.
+# The graphs are compiled once per process, so all sessions' checkpoints live in the same saver.
+# Each agent keys its threads as "<graph_name>:<session_id>" (see BaseSpecialistAgent.graph_config),
+# so graphs with different state schemas never read each other's checkpoints.
+#
+# CHECKPOINTER_BACKEND picks where checkpoints live:
+#   memory - this process only (tests, benchmarks, local runs)
+#   sqlite - a file shared by every uvicorn worker on the host, survives restarts
+#   redis  - shared by every worker on every node, with an optional idle TTL per thread
+# Only the latest CHECKPOINTER_KEEP_LATEST checkpoints of a thread are kept. The agents only ever
+# resume from the latest one, so older checkpoints are pruned (with their pending writes) on every put.
+
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from collections import defaultdict
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+
+from config.config import get_settings
+from monitoring.metrics import record_checkpoint_write
+
+logger = logging.getLogger(__name__)
+
+# Serialized records at least this large are zlib-compressed; smaller ones don't shrink enough to pay for it
+COMPRESS_MIN_BYTES = 512
+
+# (task_id, idx, record) rows of one checkpoint's pending writes
+WriteRows = List[Tuple[str, int, bytes]]
+
+
+class MemoryCheckpointStore:
+    """Checkpoints in a dict. Nothing is shared with other processes or survives a restart."""
+    name = "memory"
+    blocking = False
+
+    def __init__(self):
+        # thread_id -> checkpoint_ns -> {checkpoint_id: record}
+        self._checkpoints: Dict[str, Dict[str, Dict[str, bytes]]] = defaultdict(lambda: defaultdict(dict))
+        # (thread_id, checkpoint_ns, checkpoint_id) -> {(task_id, idx): record}
+        self._writes: Dict[Tuple[str, str, str], Dict[Tuple[str, int], bytes]] = {}
+
+    def put_checkpoint(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str, record: bytes, keep_latest: int) -> int:
+        checkpoints = self._checkpoints[thread_id][checkpoint_ns]
+        checkpoints[checkpoint_id] = record
+        pruned = sorted(checkpoints)[:-keep_latest]
+        for old_id in pruned:
+            del checkpoints[old_id]
+            self._writes.pop((thread_id, checkpoint_ns, old_id), None)
+        return len(pruned)
+
+    def get_checkpoint(self, thread_id: str, checkpoint_ns: str, checkpoint_id: Optional[str]) -> Optional[Tuple[str, bytes]]:
+        checkpoints = self._checkpoints.get(thread_id, {}).get(checkpoint_ns)
+        if not checkpoints:
+            return None
+        if checkpoint_id is None:
+            checkpoint_id = max(checkpoints)
+        record = checkpoints.get(checkpoint_id)
+        return (checkpoint_id, record) if record is not None else None
+
+    def list_checkpoints(self, thread_id: str, checkpoint_ns: str) -> List[Tuple[str, bytes]]:
+        checkpoints = self._checkpoints.get(thread_id, {}).get(checkpoint_ns, {})
+        return sorted(checkpoints.items(), reverse=True)
+
+    def put_writes(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str, rows: WriteRows) -> None:
+        writes = self._writes.setdefault((thread_id, checkpoint_ns, checkpoint_id), {})
+        for task_id, idx, record in rows:
+            if idx >= 0 and (task_id, idx) in writes:
+                continue
+            writes[(task_id, idx)] = record
+
+    def get_writes(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> WriteRows:
+        writes = self._writes.get((thread_id, checkpoint_ns, checkpoint_id), {})
+        return [(task_id, idx, record) for (task_id, idx), record in writes.items()]
+
+    def delete_thread(self, thread_id: str) -> None:
+        self._checkpoints.pop(thread_id, None)
+        for key in [key for key in self._writes if key[0] == thread_id]:
+            del self._writes[key]
+
+
+class SqliteCheckpointStore:
+    """
+    Checkpoints in a SQLite file (WAL mode), so every uvicorn worker on the host sees the same
+    sessions and they survive a restart. One connection per process, serialized by a lock.
+    """
+    name = "sqlite"
+    blocking = True
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=10)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS checkpoints ("
+            "thread_id TEXT NOT NULL, checkpoint_ns TEXT NOT NULL, checkpoint_id TEXT NOT NULL, record BLOB NOT NULL, "
+            "PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id))"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS checkpoint_writes ("
+            "thread_id TEXT NOT NULL, checkpoint_ns TEXT NOT NULL, checkpoint_id TEXT NOT NULL, "
+            "task_id TEXT NOT NULL, idx INTEGER NOT NULL, record BLOB NOT NULL, "
+            "PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx))"
+        )
+
+    def put_checkpoint(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str, record: bytes, keep_latest: int) -> int:
+        key = (thread_id, checkpoint_ns)
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?)",
+                    (thread_id, checkpoint_ns, checkpoint_id, record)
+                )
+                pruned = [row[0] for row in self._db.execute(
+                    "SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+                    "ORDER BY checkpoint_id DESC LIMIT -1 OFFSET ?",
+                    (*key, keep_latest)
+                )]
+                if pruned:
+                    self._db.execute(
+                        "DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id <= ?",
+                        (*key, max(pruned))
+                    )
+                    self._db.execute(
+                        "DELETE FROM checkpoint_writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id <= ?",
+                        (*key, max(pruned))
+                    )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return len(pruned)
+
+    def get_checkpoint(self, thread_id: str, checkpoint_ns: str, checkpoint_id: Optional[str]) -> Optional[Tuple[str, bytes]]:
+        with self._lock:
+            if checkpoint_id is None:
+                row = self._db.execute(
+                    "SELECT checkpoint_id, record FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+                    "ORDER BY checkpoint_id DESC LIMIT 1",
+                    (thread_id, checkpoint_ns)
+                ).fetchone()
+            else:
+                row = self._db.execute(
+                    "SELECT checkpoint_id, record FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                    (thread_id, checkpoint_ns, checkpoint_id)
+                ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def list_checkpoints(self, thread_id: str, checkpoint_ns: str) -> List[Tuple[str, bytes]]:
+        with self._lock:
+            return [(row[0], row[1]) for row in self._db.execute(
+                "SELECT checkpoint_id, record FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+                "ORDER BY checkpoint_id DESC",
+                (thread_id, checkpoint_ns)
+            )]
+
+    def put_writes(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str, rows: WriteRows) -> None:
+        # Special channels (negative idx) replace an earlier write; regular writes are kept from the first attempt
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                for task_id, idx, record in rows:
+                    self._db.execute(
+                        f"INSERT OR {'REPLACE' if idx < 0 else 'IGNORE'} INTO checkpoint_writes VALUES (?, ?, ?, ?, ?, ?)",
+                        (thread_id, checkpoint_ns, checkpoint_id, task_id, idx, record)
+                    )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def get_writes(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> WriteRows:
+        with self._lock:
+            return [(row[0], row[1], row[2]) for row in self._db.execute(
+                "SELECT task_id, idx, record FROM checkpoint_writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                (thread_id, checkpoint_ns, checkpoint_id)
+            )]
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.execute("DELETE FROM checkpoints WHERE thread_id = ?", (thread_id,))
+                self._db.execute("DELETE FROM checkpoint_writes WHERE thread_id = ?", (thread_id,))
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+
+class RedisCheckpointStore:
+    """
+    Checkpoints in Redis, shared by every worker on every node. Per thread:
+        <prefix>:<thread_id>:namespaces               set of checkpoint namespaces
+        <prefix>:<thread_id>:<ns>:checkpoints         hash checkpoint_id -> record
+        <prefix>:<thread_id>:<ns>:writes              hash "<checkpoint_id>\\0<task_id>\\0<idx>" -> record
+    With `ttl_seconds`, every key of a thread expires that long after its last checkpoint.
+    """
+    name = "redis"
+    blocking = True
+
+    def __init__(self, client, prefix: str = "kyc:checkpoint", ttl_seconds: int = 0):
+        self._redis = client
+        self._prefix = prefix
+        self._ttl = ttl_seconds
+
+    def put_checkpoint(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str, record: bytes, keep_latest: int) -> int:
+        checkpoints_key, writes_key = self._keys(thread_id, checkpoint_ns)
+        namespaces_key = self._namespaces_key(thread_id)
+        pipe = self._redis.pipeline()
+        pipe.hset(checkpoints_key, checkpoint_id, record)
+        pipe.sadd(namespaces_key, checkpoint_ns)
+        pipe.hkeys(checkpoints_key)
+        pipe.hkeys(writes_key)
+        if self._ttl:
+            for key in (checkpoints_key, writes_key, namespaces_key):
+                pipe.expire(key, self._ttl)
+        results = pipe.execute()
+        checkpoint_ids, write_fields = results[2], results[3]
+
+        pruned = sorted(checkpoint_ids)[:-keep_latest]
+        if pruned:
+            pruned_set = set(pruned)
+            stale_fields = [field for field in write_fields if field.split(b"\0", 1)[0] in pruned_set]
+            pipe = self._redis.pipeline()
+            pipe.hdel(checkpoints_key, *pruned)
+            if stale_fields:
+                pipe.hdel(writes_key, *stale_fields)
+            pipe.execute()
+        return len(pruned)
+
+    def get_checkpoint(self, thread_id: str, checkpoint_ns: str, checkpoint_id: Optional[str]) -> Optional[Tuple[str, bytes]]:
+        checkpoints_key, _ = self._keys(thread_id, checkpoint_ns)
+        if checkpoint_id is not None:
+            record = self._redis.hget(checkpoints_key, checkpoint_id)
+            return (checkpoint_id, record) if record is not None else None
+        checkpoints = self.list_checkpoints(thread_id, checkpoint_ns)
+        return checkpoints[0] if checkpoints else None
+
+    def list_checkpoints(self, thread_id: str, checkpoint_ns: str) -> List[Tuple[str, bytes]]:
+        # Pruning keeps this hash at keep_latest entries, so reading all of it is cheap
+        checkpoints_key, _ = self._keys(thread_id, checkpoint_ns)
+        checkpoints = self._redis.hgetall(checkpoints_key)
+        return sorted(((key.decode(), record) for key, record in checkpoints.items()), reverse=True)
+
+    def put_writes(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str, rows: WriteRows) -> None:
+        _, writes_key = self._keys(thread_id, checkpoint_ns)
+        pipe = self._redis.pipeline()
+        for task_id, idx, record in rows:
+            field = f"{checkpoint_id}\0{task_id}\0{idx}"
+            if idx < 0:
+                pipe.hset(writes_key, field, record)
+            else:
+                pipe.hsetnx(writes_key, field, record)
+        if self._ttl:
+            pipe.expire(writes_key, self._ttl)
+        pipe.execute()
+
+    def get_writes(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> WriteRows:
+        _, writes_key = self._keys(thread_id, checkpoint_ns)
+        rows = []
+        prefix = f"{checkpoint_id}\0".encode()
+        for field, record in self._redis.hgetall(writes_key).items():
+            if field.startswith(prefix):
+                _, task_id, idx = field.decode().split("\0")
+                rows.append((task_id, int(idx), record))
+        return rows
+
+    def delete_thread(self, thread_id: str) -> None:
+        namespaces_key = self._namespaces_key(thread_id)
+        namespaces = [ns.decode() for ns in self._redis.smembers(namespaces_key)]
+        keys = [key for ns in namespaces for key in self._keys(thread_id, ns)]
+        self._redis.delete(namespaces_key, *keys)
+
+    def _namespaces_key(self, thread_id: str) -> str:
+        return f"{self._prefix}:{thread_id}:namespaces"
+
+    def _keys(self, thread_id: str, checkpoint_ns: str) -> Tuple[str, str]:
+        base = f"{self._prefix}:{thread_id}:{checkpoint_ns}"
+        return f"{base}:checkpoints", f"{base}:writes"
+
+
+class PruningCheckpointSaver(BaseCheckpointSaver):
+    """
+    LangGraph checkpointer over one of the stores above.
+
+    Each checkpoint is stored whole (channel values, metadata and parent id in one record)
+    rather than as per-channel blobs, so loading a session is a single read and pruning a
+    checkpoint never leaves orphaned blobs behind. Records are serialized with the graph's
+    serde and zlib-compressed once they reach COMPRESS_MIN_BYTES.
+    """
+    def __init__(self, store, keep_latest: int = 3, *, serde=None):
+        super().__init__(serde=serde)
+        self.store = store
+        self.keep_latest = max(1, keep_latest)
+
+        self.checkpoints_written = 0
+        self.checkpoints_pruned = 0
+        self.bytes_written = 0
+
+# -------------------------------------------------------------------------------------------------
+# PUBLIC FUNCTIONS
+# -------------------------------------------------------------------------------------------------
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        found = self.store.get_checkpoint(thread_id, checkpoint_ns, get_checkpoint_id(config))
+        if found is None:
+            return None
+        return self._to_tuple(thread_id, checkpoint_ns, *found)
+
+    def list(
+            self,
+            config: Optional[RunnableConfig],
+            *,
+            filter: Optional[Dict[str, Any]] = None,
+            before: Optional[RunnableConfig] = None,
+            limit: Optional[int] = None
+        ) -> Iterator[CheckpointTuple]:
+        """Checkpoints of one thread, newest first. Listing across threads is not supported."""
+        if config is None:
+            raise ValueError("PruningCheckpointSaver.list needs a config with a thread_id")
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        wanted_id = get_checkpoint_id(config)
+        before_id = get_checkpoint_id(before) if before else None
+
+        for checkpoint_id, record in self.store.list_checkpoints(thread_id, checkpoint_ns):
+            if wanted_id and checkpoint_id != wanted_id:
+                continue
+            if before_id and checkpoint_id >= before_id:
+                continue
+            checkpoint_tuple = self._to_tuple(thread_id, checkpoint_ns, checkpoint_id, record)
+            if filter and not all(checkpoint_tuple.metadata.get(k) == v for k, v in filter.items()):
+                continue
+            if limit is not None:
+                if limit <= 0:
+                    break
+                limit -= 1
+            yield checkpoint_tuple
+
+    def put(
+            self,
+            config: RunnableConfig,
+            checkpoint: Checkpoint,
+            metadata: CheckpointMetadata,
+            new_versions: ChannelVersions
+        ) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        started = time.perf_counter()
+        record = self._pack({
+            "checkpoint": checkpoint,
+            "metadata": get_checkpoint_metadata(config, metadata),
+            "parent_checkpoint_id": config["configurable"].get("checkpoint_id")
+        })
+        pruned = self.store.put_checkpoint(thread_id, checkpoint_ns, checkpoint["id"], record, self.keep_latest)
+        record_checkpoint_write(self.store.name, len(record), time.perf_counter() - started)
+
+        self.checkpoints_written += 1
+        self.checkpoints_pruned += pruned
+        self.bytes_written += len(record)
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+            self,
+            config: RunnableConfig,
+            writes: Sequence[Tuple[str, Any]],
+            task_id: str,
+            task_path: str = ""
+        ) -> None:
+        rows = [
+            (task_id, WRITES_IDX_MAP.get(channel, idx), self._pack((task_path, channel, value)))
+            for idx, (channel, value) in enumerate(writes)
+        ]
+        self.store.put_writes(
+            config["configurable"]["thread_id"],
+            config["configurable"].get("checkpoint_ns", ""),
+            config["configurable"]["checkpoint_id"],
+            rows
+        )
+
+    def delete_thread(self, thread_id: str) -> None:
+        self.store.delete_thread(thread_id)
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await self._run(self.get_tuple, config)
+
+    async def alist(
+            self,
+            config: Optional[RunnableConfig],
+            *,
+            filter: Optional[Dict[str, Any]] = None,
+            before: Optional[RunnableConfig] = None,
+            limit: Optional[int] = None
+        ) -> AsyncIterator[CheckpointTuple]:
+        checkpoint_tuples = await self._run(lambda: list(self.list(config, filter=filter, before=before, limit=limit)))
+        for checkpoint_tuple in checkpoint_tuples:
+            yield checkpoint_tuple
+
+    async def aput(
+            self,
+            config: RunnableConfig,
+            checkpoint: Checkpoint,
+            metadata: CheckpointMetadata,
+            new_versions: ChannelVersions
+        ) -> RunnableConfig:
+        return await self._run(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+            self,
+            config: RunnableConfig,
+            writes: Sequence[Tuple[str, Any]],
+            task_id: str,
+            task_path: str = ""
+        ) -> None:
+        await self._run(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await self._run(self.delete_thread, thread_id)
+
+    def get_next_version(self, current: Optional[str], channel: None) -> str:
+        # Zero-padded string versions, as InMemorySaver uses, so version comparison stays lexicographic
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.0"
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.store.name,
+            "keep_latest": self.keep_latest,
+            "checkpoints_written": self.checkpoints_written,
+            "checkpoints_pruned": self.checkpoints_pruned,
+            "bytes_written": self.bytes_written,
+            "avg_checkpoint_bytes": self.bytes_written / self.checkpoints_written if self.checkpoints_written else 0.0
+        }
+
+# -------------------------------------------------------------------------------------------------
+# INTERNAL FUNCTIONS
+# -------------------------------------------------------------------------------------------------
+
+    async def _run(self, fn, *args):
+        # SQLite and Redis calls block, so they run on a worker thread; the dict store is called inline
+        if self.store.blocking:
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
+
+    def _pack(self, value) -> bytes:
+        type_, data = self.serde.dumps_typed(value)
+        if len(data) >= COMPRESS_MIN_BYTES:
+            type_, data = f"{type_}+zlib", zlib.compress(data, 1)
+        return type_.encode() + b"\0" + data
+
+    def _unpack(self, record: bytes):
+        type_, data = record.split(b"\0", 1)
+        type_ = type_.decode()
+        if type_.endswith("+zlib"):
+            type_, data = type_[: -len("+zlib")], zlib.decompress(data)
+        return self.serde.loads_typed((type_, data))
+
+    def _to_tuple(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str, record: bytes) -> CheckpointTuple:
+        saved = self._unpack(record)
+        rows = sorted(self.store.get_writes(thread_id, checkpoint_ns, checkpoint_id), key=lambda row: (row[0], row[1]))
+        pending_writes = []
+        for task_id, _, write_record in rows:
+            _, channel, value = self._unpack(write_record)
+            pending_writes.append((task_id, channel, value))
+
+        parent_id = saved["parent_checkpoint_id"]
+        return CheckpointTuple(
+            config={"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint_id}},
+            checkpoint=saved["checkpoint"],
+            metadata=saved["metadata"],
+            parent_config=(
+                {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": parent_id}}
+                if parent_id else None
+            ),
+            pending_writes=pending_writes
+        )
+
+
+def _build_store(settings):
+    if settings.backend == "memory":
+        return MemoryCheckpointStore()
+    if settings.backend == "sqlite":
+        return SqliteCheckpointStore(settings.sqlite_path)
+    if settings.backend == "redis":
+        import redis
+        from memory.redis_client import redis_connection_kwargs
+
+        # LangGraph also calls the saver synchronously, so this one client stays blocking (used off the event loop)
+        client = redis.Redis(**redis_connection_kwargs(get_settings().redisdb))
+        return RedisCheckpointStore(client, ttl_seconds=settings.redis_ttl_seconds)
+    raise ValueError(f"Unknown CHECKPOINTER_BACKEND {settings.backend!r}; expected memory, sqlite or redis")
+
+
+@lru_cache
+def get_checkpointer() -> PruningCheckpointSaver:
+    """Process-wide checkpointer for the specialist graphs, backed by CHECKPOINTER_BACKEND."""
+    settings = get_settings().checkpointer
+    saver = PruningCheckpointSaver(_build_store(settings), keep_latest=settings.keep_latest)
+    logger.info(f"Checkpointer: {settings.backend}, keeping the latest {saver.keep_latest} checkpoints per thread")
+    return saver
@@ -3,24 +3,25 @@ from typing import Literal, Set
 from typing import Tuple
 
 from langgraph.graph import StateGraph, START, END
-from langgraph.checkpoint.memory import InMemorySaver # Use a persistent checkpointer in production
 from langgraph.types import Command, Interrupt
 from langsmith import traceable
 import time
 
 # Assuming these are in the correct paths
 from agent.base_agent import BaseSpecialistAgent
+from agent.checkpointer import get_checkpointer
 from state import OverallState, DLGraphState, DLDetailsState
-from llm import LLMFactory
+from llm import get_llm_factory
 
 class DLAgent(BaseSpecialistAgent):
     """
     A specialist agent for passport verification.
     """
+    graph_name = "dl"
+
     def __init__(self):
         self.all_workflows: Set[str] = {"dl", "pan"}
-        self.llm_client = LLMFactory()
-        self.full_workflow_retry = 0
+        self.llm_client = get_llm_factory()
 
         builder = StateGraph(DLGraphState)
 
@@ -51,7 +52,7 @@ class DLAgent(BaseSpecialistAgent):
         builder.add_edge("finish_dl_process", END)
         builder.add_edge("terminate_workflow", END)
 
-        checkpointer = InMemorySaver()
+        checkpointer = get_checkpointer()
         interrupt_after = ["accept_dl_image", "display_dl_details"]
 
         self.graph = builder.compile(
@@ -60,8 +61,8 @@ class DLAgent(BaseSpecialistAgent):
         )
 
     async def handle_step(self, state: OverallState, user_message: str) -> Tuple[OverallState, str]:
-        config = {"configurable": {"thread_id": state["session_id"]}}
-        checkpoint = self.graph.get_state(config)
+        config = self.graph_config(state["session_id"])
+        checkpoint = await self.graph.aget_state(config)
         final_graph_state = None
 
         if checkpoint and checkpoint.next:
@@ -72,7 +73,7 @@ class DLAgent(BaseSpecialistAgent):
                 else:
                     final_graph_state = await self.graph.ainvoke(None, config=config)
             except Interrupt:
-                checkpoint = self.graph.get_state(config)
+                checkpoint = await self.graph.aget_state(config)
                 final_graph_state = checkpoint.values
 
         else:
@@ -84,12 +85,13 @@ class DLAgent(BaseSpecialistAgent):
                 "last_executed_node": state.get("last_executed_node",""),
                 "status":"IN_PROGRESS",
                 "decision": None,
+                "full_workflow_retry": 0,
             }
             try:
                 final_graph_state = await self.graph.ainvoke(graph_input, config=config)
             
             except Interrupt:
-                checkpoint = self.graph.get_state(config)
+                checkpoint = await self.graph.aget_state(config)
                 final_graph_state = checkpoint.values
 
         state["dl_details"] = final_graph_state.get("dl_details", {})
@@ -125,7 +127,7 @@ class DLAgent(BaseSpecialistAgent):
         return state, final_graph_state.get("response_to_user", "An error occurred.")
 
     def _accept_dl_image(self, state: DLGraphState) -> DLGraphState:
-        if self.full_workflow_retry == 0:
+        if state.get("full_workflow_retry", 0) == 0:
             return {
                 "response_to_user": "Please upload your DL image.",
                 "last_executed_node": "accept_dl_image"
@@ -143,7 +145,6 @@ class DLAgent(BaseSpecialistAgent):
 
     def _spoof_dl_ocr(self, state: DLGraphState) -> DLGraphState:
         print("Verifying your DL details...")
-        self.full_workflow_retry += 1
 
         time.sleep(2.0)
 
@@ -157,6 +158,7 @@ class DLAgent(BaseSpecialistAgent):
             "decision": "proceed",
             "last_executed_node": "spoof_dl_ocr",
             "dl_details": dl_details,
+            "full_workflow_retry": state.get("full_workflow_retry", 0) + 1,
         }
 
     def _display_dl_details(self, state: DLGraphState) -> DLGraphState:
@@ -176,7 +178,7 @@ Are these details correct? (YES/NO)
     def _acknowledge(self, state: DLGraphState) -> DLGraphState:
         if "yes" in state["user_message"].lower():
             return{"decision": "proceed", "dl_details": state["dl_details"] }
-        elif "no" in state["user_message"].lower() and self.full_workflow_retry < 2:
+        elif "no" in state["user_message"].lower() and state.get("full_workflow_retry", 0) < 2:
             return{"decision": "retry", "dl_details": state["dl_details"]}
         else:
             return{"decision": "terminate", "dl_details": state["dl_details"]}
@@ -2,16 +2,18 @@ import datetime
 from typing import Tuple, Literal, Set
 
 from langgraph.graph import StateGraph, START, END
-from langgraph.checkpoint.memory import MemorySaver
 from langgraph.types import Interrupt, Command
 
 from agent.base_agent import BaseSpecialistAgent
+from agent.checkpointer import get_checkpointer
 from state import OverallState, Form60GraphState, Form60Data
 
 class Form60Agent(BaseSpecialistAgent):
     """
     A specialist agent for collecting Form 60 details when a user does not have a PAN card.
     """
+    graph_name = "form60"
+
     def __init__(self):
         self.all_workflows: Set[str] = {"aadhaar", "pan", "form60"}
         
@@ -47,15 +49,15 @@ class Form60Agent(BaseSpecialistAgent):
         builder.add_edge("terminate_workflow", END)
         
         # Graph Compilation
-        checkpointer = MemorySaver()
+        checkpointer = get_checkpointer()
         self.graph = builder.compile(
             checkpointer=checkpointer,
             interrupt_after=["prompt_for_agri_income", "prompt_for_other_income"]
         )
 
     async def handle_step(self, state: OverallState, user_message: str) -> Tuple[OverallState, str]:
-        config = {"configurable": {"thread_id": state["session_id"]}}
-        checkpoint = self.graph.get_state(config)
+        config = self.graph_config(state["session_id"])
+        checkpoint = await self.graph.aget_state(config)
         final_graph_state = None
 
         # ------------ 1. Resume path ---------------------------------
@@ -66,7 +68,7 @@ class Form60Agent(BaseSpecialistAgent):
                 # resume execution instead of starting a fresh run
                 final_graph_state = await self.graph.ainvoke(Command(resume=user_message), config=config)
             except Interrupt:
-                checkpoint = self.graph.get_state(config)
+                checkpoint = await self.graph.aget_state(config)
                 final_graph_state = checkpoint.values
 
         # ------------ 2. Fresh run path ------------------------------
@@ -81,7 +83,7 @@ class Form60Agent(BaseSpecialistAgent):
             try:
                 final_graph_state = await self.graph.ainvoke(graph_input, config=config)
             except Interrupt:
-                checkpoint = self.graph.get_state(config)
+                checkpoint = await self.graph.aget_state(config)
                 final_graph_state = checkpoint.values
 
         # ------------ 3. Persist results back into OverallState ------
@@ -1,71 +1,179 @@
-# THE RAG SYSTEM IS NOT YET IMPLEMENTED
-# Use CONTEXTUAL_RAG for this
+# Vetted answers come from the local FAQ index (tools/faq_index.py); everything else is an LLM call.
+# A CONTEXTUAL_RAG pipeline over policy documents is not implemented yet.
 
-# Temporarily it is just LLM call
+import asyncio
+from functools import lru_cache
 
-from agent.base_agent import BaseSpecialistAgent
+from pydantic import BaseModel, Field
+
+from agent.base_agent import BaseSpecialistAgent, EventCallback
 from state import OverallState
-from llm import LLMFactory 
+from llm import get_llm_factory
+from config.config import get_settings
+from tools.faq_index import get_faq_index
+
+CLASSIFICATION_SYSTEM_PROMPT = (
+    "You are a topic classification model. Your sole task is to determine if the user's "
+    "question is related to insurance, policies, claims, premiums, or any associated financial concepts. "
+    "Respond with only the word 'INSURANCE' if it is related, and 'OTHER' if it is not."
+)
+
+ANSWER_SYSTEM_PROMPT = (
+    "You are a helpful and knowledgeable insurance assistant for TATA AIA. Your name is RIA."
+    "Your purpose is to answer general questions about insurance concepts clearly and simply. "
+    "Your tone should be formal, professional, and empathetic."
+    "\n\n**CRITICAL INSTRUCTIONS:**\n"
+    "1.  **DO NOT** provide financial advice. Do not suggest specific products, coverage amounts, or investments."
+    "2.  **DO NOT** invent or quote any specific numbers like prices, premiums, or policy details. "
+    "    You can explain what a 'deductible' is, but you cannot state what a typical deductible is."
+    "3.  If you do not know the answer to a question, you must state that you cannot provide that information."
+    "4.  Always refer to TATA AIA in the third person (e.g., 'TATA AIA offers policies...')."
+    "5.  Keep your answers concise and easy to understand for someone new to insurance."
+)
+
+SINGLE_CALL_SYSTEM_PROMPT = (
+    "First decide whether the user's question is related to insurance, policies, claims, premiums, "
+    "or any associated financial concepts, and set `is_insurance_related` accordingly. "
+    "If it is not, leave `answer` empty. If it is, answer it in `answer` as described below.\n\n"
+    + ANSWER_SYSTEM_PROMPT
+)
+
+class GeneralQueryResponse(BaseModel):
+    is_insurance_related: bool = Field(description="True if the question is about insurance or associated financial concepts")
+    answer: str = Field(description="The answer to the question, or an empty string if it is not insurance related")
 
 class GeneralQueryAgent(BaseSpecialistAgent):
     """
     A specialist agent designed to answer general questions about insurance.
-    It does not use a RAG pipeline and relies on the LLM's internal knowledge.
-    It includes a guardrail to ensure it only responds to insurance-related queries.
+    Questions that confidently match the local FAQ index are answered from it without an LLM call.
+    The rest rely on the LLM's internal knowledge, behind a guardrail that ensures it only
+    responds to insurance-related queries.
+
+    The guardrail and the answer can be produced three ways (GENERAL_QUERY_MODE):
+    - two_step: classify, then answer (two sequential calls, no wasted tokens)
+    - single_call: one structured call returning both (one round trip, answer is not streamed)
+    - speculative: classify and answer concurrently, discard the answer if off-topic
+      (latency of one call, pays for the answer on off-topic questions)
     """
     def __init__(self):
-        self.llm_client = LLMFactory()
+        self.llm_client = get_llm_factory()
+        self.mode = get_settings().general_query.mode
+        self.faq_index = get_faq_index()
         self.off_topic_response = (
             "I apologize, but my expertise is limited to insurance-related topics. "
             "I can't help with that question. We can continue with your verification process whenever you're ready."
         )
+        self.error_message = "I'm sorry, I encountered an issue while trying to process your question. Please try again later."
 
     async def _is_insurance_related(self, user_question: str) -> bool:
         """
         Uses a classification prompt to determine if a question is about insurance.
         This acts as a guardrail for the agent.
         """
-        system_prompt = (
-            "You are a topic classification model. Your sole task is to determine if the user's "
-            "question is related to insurance, policies, claims, premiums, or any associated financial concepts. "
-            "Respond with only the word 'INSURANCE' if it is related, and 'OTHER' if it is not."
-        )
-        
         try:
-            response = self.llm_client._get_normal_response(user_question, sys_prompt=system_prompt)
+            response = await self.llm_client._get_normal_response(
+                user_question,
+                sys_prompt=CLASSIFICATION_SYSTEM_PROMPT,
+                call_site="insurance_check",
+                # Anything other than one of the two labels escalates to the stronger model
+                validate=lambda label: label.strip().upper().strip(".") in ("INSURANCE", "OTHER")
+            )
             return "INSURANCE" in response.strip().upper()
         except Exception as e:
             # If the classification fails for any reason, default to being safe and not answering.
             print(f"Error during query classification: {e}")
             return False
 
-    async def handle_step(self, state: OverallState, user_message: str):
+    async def handle_step(self, state: OverallState, user_message: str, on_event: EventCallback = None):
         """
         Public method to handle an incoming general query.
-        
-        It first classifies the query's topic and then either answers it or politely declines.
+
+        It classifies the query's topic and either answers it or politely declines, using the
+        configured mode. When `on_event` is given, the answer is streamed to it token by token.
+        A confident FAQ match is returned as is; the FAQ only holds insurance questions, so the
+        guardrail is skipped for it.
         """
+        match = self.faq_index.lookup(user_message) if self.faq_index else None
+        if match:
+            if on_event:
+                await on_event({"type": "token", "content": match.answer})
+            return state, match.answer
+
+        if self.mode == "single_call":
+            return state, await self._answer_single_call(user_message, on_event)
+        if self.mode == "speculative":
+            return state, await self._answer_speculative(user_message, on_event)
+
         if not await self._is_insurance_related(user_message):
             return state, self.off_topic_response
-            
-        # If the query is on-topic, use a more detailed persona for the answer.
-        system_prompt = (
-            "You are a helpful and knowledgeable insurance assistant for TATA AIA. Your name is RIA."
-            "Your purpose is to answer general questions about insurance concepts clearly and simply. "
-            "Your tone should be formal, professional, and empathetic."
-            "\n\n**CRITICAL INSTRUCTIONS:**\n"
-            "1.  **DO NOT** provide financial advice. Do not suggest specific products, coverage amounts, or investments."
-            "2.  **DO NOT** invent or quote any specific numbers like prices, premiums, or policy details. "
-            "    You can explain what a 'deductible' is, but you cannot state what a typical deductible is."
-            "3.  If you do not know the answer to a question, you must state that you cannot provide that information."
-            "4.  Always refer to TATA AIA in the third person (e.g., 'TATA AIA offers policies...')."
-            "5.  Keep your answers concise and easy to understand for someone new to insurance."
-        )
-        
+        return state, await self._answer(user_message, on_event)
+
+    async def _answer(self, user_message: str, on_event: EventCallback = None) -> str:
         try:
-            response =  self.llm_client._get_normal_response(user_message, sys_prompt=system_prompt)
-            return state, response
+            if on_event is None:
+                response = await self.llm_client._get_normal_response(
+                    user_message, sys_prompt=ANSWER_SYSTEM_PROMPT, call_site="general_query"
+                )
+            else:
+                chunks = []
+                async for delta in self.llm_client._stream_normal_response(
+                    user_message, sys_prompt=ANSWER_SYSTEM_PROMPT, call_site="general_query"
+                ):
+                    chunks.append(delta)
+                    await on_event({"type": "token", "content": delta})
+                response = "".join(chunks) or None
+
+            if response is None:
+                raise ValueError("Empty response from LLM")
+            return response
         except Exception as e:
             print(f"Error during query answering: {e}")
-            error_message = "I'm sorry, I encountered an issue while trying to process your question. Please try again later."
-            return state, error_message
\ No newline at end of file
+            return self.error_message
+
+    async def _answer_single_call(self, user_message: str, on_event: EventCallback = None) -> str:
+        response: GeneralQueryResponse = await self.llm_client._get_structured_response(
+            human_prompt=user_message,
+            parser=GeneralQueryResponse,
+            sys_prompt=SINGLE_CALL_SYSTEM_PROMPT,
+            call_site="general_query"
+        )
+        if response is None:
+            print("Error during query answering: no structured response")
+            return self.error_message
+        if not response.is_insurance_related or not response.answer:
+            return self.off_topic_response
+
+        if on_event:
+            await on_event({"type": "token", "content": response.answer})
+        return response.answer
+
+    async def _answer_speculative(self, user_message: str, on_event: EventCallback = None) -> str:
+        # Tokens are held back until the guardrail passes, then flushed and streamed live
+        on_topic = asyncio.Event()
+        held_back = []
+
+        async def gated(event: dict):
+            if on_topic.is_set():
+                await on_event(event)
+            else:
+                held_back.append(event)
+
+        answer = asyncio.create_task(self._answer(user_message, gated if on_event else None))
+        try:
+            if not await self._is_insurance_related(user_message):
+                answer.cancel()
+                return self.off_topic_response
+
+            while held_back:
+                await on_event(held_back.pop(0))
+            on_topic.set()
+            return await answer
+        finally:
+            if not answer.done():
+                answer.cancel()
+
+
+@lru_cache
+def get_general_query_agent() -> GeneralQueryAgent:
+    """Process-wide general query agent; it holds no per-session state."""
+    return GeneralQueryAgent()
@@ -1,5 +1,7 @@
+from functools import lru_cache
 from typing import Tuple
 from state import OverallState
+from agent.base_agent import EventCallback
 from agent.aadhar_agent import AadharAgent
 from agent.pan_agent import PanAgent
 from agent.form60_agent import Form60Agent
@@ -11,6 +13,8 @@ class KYCManagerAgent:
     """
     A middle-manager agent that delegates KYC tasks to the appropriate
     specialist document agent based on the active workflow.
+    Built once per process (see `get_kyc_manager`); the specialists' graphs are compiled once
+    and keep each session's progress in the shared checkpointer.
     """
     def __init__(self):
         self.specialists = {
@@ -25,10 +29,11 @@ class KYCManagerAgent:
             "verification step we are on. Please contact support."
         )
 
-    async def delegate_to_specialist(self, state: OverallState, user_message: str) -> Tuple[OverallState, str]:
+    async def delegate_to_specialist(self, state: OverallState, user_message: str, on_event: EventCallback = None) -> Tuple[OverallState, str]:
         """
         1. Identifies the active workflow from the state.
         2. Routes the request to the corresponding specialist agent.
+        Specialist steps are deterministic, so `on_event` only gets a progress event naming the workflow.
         """
         active_workflow = state.get("active_workflow")
 
@@ -42,4 +47,18 @@ class KYCManagerAgent:
             print(error_message)
             return state, self.fallback_message
 
-        return await specialist_agent.handle_step(state, user_message)
\ No newline at end of file
+        if on_event:
+            await on_event({"type": "progress", "stage": "verification", "workflow": active_workflow})
+
+        return await specialist_agent.handle_step(state, user_message)
+
+    async def clear_session(self, session_id: str) -> None:
+        """Drops every specialist's checkpoints for the session."""
+        for specialist_agent in self.specialists.values():
+            await specialist_agent.clear_session(session_id)
+
+
+@lru_cache
+def get_kyc_manager() -> KYCManagerAgent:
+    """Process-wide KYC manager with one compiled graph per specialist."""
+    return KYCManagerAgent()
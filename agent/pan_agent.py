@@ -149,7 +149,7 @@ class PanAgent(BaseSpecialistAgent):
     @traceable(name="PAN_AGENT_HANDLE_STEP")
     async def handle_step(self, state: OverallState, user_message: str) -> Tuple[OverallState, str]:
         config = {"configurable": {"thread_id": state["session_id"]}}
-        checkpoint = self.graph.get_state(config)
+        checkpoint = await self.graph.aget_state(config)
         final_graph_state = None
 
         if checkpoint and checkpoint.next:
@@ -161,7 +161,7 @@ class PanAgent(BaseSpecialistAgent):
                 else:
                     final_graph_state = await self.graph.ainvoke(None, config=config)
             except Interrupt:
-                checkpoint = self.graph.get_state(config)
+                checkpoint = await self.graph.aget_state(config)
                 final_graph_state = checkpoint.values
         else:
             # Fresh start
@@ -180,7 +180,7 @@ class PanAgent(BaseSpecialistAgent):
             try:
                 final_graph_state = await self.graph.ainvoke(graph_input, config=config)
             except Interrupt:
-                checkpoint = self.graph.get_state(config)
+                checkpoint = await self.graph.aget_state(config)
                 final_graph_state = checkpoint.values
 
         state["pan_details"] = final_graph_state.get("pan_details", {})
@@ -500,7 +500,6 @@ from typing import Tuple, Literal, Set
 from pathlib import Path
 
 from langgraph.graph import StateGraph, START, END
-from langgraph.checkpoint.memory import InMemorySaver  
 from langgraph.types import Interrupt, Command
 from pydantic import BaseModel, Field
 from typing_extensions import Optional
@@ -509,9 +508,10 @@ import time
 
 # Assuming correct import paths
 from agent.base_agent import BaseSpecialistAgent
+from agent.checkpointer import get_checkpointer
 from tools import pan_tools
 from state import OverallState, PanGraphState
-from llm import LLMFactory
+from llm import get_llm_factory
 from tools.ocr_tool import OCR
 from tools.ocr_pan_tool import PanProcessor
 from api.ocr_api import DocumentIntelligenceService
@@ -533,22 +533,17 @@ class ParsedPANDetailsState(BaseModel):
     pan_card_holders_name: str = Field(description="The name of the user as written on the PAN card")
 
 class PanAgent(BaseSpecialistAgent):
+    graph_name = "pan"
+
     def __init__(self):
         self.all_workflows: Set[str] = {"aadhaar", "pan", "form60"}
-        self.llm_client = LLMFactory()
+        self.llm_client = get_llm_factory()
         self.ocr = OCR()
-        self.correction = False
-        self.full_workflow_retry = 0  # Added similar to DL agent
 
         self.ocr_real = DocumentIntelligenceService()
         self.pan_ocr_processor = PanProcessor()
 
         # self.source = Path(r"/Users/administrator/newfinal3/Multi_Agent_AI_KYC_System/test_pan.jpeg")
-        builder = StateGraph(PanGraphState)
-        
-        self.all_workflows: Set[str] = {"aadhaar", "pan", "form60"}
-        self.llm_client = LLMFactory()
-        self.nsdl_verification_count = 0
 
         builder = StateGraph(PanGraphState)
 
@@ -639,7 +634,7 @@ class PanAgent(BaseSpecialistAgent):
         builder.add_edge("terminate_workflow", END)
 
         # Graph Compilation with Interruption - Added new interrupt nodes
-        checkpointer = InMemorySaver()
+        checkpointer = get_checkpointer()
         interrupt_after = ["prompt_for_confirmation", "prompt_for_pan_prefilled", "prompt_for_pan_manual", 
                           "accept_pan_image", "display_pan_details"]
 
@@ -650,8 +645,8 @@ class PanAgent(BaseSpecialistAgent):
 
     @traceable(name="PAN_AGENT_HANDLE_STEP")
     async def handle_step(self, state: OverallState, user_message: str) -> Tuple[OverallState, str]:
-        config = {"configurable": {"thread_id": state["session_id"]}}
-        checkpoint = self.graph.get_state(config)
+        config = self.graph_config(state["session_id"])
+        checkpoint = await self.graph.aget_state(config)
         final_graph_state = None
 
         if checkpoint and checkpoint.next:
@@ -663,7 +658,7 @@ class PanAgent(BaseSpecialistAgent):
                 else:
                     final_graph_state = await self.graph.ainvoke(None, config=config)
             except Interrupt:
-                checkpoint = self.graph.get_state(config)
+                checkpoint = await self.graph.aget_state(config)
                 final_graph_state = checkpoint.values
         else:
             # Fresh start
@@ -677,12 +672,15 @@ class PanAgent(BaseSpecialistAgent):
                 response_to_user="",
                 status="IN_PROGRESS",
                 decision=None,
+                correction=False,
+                nsdl_verification_count=0,
+                full_workflow_retry=0,
             )
 
             try:
                 final_graph_state = await self.graph.ainvoke(graph_input, config=config)
             except Interrupt:
-                checkpoint = self.graph.get_state(config)
+                checkpoint = await self.graph.aget_state(config)
                 final_graph_state = checkpoint.values
 
         state["pan_details"] = final_graph_state.get("pan_details", {})
@@ -746,9 +744,9 @@ class PanAgent(BaseSpecialistAgent):
         }
 
     @traceable
-    def _collect_manual_details(self, state: PanGraphState) -> PanGraphState:
+    async def _collect_manual_details(self, state: PanGraphState) -> PanGraphState:
         try:
-            if not self.correction:
+            if not state.get("correction"):
                 # Parse user input with LLM
                 SYSTEM_PROMPT = """
     You are an expert at extracting PAN card information from user input.
@@ -759,11 +757,18 @@ class PanAgent(BaseSpecialistAgent):
 
     The user will provide this information in various formats. Extract the actual values, not placeholder text.
     """            
-                details: ParsedPANDetailsState = self.llm_client._get_structured_response(
-                    human_prompt=state["user_message"],
-                    parser=ParsedPANDetailsState,
-                    sys_prompt=SYSTEM_PROMPT
-                )
+                # Well-formed input is parsed locally; only free-form text goes to the LLM
+                parsed = pan_tools.pan_details_extractor.extract(state["user_message"])
+                if parsed:
+                    details = ParsedPANDetailsState(**parsed)
+                else:
+                    details: ParsedPANDetailsState = await self.llm_client._get_structured_response(
+                        human_prompt=state["user_message"],
+                        parser=ParsedPANDetailsState,
+                        sys_prompt=SYSTEM_PROMPT,
+                        use_cache=False,
+                        call_site="pan_parse"
+                    )
 
                 if not details:
                     raise ValueError("Could not parse PAN details.")
@@ -805,11 +810,17 @@ Fill those existing details in the new PAN card details and then rewrite the inc
 
 NOTE: YOU HAVE TO RETURN THE COMPLETE NEW PAN CARD DETAILS AFTER CORRECTION. WHILE THE EXISTING DETAILS ARE UNALTERED.
 """
-                details: ParsedPANDetailsState = self.llm_client._get_structured_response(
-                    human_prompt=state["user_message"],
-                    parser=ParsedPANDetailsState,
-                    sys_prompt=CORRECTION_SYSTEM_PROMPT
-                )
+                parsed = pan_tools.pan_details_extractor.extract(state["user_message"], existing=state["pan_details"])
+                if parsed:
+                    details = ParsedPANDetailsState(**parsed)
+                else:
+                    details: ParsedPANDetailsState = await self.llm_client._get_structured_response(
+                        human_prompt=state["user_message"],
+                        parser=ParsedPANDetailsState,
+                        sys_prompt=CORRECTION_SYSTEM_PROMPT,
+                        use_cache=False,
+                        call_site="pan_parse"
+                    )
 
                 print(details)
 
@@ -893,9 +904,9 @@ NOTE: YOU HAVE TO RETURN THE COMPLETE NEW PAN CARD DETAILS AFTER CORRECTION. WHI
     @traceable
     def _prepare_for_manual_correction(self, state: PanGraphState) -> PanGraphState:
         # This node clears details and sets the decision for the next prompt.
-        self.correction = True
         return {
             "pan_details": state["pan_details"],
+            "correction": True,
             "decision": "correction",
             "last_executed_node": "prepare_for_manual_correction"
         }
@@ -905,7 +916,7 @@ NOTE: YOU HAVE TO RETURN THE COMPLETE NEW PAN CARD DETAILS AFTER CORRECTION. WHI
 
     @traceable
     def _verify_with_nsdl(self, state: PanGraphState) -> PanGraphState:
-        self.nsdl_verification_count += 1
+        nsdl_verification_count = state.get("nsdl_verification_count", 0) + 1
 
         nsdl_result = pan_tools.verify_pan_in_nsdl(state["pan_details"])
         is_match = not state.get("aadhaar_details") or (
@@ -913,17 +924,18 @@ NOTE: YOU HAVE TO RETURN THE COMPLETE NEW PAN CARD DETAILS AFTER CORRECTION. WHI
             pan_tools.compare_pan_and_aadhaar_data(state["pan_details"], state["aadhaar_details"])
         )
         
-        decision = "success" if nsdl_result.status == "success" and self.nsdl_verification_count < 3 and is_match else "failure"
+        decision = "success" if nsdl_result.status == "success" and nsdl_verification_count < 3 and is_match else "failure"
         
         return {
             "decision": decision,
+            "nsdl_verification_count": nsdl_verification_count,
             "last_executed_node": "verify_with_nsdl"
         }
     
     # NEW IMAGE PROCESSING METHODS (similar to DL agent)
     @traceable
     def _accept_pan_image(self, state: PanGraphState) -> PanGraphState:
-        if self.full_workflow_retry != 0:
+        if state.get("full_workflow_retry", 0) != 0:
             return {
                 "response_to_user": "Your PAN card details could not be verified. No worries, please re-upload your PAN card image.\nPlease make sure it is clear and legible.",
                 "last_executed_node": "accept_pan_image",
@@ -938,9 +950,8 @@ NOTE: YOU HAVE TO RETURN THE COMPLETE NEW PAN CARD DETAILS AFTER CORRECTION. WHI
     
     @traceable
     def _pan_ocr_extract(self, state: PanGraphState) -> PanGraphState:
-        if self.nsdl_verification_count < 3:
+        if state.get("nsdl_verification_count", 0) < 3:
             print("Processing PAN card image...")
-            self.full_workflow_retry += 1
             
             time.sleep(2.0)  # Simulate processing time
             
@@ -955,6 +966,7 @@ NOTE: YOU HAVE TO RETURN THE COMPLETE NEW PAN CARD DETAILS AFTER CORRECTION. WHI
                 "response_to_user": "PAN card image processed successfully. Let me verify these details.",
                 "last_executed_node": "pan_ocr_extract",
                 "pan_details": mock_details,
+                "full_workflow_retry": state.get("full_workflow_retry", 0) + 1,
                 "decision": "proceed"
             }
         else:
@@ -984,7 +996,7 @@ Are these details correct? (YES/NO)
     def _acknowledge_pan_details(self, state: PanGraphState) -> PanGraphState:
         if "yes" in state["user_message"].lower():
             return {"decision": "proceed", "pan_details": state["pan_details"]}
-        elif "no" in state["user_message"].lower() and self.full_workflow_retry < 2:
+        elif "no" in state["user_message"].lower() and state.get("full_workflow_retry", 0) < 2:
             return {"decision": "retry", "pan_details": state["pan_details"]}
         else:
             return {"decision": "terminate", "pan_details": state["pan_details"]}
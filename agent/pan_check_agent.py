@@ -1,15 +1,16 @@
 import datetime
+from functools import lru_cache
 from typing import Literal, Set, Tuple
 
 from pydantic import BaseModel
 from langgraph.graph import StateGraph, START, END
-from langgraph.checkpoint.memory import InMemorySaver
 from langgraph.types import Command, Interrupt
 from langsmith import traceable
 
 from agent.base_agent import BaseSpecialistAgent
+from agent.checkpointer import get_checkpointer
 from state import OverallState, PanCheckGraphState
-from llm import LLMFactory
+from llm import get_llm_factory
 from prompts.orchestrate import FORM60_ROUTE_PROMPT 
 
 class Form60Analysis(BaseModel):
@@ -42,9 +43,10 @@ class PanCheckAgent(BaseSpecialistAgent):
     Agent responsible for conducting PAN probe questionnaire when user declares they don't have PAN.
     After collecting answers, it analyzes responses to determine if user should proceed with PAN or Form60.
     """
-    
+    graph_name = "pan_check"
+
     def __init__(self):
-        self.llm_client = LLMFactory()
+        self.llm_client = get_llm_factory()
         warning = "### ⚠ IMPORTANT WARNING\n\nPlease provide accurate information. False information may result in legal action."
         occupations = "Salaried | Self-Employed | Business Owner | Student | Homemaker | Retired | Unemployed | Govt Employee | Freelancer"
         
@@ -93,7 +95,7 @@ class PanCheckAgent(BaseSpecialistAgent):
         builder.add_edge("finish_probe", END)
         
         # Compile graph with checkpointer and interrupts
-        checkpointer = InMemorySaver()
+        checkpointer = get_checkpointer()
         interrupt_after = ["ask_question"]  # Pause after each question
         
         self.graph = builder.compile(
@@ -104,8 +106,8 @@ class PanCheckAgent(BaseSpecialistAgent):
     @traceable(name="PAN_CHECK_AGENT_HANDLE_STEP")
     async def handle_step(self, state: OverallState, user_message: str) -> Tuple[OverallState, str]:
         """Handle step in the PAN check workflow"""
-        config = {"configurable": {"thread_id": state["session_id"]}}
-        checkpoint = self.graph.get_state(config)
+        config = self.graph_config(state["session_id"])
+        checkpoint = await self.graph.aget_state(config)
         final_graph_state = None
         
         if checkpoint and checkpoint.next:
@@ -117,7 +119,7 @@ class PanCheckAgent(BaseSpecialistAgent):
                 else:
                     final_graph_state = await self.graph.ainvoke(None, config=config)
             except Interrupt:
-                checkpoint = self.graph.get_state(config)
+                checkpoint = await self.graph.aget_state(config)
                 final_graph_state = checkpoint.values
         else:
             # Fresh start
@@ -136,7 +138,7 @@ class PanCheckAgent(BaseSpecialistAgent):
             try:
                 final_graph_state = await self.graph.ainvoke(graph_input, config=config)
             except Interrupt:
-                checkpoint = self.graph.get_state(config)
+                checkpoint = await self.graph.aget_state(config)
                 final_graph_state = checkpoint.values
         
         # Update main state based on current node
@@ -215,7 +217,7 @@ class PanCheckAgent(BaseSpecialistAgent):
             }
     
     @traceable
-    def _analyze_responses(self, state: PanCheckGraphState) -> PanCheckGraphState:
+    async def _analyze_responses(self, state: PanCheckGraphState) -> PanCheckGraphState:
         """Analyze user responses to determine next course of action"""
         answers = state.get("pan_probe_answers", {})
         interaction = ""
@@ -230,10 +232,12 @@ class PanCheckAgent(BaseSpecialistAgent):
 
         human_message = "You have to analyse the user's interaction and decide whether he has a PAN or NOT"
         
-        response = self.llm_client._get_structured_response(
+        response = await self.llm_client._get_structured_response(
             sys_prompt=FORM60_ROUTE_PROMPT.format(qa_map = interaction),
             human_prompt=human_message,
-            parser=Form60Analysis
+            parser=Form60Analysis,
+            use_cache=False,
+            call_site="pan_probe_analysis"
         )
         
         # Decision logic: if user has indicators they should have PAN, suggest PAN workflow
@@ -274,3 +278,9 @@ class PanCheckAgent(BaseSpecialistAgent):
             "status": "SUCCESS",
             "last_executed_node": "finish_probe"
         }
+
+
+@lru_cache
+def get_pan_check_agent() -> PanCheckAgent:
+    """Process-wide PAN probe agent; its graph is compiled once and shared by all sessions."""
+    return PanCheckAgent()
@@ -2,24 +2,25 @@ import datetime
 from typing import Literal, Set
 
 from langgraph.graph import StateGraph, START, END
-from langgraph.checkpoint.memory import InMemorySaver # Use a persistent checkpointer in production
 from langgraph.types import Command, Interrupt
 from langsmith import traceable
 import time
 
 # Assuming these are in the correct paths
 from agent.base_agent import BaseSpecialistAgent
+from agent.checkpointer import get_checkpointer
 from state import OverallState, PassportGraphState, PassportDetailsState
-from llm import LLMFactory
+from llm import get_llm_factory
 
 class PassportAgent(BaseSpecialistAgent):
     """
     A specialist agent for passport verification.
     """
+    graph_name = "passport"
+
     def __init__(self):
         self.all_workflows: Set[str] = {"passport","pan"}
-        self.llm_client = LLMFactory()
-        self.full_workflow_retry = 0
+        self.llm_client = get_llm_factory()
 
         builder = StateGraph(PassportGraphState)
 
@@ -50,7 +51,7 @@ class PassportAgent(BaseSpecialistAgent):
         builder.add_edge("finish_passport_process", END)
         builder.add_edge("terminate_workflow", END)
 
-        checkpointer = InMemorySaver()
+        checkpointer = get_checkpointer()
         interrupt_after = ["accept_passport_image", "display_passport_details"]
 
         self.graph = builder.compile(
@@ -62,8 +63,8 @@ class PassportAgent(BaseSpecialistAgent):
         """
         Handles the current step of its specific workflow.  
         """
-        config = {"configurable": {"thread_id": state["session_id"]}}
-        checkpoint = self.graph.get_state(config)
+        config = self.graph_config(state["session_id"])
+        checkpoint = await self.graph.aget_state(config)
         final_graph_state = None
 
         if checkpoint and checkpoint.next:
@@ -74,7 +75,7 @@ class PassportAgent(BaseSpecialistAgent):
                 else:
                     final_graph_state = await self.graph.ainvoke(None, config=config)
             except Interrupt:
-                checkpoint = self.graph.get_state(config)
+                checkpoint = await self.graph.aget_state(config)
                 final_graph_state = checkpoint.values
         else:
             graph_input = {
@@ -85,11 +86,12 @@ class PassportAgent(BaseSpecialistAgent):
                 "last_executed_node": state.get("last_executed_node",""),
                 "status":"IN_PROGRESS",
                 "decision": None,
+                "full_workflow_retry": 0,
             }
             try:
                 final_graph_state = await self.graph.ainvoke(graph_input, config=config)
             except Interrupt:
-                checkpoint = self.graph.get_state(config)
+                checkpoint = await self.graph.aget_state(config)
                 final_graph_state = checkpoint.values
 
         state["passport_details"] = final_graph_state.get("passport_details", {})
@@ -125,7 +127,7 @@ class PassportAgent(BaseSpecialistAgent):
         return state, final_graph_state.get("response_to_user", "An error occurred.")
 
     def _accept_passport_image(self, state: PassportGraphState) -> PassportGraphState:
-        if self.full_workflow_retry == 0:
+        if state.get("full_workflow_retry", 0) == 0:
             return {
                 "response_to_user": "Please upload your Passport image.",
                 "last_executed_node": "accept_passport_image"
@@ -144,7 +146,6 @@ class PassportAgent(BaseSpecialistAgent):
     def _spoof_passport_ocr(self, state: PassportGraphState) -> PassportGraphState:
         
         print("Verifying your passport details...")
-        self.full_workflow_retry += 1
 
         time.sleep(2.0)
 
@@ -158,6 +159,7 @@ class PassportAgent(BaseSpecialistAgent):
             "decision": "proceed",
             "last_executed_node": "spoof_passport_ocr",
             "passport_details": passport_details,
+            "full_workflow_retry": state.get("full_workflow_retry", 0) + 1,
         }
 
     def _display_passport_details(self, state: PassportGraphState) -> PassportGraphState:
@@ -177,7 +179,7 @@ Are these details correct? (YES/NO)
     def _acknowledge(self, state: PassportGraphState) -> PassportGraphState:
         if "yes" in state["user_message"].lower():
             return{"decision": "proceed", "passport_details": state["passport_details"]}
-        elif "no" in state["user_message"].lower() and self.full_workflow_retry < 2:
+        elif "no" in state["user_message"].lower() and state.get("full_workflow_retry", 0) < 2:
             return{"decision": "retry", "passport_details": state["passport_details"]}
         else:
             return{"decision": "terminate", "passport_details": state["passport_details"]}
@@ -3,6 +3,8 @@ from typing import Optional, Dict, Any
 import re
 import logging
 
+from .session_store import parse_cursor
+
 logger = logging.getLogger(__name__)
 
 async def get_api_key(x_api_key: Optional[str] = Header(None)):
@@ -57,16 +59,19 @@ async def validate_webhook_secret(
     return x_webhook_secret
 
 async def get_pagination_params(
-    page: int = Query(1, ge=1, description="Page number"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page; omit for the first page"),
     size: int = Query(10, ge=1, le=100, description="Page size")
-) -> Dict[str, int]:
+) -> Dict[str, Any]:
     """
-    Get pagination parameters for list endpoints
+    Get cursor pagination parameters for list endpoints
     """
+    if cursor is not None:
+        try:
+            parse_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
     return {
-        "page": page,
-        "size": size,
-        "offset": (page - 1) * size,
+        "cursor": cursor,
         "limit": size
     }
 
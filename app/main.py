@@ -1,31 +1,51 @@
 from fastapi import FastAPI, HTTPException, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 import uuid
 import logging
 from typing import Dict, Any
 from datetime import datetime
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
 from .routers import chat
-from .models import WebhookEvent
+from .models import WebhookEvent, SessionListResponse
+from .session_reaper import get_session_reaper
+from .session_store import get_session_store
+from llm import close_http_client
+from memory.redis_client import close_redis
+from memory.summarizer import get_summarization_worker
+from tools.faq_index import get_faq_index
+from agent.kyc_agent import get_kyc_manager
+from agent.pan_check_agent import get_pan_check_agent
+from agent.genral_query_agent import get_general_query_agent
+import monitoring.metrics  # registers the Prometheus collectors
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# In-memory session storage (use Redis/Database in production)
-active_sessions: Dict[str, Dict[str, Any]] = {}
-
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting TATA AIA KYC FastAPI Server...")
+    await chat.load_greeting()
+    await asyncio.to_thread(get_faq_index)
+    # Compile the shared agent graphs before the first session arrives
+    for get_agent in (get_kyc_manager, get_pan_check_agent, get_general_query_agent):
+        await asyncio.to_thread(get_agent)
+    get_session_reaper().start()
+    get_summarization_worker().start()
     yield
     # Shutdown
     logger.info("Shutting down TATA AIA KYC FastAPI Server...")
+    await get_session_reaper().stop()
+    await get_summarization_worker().stop()
+    await close_http_client()
+    await close_redis()
 
 app = FastAPI(
     title="TATA AIA KYC System",
@@ -93,28 +113,22 @@ async def read_root(request: Request):
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
+    counts = await get_session_store().counts()
     return {
         "status": "healthy",
-        "active_sessions": len(active_sessions),
+        "active_sessions": counts["total"],
+        "sessions_by_workflow": counts["by_workflow"],
         "registered_webhooks": len(webhook_callbacks),
         "service": "TATA AIA KYC System"
     }
 
-@app.get("/sessions")
-async def list_active_sessions():
-    """List all active sessions (for admin/monitoring)"""
-    return {
-        "active_sessions": len(active_sessions),
-        "sessions": [
-            {
-                "session_id": sid,
-                "active_workflow": data["state"].get("active_workflow"),
-                "kyc_step": data["state"].get("kyc_step"),
-                "completed_workflows": data["state"].get("completed_workflows", [])
-            }
-            for sid, data in active_sessions.items()
-        ]
-    }
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics: per-call LLM latency, tokens and errors, plus LLM pipeline counters"""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+# Same listing as /api/v1/sessions (admin/monitoring)
+app.add_api_route("/sessions", chat.list_active_sessions, methods=["GET"], response_model=SessionListResponse)
 
 # Error handlers
 @app.exception_handler(Exception)
@@ -68,4 +68,5 @@ class HealthResponse(BaseModel):
 class SessionListResponse(BaseModel):
     """Response model for listing sessions"""
     active_sessions: int
-    sessions: List[SessionStatusResponse]
\ No newline at end of file
+    sessions: List[SessionStatusResponse]
+    next_cursor: Optional[str] = Field(None, description="Pass as `cursor` to get the next page; null on the last page")
\ No newline at end of file
@@ -1,56 +1,36 @@
 import uuid
+import json
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 from datetime import datetime
-from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends
-from typing import Dict, Any
-from typing_extensions import cast
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends, Query
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, Dict, Any, Optional
 
 from ..models import (
     ChatRequest, 
     ChatResponse, 
     SessionStartRequest, 
     SessionStatusResponse,
+    SessionListResponse,
     WebhookEvent,
     ErrorResponse
 )
-from ..dependencies import validate_session_id, get_current_session
+from ..dependencies import validate_session_id, get_current_session, get_pagination_params
+from ..session_store import SessionBusyError, SessionConflictError, SessionRecord, get_session_store
+from ..session_reaper import release_session
 from orchestrator.router import MainOrchestrator
-from state import OverallState
+from state import OverallState, new_overall_state
 from memory.memory import MemoryManager
-from greet import generate_greeting_message
+from greet import get_greeting
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-# Store active sessions (in production, use Redis or database)
-active_sessions: Dict[str, Dict[str, Any]] = {}
-
-GREETING_PROMPT = generate_greeting_message()
-
-def create_initial_state(session_id: str) -> OverallState:
-    """Create initial state for a new session using the same structure as main_cli.py"""
-    return cast(OverallState, {
-        "session_id": session_id,
-        "input_message": "",
-        "ai_response": GREETING_PROMPT,
-        "active_workflow": None,
-        "kyc_step": None,
-        "completed_workflows": [],
-        
-        # Specialist Agent States
-        "aadhar_details": {},
-        "aadhar_verification_status": {},
-        "aadhaar_retries": 0,
-        
-        "pan_details": {},
-        "pan_verification_status": {},
-        "pan_retries": 0,
-        "match": None,
-        
-        "Form_60": {},
-        
-        "human_response": "" # Placeholder for human-in-the-loop
-    })
+async def load_greeting():
+    """Load the cached greeting on startup and refresh it in the background if needed; never waits on the LLM"""
+    get_greeting()
 
 async def trigger_webhook(event: WebhookEvent):
     """Trigger webhook for external systems integration"""
@@ -59,6 +39,64 @@ async def trigger_webhook(event: WebhookEvent):
     # Example: Send POST to external systems when KYC steps complete
     pass
 
+async def load_session(session_id: str) -> SessionRecord:
+    """Reads the session from the shared store; any worker can serve any session"""
+    record = await get_session_store().get(session_id)
+    if record is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Session not found. Please start a new session using /session/start"
+        )
+    return record
+
+async def save_session(record: SessionRecord):
+    """Saves the session if no other request saved it since it was read"""
+    record.last_activity = datetime.utcnow().isoformat()
+    try:
+        await get_session_store().save(record)
+    except SessionConflictError:
+        raise HTTPException(
+            status_code=409,
+            detail="Session was updated by another request. Please retry."
+        )
+
+@asynccontextmanager
+async def session_turn(session_id: str) -> AsyncIterator[None]:
+    """
+    Holds the session's turn lock from loading the session to saving it. Routing advances the
+    session's checkpoints and memory before the save, so a second turn must wait for the first
+    rather than route from the same state and only fail at the version check.
+    """
+    try:
+        async with get_session_store().lock(session_id):
+            yield
+    except SessionBusyError:
+        raise HTTPException(
+            status_code=409,
+            detail="Another message of this session is still being processed. Please retry."
+        )
+
+def build_orchestrator(session_id: str) -> MainOrchestrator:
+    """Per-request orchestrator; the agents and clients behind it are process-wide"""
+    return MainOrchestrator(MemoryManager(session_id))
+
+def message_processed_event(session_id: str, user_message: str, response_message: str, state: OverallState) -> WebhookEvent:
+    return WebhookEvent(
+        event_type="message_processed",
+        session_id=session_id,
+        data={
+            "user_message": user_message,
+            "ai_response": response_message,
+            "active_workflow": state.get("active_workflow"),
+            "kyc_step": state.get("kyc_step"),
+            "completed_workflows": state.get("completed_workflows", [])
+        }
+    )
+
+def sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format one Server-Sent Events frame"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
 @router.post("/session/start", response_model=ChatResponse)
 async def start_session(
     request: SessionStartRequest,
@@ -69,23 +107,16 @@ async def start_session(
         # Generate new session ID
         session_id = f"api-session-{uuid.uuid4()}"
         
-        # Initialize memory manager and orchestrator
-        memory_client = MemoryManager(session_id)
-        orchestrator = MainOrchestrator(memory_client)
-        
         # Create initial state
-        initial_state = create_initial_state(session_id)
+        initial_state = new_overall_state(session_id, get_greeting())
         
         # Store session data
-        active_sessions[session_id] = {
-            "state": initial_state,
-            "orchestrator": orchestrator,
-            "memory_client": memory_client,
-            "user_id": request.user_id,
-            "metadata": request.metadata or {},
-            "created_at": datetime.utcnow().isoformat(),
-            "last_activity": datetime.utcnow().isoformat()
-        }
+        await save_session(SessionRecord(
+            session_id=session_id,
+            state=initial_state,
+            user_id=request.user_id,
+            metadata=request.metadata or {}
+        ))
         
         # Trigger webhook for session start
         webhook_event = WebhookEvent(
@@ -94,7 +125,7 @@ async def start_session(
             data={
                 "user_id": request.user_id,
                 "metadata": request.metadata,
-                "greeting": GREETING_PROMPT
+                "greeting": initial_state["ai_response"]
             }
         )
         background_tasks.add_task(trigger_webhook, webhook_event)
@@ -102,7 +133,7 @@ async def start_session(
         logger.info(f"New session started: {session_id}")
         
         return ChatResponse(
-            response_to_user=GREETING_PROMPT,
+            response_to_user=initial_state["ai_response"],
             session_id=session_id
         )
         
@@ -124,43 +155,24 @@ async def chat_endpoint(
             new_session_request = SessionStartRequest()
             return await start_session(new_session_request, background_tasks)
         
-        # Validate session exists
-        if session_id not in active_sessions:
-            raise HTTPException(
-                status_code=404, 
-                detail="Session not found. Please start a new session using /session/start"
-            )
-        
-        session_data = active_sessions[session_id]
-        state = session_data["state"]
-        orchestrator = session_data["orchestrator"]
-        
-        # Update last activity
-        session_data["last_activity"] = datetime.utcnow().isoformat()
-        
-        # Process message through the existing orchestrator system
-        try:
-            updated_state, response_message = await orchestrator.route(state, request.message)
+        async with session_turn(session_id):
+            # Validate session exists
+            session = await load_session(session_id)
+            orchestrator = build_orchestrator(session_id)
             
-            # Update session state
-            session_data["state"] = updated_state
+            # Process message through the existing orchestrator system
+            try:
+                updated_state, response_message = await orchestrator.route(session.state, request.message)
+            except Exception as e:
+                logger.error(f"Error in orchestrator routing: {str(e)}")
+                raise HTTPException(status_code=500, detail="Failed to process message")
             
-        except Exception as e:
-            logger.error(f"Error in orchestrator routing: {str(e)}")
-            raise HTTPException(status_code=500, detail="Failed to process message")
+            # Update session state
+            session.state = updated_state
+            await save_session(session)
         
         # Trigger webhook for message processing
-        webhook_event = WebhookEvent(
-            event_type="message_processed",
-            session_id=session_id,
-            data={
-                "user_message": request.message,
-                "ai_response": response_message,
-                "active_workflow": updated_state.get("active_workflow"),
-                "kyc_step": updated_state.get("kyc_step"),
-                "completed_workflows": updated_state.get("completed_workflows", [])
-            }
-        )
+        webhook_event = message_processed_event(session_id, request.message, response_message, updated_state)
         background_tasks.add_task(trigger_webhook, webhook_event)
         
         logger.info(f"Processed message for session {session_id}")
@@ -176,14 +188,83 @@ async def chat_endpoint(
         logger.error(f"Error processing chat message: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to process message")
 
+@router.post("/chat/stream")
+async def chat_stream_endpoint(
+    request: ChatRequest,
+    background_tasks: BackgroundTasks
+):
+    """
+    Server-Sent Events variant of /chat.
+    Emits `progress` events while the turn is routed, `token` events as an LLM answer is generated,
+    and a closing `final` event with the full response and the updated KYC step.
+    """
+    session_id = request.session_id
+    if not session_id:
+        raise HTTPException(
+            status_code=404,
+            detail="Session not found. Please start a new session using /session/start"
+        )
+
+    # Answers 404 before the stream starts; the turn reads the session again once it holds the lock
+    await load_session(session_id)
+    orchestrator = build_orchestrator(session_id)
+    events: asyncio.Queue = asyncio.Queue()
+
+    async def run_turn():
+        try:
+            async with session_turn(session_id):
+                session = await load_session(session_id)
+                updated_state, response_message = await orchestrator.route(
+                    session.state, request.message, on_event=events.put
+                )
+                # Saved here rather than in the generator so a client disconnect does not lose the turn
+                session.state = updated_state
+                await save_session(session)
+            background_tasks.add_task(
+                trigger_webhook,
+                message_processed_event(session_id, request.message, response_message, updated_state)
+            )
+            return updated_state, response_message
+        finally:
+            await events.put(None)
+
+    async def event_stream():
+        turn = asyncio.create_task(run_turn())
+        yield sse_event("progress", {"stage": "received"})
+
+        while (event := await events.get()) is not None:
+            yield sse_event(event["type"], {k: v for k, v in event.items() if k != "type"})
+
+        try:
+            updated_state, response_message = await turn
+        except HTTPException as e:
+            yield sse_event("error", {"detail": e.detail})
+            return
+        except Exception as e:
+            logger.error(f"Error in orchestrator routing: {str(e)}")
+            yield sse_event("error", {"detail": "Failed to process message"})
+            return
+
+        logger.info(f"Streamed message for session {session_id}")
+        yield sse_event("final", {
+            "response_to_user": response_message,
+            "session_id": session_id,
+            "active_workflow": updated_state.get("active_workflow"),
+            "kyc_step": updated_state.get("kyc_step"),
+            "completed_workflows": updated_state.get("completed_workflows", [])
+        })
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.get("/session/{session_id}/status", response_model=SessionStatusResponse)
 async def get_session_status(session_id: str = Depends(validate_session_id)):
     """Get current session status and progress"""
-    if session_id not in active_sessions:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
-    session_data = active_sessions[session_id]
-    state = session_data["state"]
+    session = await load_session(session_id)
+    state = session.state
     
     return SessionStatusResponse(
         session_id=session_id,
@@ -191,8 +272,8 @@ async def get_session_status(session_id: str = Depends(validate_session_id)):
         kyc_step=state.get("kyc_step"),
         completed_workflows=state.get("completed_workflows", []),
         is_active=True,
-        created_at=session_data.get("created_at"),
-        last_activity=session_data.get("last_activity")
+        created_at=session.created_at,
+        last_activity=session.last_activity
     )
 
 @router.delete("/session/{session_id}")
@@ -201,10 +282,7 @@ async def end_session(
     background_tasks: BackgroundTasks = None
 ):
     """End a KYC session and cleanup resources"""
-    if session_id not in active_sessions:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
-    session_data = active_sessions[session_id]
+    session = await load_session(session_id)
     
     # Trigger webhook for session end
     if background_tasks:
@@ -212,39 +290,54 @@ async def end_session(
             event_type="session_end",
             session_id=session_id,
             data={
-                "completed_workflows": session_data["state"].get("completed_workflows", []),
+                "completed_workflows": session.state.get("completed_workflows", []),
                 "ended_at": datetime.utcnow().isoformat()
             }
         )
         background_tasks.add_task(trigger_webhook, webhook_event)
     
     # Clean up session
-    del active_sessions[session_id]
+    await get_session_store().delete(session_id)
+    await release_session(session_id)
     
     logger.info(f"Session ended: {session_id}")
     
     return {"message": "Session ended successfully", "session_id": session_id}
 
-@router.get("/sessions")
-async def list_active_sessions():
-    """List all active sessions (admin endpoint)"""
-    sessions = []
-    for session_id, session_data in active_sessions.items():
-        state = session_data["state"]
-        sessions.append(SessionStatusResponse(
-            session_id=session_id,
-            active_workflow=state.get("active_workflow"),
-            kyc_step=state.get("kyc_step"),
-            completed_workflows=state.get("completed_workflows", []),
-            is_active=True,
-            created_at=session_data.get("created_at"),
-            last_activity=session_data.get("last_activity")
-        ))
+@router.get("/sessions", response_model=SessionListResponse)
+async def list_active_sessions(
+    pagination: Dict[str, Any] = Depends(get_pagination_params),
+    active_workflow: Optional[str] = Query(None, description="Only sessions in this workflow"),
+    kyc_step: Optional[str] = Query(None, description="Only sessions at this KYC step"),
+    active_within: Optional[float] = Query(None, gt=0, description="Only sessions with a turn in the last N seconds")
+):
+    """List active sessions, most recently active first (admin endpoint)"""
+    store = get_session_store()
+    summaries, next_cursor = await store.list_page(
+        pagination["limit"],
+        pagination["cursor"],
+        active_workflow=active_workflow,
+        kyc_step=kyc_step,
+        active_within=active_within
+    )
+    counts = await store.counts()
     
-    return {
-        "active_sessions": len(sessions),
-        "sessions": sessions
-    }
+    return SessionListResponse(
+        active_sessions=counts["total"],
+        sessions=[
+            SessionStatusResponse(
+                session_id=summary.session_id,
+                active_workflow=summary.active_workflow,
+                kyc_step=summary.kyc_step,
+                completed_workflows=summary.completed_workflows,
+                is_active=True,
+                created_at=summary.created_at,
+                last_activity=summary.last_activity
+            )
+            for summary in summaries
+        ],
+        next_cursor=next_cursor
+    )
 
 @router.post("/session/{session_id}/reset")
 async def reset_session(
@@ -252,15 +345,14 @@ async def reset_session(
     background_tasks: BackgroundTasks = None
 ):
     """Reset a session to initial state"""
-    if session_id not in active_sessions:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
-    session_data = active_sessions[session_id]
-    
-    # Reset state to initial
-    initial_state = create_initial_state(session_id)
-    session_data["state"] = initial_state
-    session_data["last_activity"] = datetime.utcnow().isoformat()
+    async with session_turn(session_id):
+        session = await load_session(session_id)
+        
+        # Reset state to initial; the shared agents would otherwise resume the old workflows
+        await MainOrchestrator.clear_session(session_id)
+        initial_state = new_overall_state(session_id, get_greeting())
+        session.state = initial_state
+        await save_session(session)
     
     # Trigger webhook for session reset
     if background_tasks:
@@ -274,6 +366,6 @@ async def reset_session(
     logger.info(f"Session reset: {session_id}")
     
     return ChatResponse(
-        response_to_user=GREETING_PROMPT,
+        response_to_user=initial_state["ai_response"],
         session_id=session_id
     )
\ No newline at end of file
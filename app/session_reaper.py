@@ -0,0 +1,102 @@
+# Background eviction of abandoned sessions.
+# Sessions are normally only removed by DELETE /session/{id}; a closed browser tab never sends it.
+# The reaper periodically evicts sessions idle for longer than SESSION_TTL_SECONDS and, beyond
+# SESSION_MAX_SESSIONS, the least recently active ones, then drops everything else kept for them:
+# their LangGraph checkpoints and their Redis working/episodic memory.
+
+import asyncio
+import logging
+import time
+from functools import lru_cache
+from typing import Optional
+
+from config.config import get_settings
+from memory.memory import MemoryManager
+from orchestrator.router import MainOrchestrator
+from .session_store import get_session_store
+
+logger = logging.getLogger(__name__)
+
+
+async def release_session(session_id: str) -> None:
+    """Drops a removed session's workflow checkpoints and conversation memory."""
+    await MainOrchestrator.clear_session(session_id)
+    await MemoryManager(session_id).clear()
+
+
+class SessionReaper:
+    def __init__(self, interval_seconds: float = 60, max_sessions: int = 0):
+        self.interval_seconds = interval_seconds
+        self.max_sessions = max_sessions
+        self._task: Optional[asyncio.Task] = None
+
+        self.evicted = {"idle": 0, "lru": 0}
+        self.release_failures = 0
+        self.resident_sessions = 0
+        self.sweeps = 0
+        self.last_sweep_seconds = 0.0
+
+# -------------------------------------------------------------------------------------------------
+# PUBLIC FUNCTIONS
+# -------------------------------------------------------------------------------------------------
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def sweep(self) -> int:
+        """One eviction pass; returns the number of sessions evicted."""
+        started = time.perf_counter()
+        store = get_session_store()
+        evicted = await store.evict(self.max_sessions)
+        for session_id, reason in evicted:
+            self.evicted[reason] += 1
+            try:
+                await release_session(session_id)
+            except Exception as e:
+                # The session itself is gone; leftovers expire or are overwritten, so keep sweeping
+                self.release_failures += 1
+                logger.warning(f"Could not release resources of evicted session {session_id}: {e}")
+
+        self.resident_sessions = await store.count()
+        self.sweeps += 1
+        self.last_sweep_seconds = time.perf_counter() - started
+        if evicted:
+            logger.info(f"Evicted {len(evicted)} sessions in {self.last_sweep_seconds:.2f}s; {self.resident_sessions} resident")
+        return len(evicted)
+
+    def stats(self) -> dict:
+        return {
+            "evicted": dict(self.evicted),
+            "release_failures": self.release_failures,
+            "resident_sessions": self.resident_sessions,
+            "sweeps": self.sweeps,
+            "last_sweep_seconds": self.last_sweep_seconds
+        }
+
+# -------------------------------------------------------------------------------------------------
+# INTERNAL FUNCTIONS
+# -------------------------------------------------------------------------------------------------
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.error(f"Session sweep failed: {e}")
+
+
+@lru_cache
+def get_session_reaper() -> SessionReaper:
+    settings = get_settings().session_store
+    return SessionReaper(settings.reaper_interval_seconds, settings.max_sessions)
@@ -0,0 +1,726 @@
+# Chat sessions shared by every uvicorn worker.
+# A session is its OverallState plus a little metadata, stored serialized (compact MessagePack, see
+# state.py), so any worker can serve the next turn: the orchestrator is rebuilt per request from the
+# process-wide agents, and the workflow progress itself lives in the shared checkpointer (agent/checkpointer.py).
+#
+# SESSION_STORE_BACKEND picks where sessions live:
+#   memory - this worker only (single-worker runs, tests)
+#   redis  - shared by every worker on every node
+# Turns of one session are serialized with `lock`, held from reading the session to saving it, so a
+# second turn never routes from a stale state (routing advances the session's checkpoints and memory
+# before the save). Writes also use optimistic concurrency as a backstop: a save only succeeds if the
+# session's version is still the one that was read, so two workers handling turns of the same session
+# can't silently overwrite each other even if a lock expired under a turn.
+# Sessions expire SESSION_TTL_SECONDS after their last save. An expired session reads as missing (and is
+# overwritten by a save of a new session with its id), but it is only removed by `evict`, which app/session_reaper.py calls so that the session's checkpoints and
+# memory keys go with it.
+# Both stores index sessions by active_workflow, kyc_step and last activity, so the admin listing is
+# paginated with a cursor and filtered without scanning every session, and /health counts are O(1).
+
+import asyncio
+import logging
+import time
+import uuid
+from bisect import bisect_left
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+import ormsgpack
+
+from config.config import get_settings
+from state import OverallState, state_from_compact, state_to_compact
+
+logger = logging.getLogger(__name__)
+
+
+class SessionConflictError(Exception):
+    """The session was saved by another request since it was read."""
+
+
+class SessionBusyError(Exception):
+    """Another turn of the session held its lock for longer than the wait allowed."""
+
+
+@dataclass
+class SessionRecord:
+    session_id: str
+    state: OverallState
+    user_id: Optional[str] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    last_activity: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    # Version of the stored copy this record was read from; 0 for a record that was never saved
+    version: int = 0
+    # (active_workflow, kyc_step) the stored copy is indexed under, so the Redis store can name the
+    # index keys a save moves the session out of
+    stored_index: Tuple[str, str] = ("", "")
+
+
+def encode_record(record: SessionRecord) -> bytes:
+    # Positional MessagePack; the version is kept next to the payload so it can be compared without decoding
+    return ormsgpack.packb([
+        record.session_id,
+        state_to_compact(record.state),
+        record.user_id,
+        record.metadata,
+        record.created_at,
+        record.last_activity
+    ])
+
+
+def decode_record(payload: bytes, version: int) -> SessionRecord:
+    session_id, compact_state, user_id, metadata, created_at, last_activity = ormsgpack.unpackb(payload)
+    return SessionRecord(
+        session_id=session_id,
+        state=state_from_compact(compact_state),
+        user_id=user_id,
+        metadata=metadata,
+        created_at=created_at,
+        last_activity=last_activity,
+        version=version
+    )
+
+
+@dataclass
+class SessionSummary:
+    """What the admin listing shows of a session; kept next to the record so listing never decodes states."""
+    session_id: str
+    active_workflow: Optional[str]
+    kyc_step: Optional[str]
+    completed_workflows: List[str]
+    created_at: str
+    last_activity: str
+
+
+# Indexed summary fields; "all" is the index of every session
+INDEXES = ("all", "active_workflow", "kyc_step")
+
+
+def summarize(record: SessionRecord) -> SessionSummary:
+    return SessionSummary(
+        session_id=record.session_id,
+        active_workflow=record.state.get("active_workflow"),
+        kyc_step=record.state.get("kyc_step"),
+        completed_workflows=list(record.state.get("completed_workflows", [])),
+        created_at=record.created_at,
+        last_activity=record.last_activity
+    )
+
+
+def index_values(summary: SessionSummary) -> List[Tuple[str, Any]]:
+    return [("all", None), ("active_workflow", summary.active_workflow), ("kyc_step", summary.kyc_step)]
+
+
+def parse_cursor(cursor: str) -> Tuple[float, str]:
+    """
+    Splits a listing cursor into its position and the session id that breaks ties at that position
+    ("" if the cursor has none). Raises ValueError for a malformed cursor.
+    """
+    position, _, session_id = cursor.partition(":")
+    return float(position), session_id
+
+
+def encode_summary(summary: SessionSummary) -> bytes:
+    return ormsgpack.packb([
+        summary.session_id, summary.active_workflow, summary.kyc_step,
+        summary.completed_workflows, summary.created_at, summary.last_activity
+    ])
+
+
+def decode_summary(payload: bytes) -> SessionSummary:
+    return SessionSummary(*ormsgpack.unpackb(payload))
+
+
+class _StoredSession:
+    __slots__ = ("expires_at", "saved_at", "seq", "version", "payload", "summary")
+
+    def __init__(self, expires_at: float, saved_at: float, seq: int, version: int, payload: bytes, summary: SessionSummary):
+        self.expires_at = expires_at
+        self.saved_at = saved_at
+        self.seq = seq
+        self.version = version
+        self.payload = payload
+        self.summary = summary
+
+
+class InMemorySessionStore:
+    """
+    Sessions in a dict, visible to this worker only, kept in least-recently-saved order.
+
+    Every save takes the next sequence number and appends (seq, session_id) to the ordered list of
+    each index the session is in (all sessions, its active_workflow, its kyc_step). Entries left
+    behind by earlier saves are skipped when read and dropped once they outnumber the live ones,
+    so a page is a bisect plus a short walk, whatever the number of sessions.
+    """
+    name = "memory"
+
+    def __init__(self, ttl_seconds: float = 86400, lock_wait_seconds: float = 30):
+        self.ttl_seconds = ttl_seconds
+        self.lock_wait_seconds = lock_wait_seconds
+        self._sessions: "OrderedDict[str, _StoredSession]" = OrderedDict()
+        # session_id -> [lock, turns holding or waiting for it]; dropped when no turn needs it
+        self._locks: Dict[str, list] = {}
+        self._seq = 0
+        # index name -> value -> session ids / (seq, session_id) in save order
+        self._members: Dict[str, Dict[Any, Set[str]]] = {name: {} for name in INDEXES}
+        self._order: Dict[str, Dict[Any, List[Tuple[int, str]]]] = {name: {} for name in INDEXES}
+
+        self.conflicts = 0
+        self.lock_timeouts = 0
+
+# -------------------------------------------------------------------------------------------------
+# PUBLIC FUNCTIONS
+# -------------------------------------------------------------------------------------------------
+
+    @asynccontextmanager
+    async def lock(self, session_id: str) -> AsyncIterator[None]:
+        """
+        Holds the session's turn lock for the body of the `async with`. Waits up to
+        lock_wait_seconds for the turn holding it, then raises SessionBusyError.
+        """
+        holder = self._locks.setdefault(session_id, [asyncio.Lock(), 0])
+        holder[1] += 1
+        try:
+            try:
+                await asyncio.wait_for(holder[0].acquire(), self.lock_wait_seconds)
+            except asyncio.TimeoutError:
+                self.lock_timeouts += 1
+                raise SessionBusyError(session_id)
+            try:
+                yield
+            finally:
+                holder[0].release()
+        finally:
+            holder[1] -= 1
+            if not holder[1]:
+                del self._locks[session_id]
+
+    async def get(self, session_id: str) -> Optional[SessionRecord]:
+        entry = self._live_entry(session_id)
+        if entry is None:
+            return None
+        return decode_record(entry.payload, entry.version)
+
+    async def save(self, record: SessionRecord) -> None:
+        """
+        Stores the record if the stored version still matches `record.version` (0 = must not exist yet),
+        then bumps `record.version`. Raises SessionConflictError otherwise.
+        """
+        entry = self._live_entry(record.session_id)
+        stored_version = entry.version if entry else 0
+        if stored_version != record.version:
+            self.conflicts += 1
+            raise SessionConflictError(record.session_id)
+        payload = encode_record(record)
+        record.version += 1
+
+        previous = self._sessions.get(record.session_id)
+        if previous is not None:
+            self._unindex(record.session_id, previous.summary)
+        self._seq += 1
+        now = time.monotonic()
+        summary = summarize(record)
+        self._sessions[record.session_id] = _StoredSession(now + self.ttl_seconds, now, self._seq, record.version, payload, summary)
+        self._sessions.move_to_end(record.session_id)
+        self._index(record.session_id, summary, self._seq)
+
+    async def delete(self, session_id: str) -> bool:
+        return self._remove(session_id)
+
+    async def list_page(
+            self,
+            limit: int,
+            cursor: Optional[str] = None,
+            active_workflow: Optional[str] = None,
+            kyc_step: Optional[str] = None,
+            active_within: Optional[float] = None
+        ) -> Tuple[List[SessionSummary], Optional[str]]:
+        """
+        Most recently active sessions first, optionally only those with the given active_workflow /
+        kyc_step or active in the last `active_within` seconds. Returns the page and the cursor of
+        the next one (None on the last page).
+        """
+        filters = {name: value for name, value in (("active_workflow", active_workflow), ("kyc_step", kyc_step)) if value is not None}
+        # Walk the smallest matching index and check the other filter per session
+        walk_name, walk_value = min(
+            filters.items() or [("all", None)],
+            key=lambda item: len(self._members[item[0]].get(item[1], ()))
+        )
+        order = self._order[walk_name].get(walk_value, [])
+        position = bisect_left(order, (int(parse_cursor(cursor)[0]), "")) if cursor else len(order)
+
+        now = time.monotonic()
+        cutoff = now - active_within if active_within else None
+        page = []
+        while position > 0:
+            position -= 1
+            seq, session_id = order[position]
+            entry = self._sessions.get(session_id)
+            if entry is None or entry.seq != seq:
+                continue
+            # The walk is in save order, so everything from here on is older still
+            if entry.expires_at < now or (cutoff is not None and entry.saved_at < cutoff):
+                break
+            if any(getattr(entry.summary, name) != value for name, value in filters.items()):
+                continue
+            if len(page) == limit:
+                return [summary for _, summary in page], str(page[-1][0])
+            page.append((seq, entry.summary))
+        return [summary for _, summary in page], None
+
+    async def count(self) -> int:
+        return len(self._sessions)
+
+    async def counts(self) -> dict:
+        """Sessions in total and per active workflow, without touching the sessions themselves."""
+        return {
+            "total": len(self._sessions),
+            "by_workflow": {
+                workflow: len(members) for workflow, members in self._members["active_workflow"].items() if workflow is not None
+            }
+        }
+
+    async def evict(self, max_sessions: int = 0) -> List[Tuple[str, str]]:
+        """
+        Removes expired sessions, then the least recently saved ones beyond `max_sessions` (0 = no cap).
+        Returns (session_id, "idle" | "lru") for each removed session.
+        """
+        evicted = []
+        now = time.monotonic()
+        # Every save moves its session to the end with the same TTL, so expired sessions are at the front
+        while self._sessions and next(iter(self._sessions.values())).expires_at < now:
+            session_id = next(iter(self._sessions))
+            self._remove(session_id)
+            evicted.append((session_id, "idle"))
+        while max_sessions and len(self._sessions) > max_sessions:
+            session_id = next(iter(self._sessions))
+            self._remove(session_id)
+            evicted.append((session_id, "lru"))
+        return evicted
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.name,
+            "sessions": len(self._sessions),
+            "conflicts": self.conflicts,
+            "lock_timeouts": self.lock_timeouts
+        }
+
+# -------------------------------------------------------------------------------------------------
+# INTERNAL FUNCTIONS
+# -------------------------------------------------------------------------------------------------
+
+    def _live_entry(self, session_id: str) -> Optional[_StoredSession]:
+        entry = self._sessions.get(session_id)
+        if entry is not None and entry.expires_at < time.monotonic():
+            return None
+        return entry
+
+    def _remove(self, session_id: str) -> bool:
+        entry = self._sessions.pop(session_id, None)
+        if entry is None:
+            return False
+        self._unindex(session_id, entry.summary)
+        return True
+
+    def _index(self, session_id: str, summary: SessionSummary, seq: int) -> None:
+        for name, value in index_values(summary):
+            members = self._members[name].setdefault(value, set())
+            members.add(session_id)
+            order = self._order[name].setdefault(value, [])
+            order.append((seq, session_id))
+            if len(order) > 2 * len(members) + 64:
+                self._order[name][value] = [
+                    (entry_seq, sid) for entry_seq, sid in order
+                    if (entry := self._sessions.get(sid)) is not None and entry.seq == entry_seq
+                ]
+
+    def _unindex(self, session_id: str, summary: SessionSummary) -> None:
+        for name, value in index_values(summary):
+            members = self._members[name].get(value)
+            if members is None:
+                continue
+            members.discard(session_id)
+            if not members:
+                del self._members[name][value]
+                del self._order[name][value]
+
+
+# Key layout. Every key carries the prefix's hash tag ("{kyc:session}"), so on Redis Cluster they all
+# share one slot and a script can touch any of them; the scripts get every key they touch in KEYS.
+#   <prefix>:<session_id>                    hash: version, data, summary, active_workflow, kyc_step
+#   <prefix>_activity                        sorted set session_id -> time of last save
+#   <prefix>_idx:<name>:<value>              sorted set session_id -> time of last save, per indexed value
+#   <prefix>_idx:<name>                      set of the values currently indexed under <name>
+#   <prefix>_lock:<session_id>               string: token of the turn holding the session's lock (see `lock`)
+# The scripts below start with the session's keys, as `_session_keys` lists them:
+#   KEYS = session hash, activity, active_workflow index, active_workflow values, kyc_step index, kyc_step values
+# for the index values the caller expects the session to be stored under. They return STALE_INDEX
+# if the session is stored under others; the caller reads them and runs the script again.
+UNINDEX_LUA = """
+local function unindex(id, active_workflow, kyc_step)
+    local values = {active_workflow, kyc_step}
+    for i = 1, 2 do
+        local key, names = KEYS[2 * i + 1], KEYS[2 * i + 2]
+        redis.call('ZREM', key, id)
+        if redis.call('ZCARD', key) == 0 then
+            redis.call('SREM', names, values[i])
+        end
+    end
+end
+
+local function stored_elsewhere(stored, active_workflow, kyc_step)
+    return stored[1] and ((stored[2] or '') ~= active_workflow or (stored[3] or '') ~= kyc_step)
+end
+"""
+
+# KEYS = session keys, then the active_workflow and kyc_step indexes of the new values.
+# ARGV = session_id, expected version, payload, now, summary, stored active_workflow, stored kyc_step,
+# new active_workflow, new kyc_step, expiry cutoff.
+# Compare-and-set plus index maintenance in one round trip. A session last saved before the cutoff has
+# expired and counts as version 0, as it reads as missing.
+SAVE_SCRIPT = UNINDEX_LUA + """
+local id = ARGV[1]
+local stored = redis.call('HMGET', KEYS[1], 'version', 'active_workflow', 'kyc_step')
+local current = tonumber(stored[1] or '0')
+local saved_at = redis.call('ZSCORE', KEYS[2], id)
+if saved_at and tonumber(saved_at) < tonumber(ARGV[10]) then
+    current = 0
+end
+if current ~= tonumber(ARGV[2]) then
+    return -1
+end
+if stored_elsewhere(stored, ARGV[6], ARGV[7]) then
+    return -2
+end
+if stored[1] then
+    unindex(id, ARGV[6], ARGV[7])
+end
+local version = current + 1
+redis.call('HSET', KEYS[1], 'version', version, 'data', ARGV[3], 'summary', ARGV[5], 'active_workflow', ARGV[8], 'kyc_step', ARGV[9])
+redis.call('ZADD', KEYS[2], ARGV[4], id)
+redis.call('ZADD', KEYS[7], ARGV[4], id)
+redis.call('SADD', KEYS[4], ARGV[8])
+redis.call('ZADD', KEYS[8], ARGV[4], id)
+redis.call('SADD', KEYS[6], ARGV[9])
+return version
+"""
+
+# KEYS = session keys. ARGV = session_id, stored active_workflow, stored kyc_step, latest last-save
+# time to remove ("" = any). Returns 1 if the session was removed, 0 if it was missing or saved since.
+# Eviction passes the last-save time it found the session with, so when several workers sweep at
+# once each session is evicted by exactly one, and a session saved in between is kept.
+REMOVE_SCRIPT = UNINDEX_LUA + """
+local id = ARGV[1]
+if ARGV[4] ~= '' then
+    local saved_at = redis.call('ZSCORE', KEYS[2], id)
+    if saved_at and tonumber(saved_at) > tonumber(ARGV[4]) then
+        return 0
+    end
+end
+local stored = redis.call('HMGET', KEYS[1], 'version', 'active_workflow', 'kyc_step')
+if stored_elsewhere(stored, ARGV[2], ARGV[3]) then
+    return -2
+end
+if stored[1] then
+    unindex(id, ARGV[2], ARGV[3])
+end
+local removed = redis.call('ZREM', KEYS[2], id) + redis.call('DEL', KEYS[1])
+return math.min(removed, 1)
+"""
+STALE_INDEX = -2
+EVICT_BATCH = 500
+
+# KEYS = lock key; ARGV = token. Releases the lock only if this turn still holds it: if the lock
+# expired and another turn took it, that turn's lock is left alone.
+UNLOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+# How often a turn waiting for a session's lock tries again
+LOCK_POLL_SECONDS = 0.05
+
+
+class RedisSessionStore:
+    """
+    Sessions in Redis, shared by every worker on every node (key layout above UNINDEX_LUA).
+    Saves, deletes and evictions are Lua scripts, so the version check, the record and its index
+    entries always change together. Session hashes carry no Redis TTL: an expiring hash would leave
+    its index entries behind. `get` and `save` check the last-save time instead, and `evict` removes
+    expired sessions.
+    """
+    name = "redis"
+
+    def __init__(
+            self,
+            client,
+            prefix: str = "{kyc:session}",
+            ttl_seconds: int = 86400,
+            lock_wait_seconds: float = 30,
+            lock_ttl_seconds: float = 120
+        ):
+        self._redis = client
+        self._prefix = prefix
+        self._activity_key = f"{prefix}_activity"
+        self.ttl_seconds = int(ttl_seconds)
+        self.lock_wait_seconds = lock_wait_seconds
+        self.lock_ttl_seconds = lock_ttl_seconds
+        self._save_script = client.register_script(SAVE_SCRIPT)
+        self._remove_script = client.register_script(REMOVE_SCRIPT)
+        self._unlock_script = client.register_script(UNLOCK_SCRIPT)
+
+        self.conflicts = 0
+        self.lock_timeouts = 0
+
+# -------------------------------------------------------------------------------------------------
+# PUBLIC FUNCTIONS
+# -------------------------------------------------------------------------------------------------
+
+    @asynccontextmanager
+    async def lock(self, session_id: str) -> AsyncIterator[None]:
+        """
+        Same contract as InMemorySessionStore.lock, across every worker: SET NX PX on the session's
+        lock key. The lock expires after lock_ttl_seconds so a worker dying mid-turn can't wedge the
+        session; the version check on save still catches a turn that outlived its lock.
+        """
+        key = f"{self._prefix}_lock:{session_id}"
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + self.lock_wait_seconds
+        while not await self._redis.set(key, token, nx=True, px=int(self.lock_ttl_seconds * 1000)):
+            if time.monotonic() >= deadline:
+                self.lock_timeouts += 1
+                raise SessionBusyError(session_id)
+            await asyncio.sleep(LOCK_POLL_SECONDS)
+        try:
+            yield
+        finally:
+            await self._unlock_script(keys=[key], args=[token])
+
+    async def get(self, session_id: str) -> Optional[SessionRecord]:
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.hmget(self._key(session_id), "version", "data", "active_workflow", "kyc_step")
+        pipe.zscore(self._activity_key, session_id)
+        (version, payload, active_workflow, kyc_step), saved_at = await pipe.execute()
+        if payload is None or (saved_at is not None and saved_at < time.time() - self.ttl_seconds):
+            # Expired sessions stay until the reaper evicts them, but read as missing
+            return None
+        record = decode_record(payload, int(version))
+        record.stored_index = ((active_workflow or b"").decode(), (kyc_step or b"").decode())
+        return record
+
+    async def save(self, record: SessionRecord) -> None:
+        """Same contract as InMemorySessionStore.save."""
+        summary = summarize(record)
+        new_index = (summary.active_workflow or "", summary.kyc_step or "")
+        payload = encode_record(record)
+        now = time.time()
+        while True:
+            version = await self._save_script(
+                keys=self._session_keys(record.session_id, record.stored_index) + [
+                    self._index_key("active_workflow", new_index[0]),
+                    self._index_key("kyc_step", new_index[1])
+                ],
+                args=[
+                    record.session_id,
+                    record.version,
+                    payload,
+                    now,
+                    encode_summary(summary),
+                    *record.stored_index,
+                    *new_index,
+                    now - self.ttl_seconds
+                ]
+            )
+            if version != STALE_INDEX:
+                break
+            # Saving over an expired session, or a record built without reading the stored one
+            record.stored_index = await self._stored_index(record.session_id)
+        if version == -1:
+            self.conflicts += 1
+            raise SessionConflictError(record.session_id)
+        record.version = int(version)
+        record.stored_index = new_index
+
+    async def delete(self, session_id: str) -> bool:
+        stored_index = await self._stored_index(session_id)
+        while True:
+            removed = await self._remove_script(
+                keys=self._session_keys(session_id, stored_index), args=[session_id, *stored_index, ""]
+            )
+            if removed != STALE_INDEX:
+                return bool(removed)
+            stored_index = await self._stored_index(session_id)
+
+    async def list_page(
+            self,
+            limit: int,
+            cursor: Optional[str] = None,
+            active_workflow: Optional[str] = None,
+            kyc_step: Optional[str] = None,
+            active_within: Optional[float] = None
+        ) -> Tuple[List[SessionSummary], Optional[str]]:
+        """
+        Same contract as InMemorySessionStore.list_page. The cursor is "<last-save time>:<session id>"
+        of the last session on the page: sessions saved at the same time are ordered by id (descending,
+        as ZREVRANGEBYSCORE returns them), so the next page starts right after it even on a tie.
+        """
+        filters = {name: value for name, value in (("active_workflow", active_workflow), ("kyc_step", kyc_step)) if value is not None}
+        walk_key = self._activity_key
+        if filters:
+            name, value = next(iter(filters.items()))
+            walk_key = f"{self._prefix}_idx:{name}:{value}"
+        now = time.time()
+        min_score = max(now - self.ttl_seconds, now - active_within if active_within else 0)
+        after_score, after_id = parse_cursor(cursor) if cursor else (None, "")
+        after_id = after_id.encode()
+        # Each batch starts at max_score inclusive, past the `offset` entries at that score already walked
+        max_score = repr(after_score) if cursor else "+inf"
+        offset = 0
+
+        page = []
+        while len(page) <= limit:
+            batch = await self._redis.zrevrangebyscore(walk_key, max_score, min_score, start=offset, num=limit + 1, withscores=True)
+            # Entries at the cursor's time are only new if their id sorts below the cursor's
+            candidates = [(session_id, score) for session_id, score in batch if score != after_score or session_id < after_id]
+            pipe = self._redis.pipeline(transaction=False)
+            for session_id, _ in candidates:
+                pipe.hget(self._key(session_id.decode()), "summary")
+            for (_, score), payload in zip(candidates, await pipe.execute()):
+                if payload is None:
+                    continue
+                summary = decode_summary(payload)
+                if all(getattr(summary, name) == value for name, value in filters.items()):
+                    page.append((score, summary))
+            if len(batch) <= limit:
+                break
+            last_score = batch[-1][1]
+            if max_score != "+inf" and float(max_score) == last_score:
+                # The whole batch was at max_score
+                offset += len(batch)
+            else:
+                max_score = repr(last_score)
+                offset = sum(1 for _, score in batch if score == last_score)
+
+        if len(page) > limit:
+            score, summary = page[limit - 1]
+            return [summary for _, summary in page[:limit]], f"{score!r}:{summary.session_id}"
+        return [summary for _, summary in page], None
+
+    async def count(self) -> int:
+        return await self._redis.zcard(self._activity_key)
+
+    async def counts(self) -> dict:
+        """Same contract as InMemorySessionStore.counts; one ZCARD per workflow in use."""
+        workflows = sorted(value.decode() for value in await self._redis.smembers(f"{self._prefix}_idx:active_workflow"))
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.zcard(self._activity_key)
+        for workflow in workflows:
+            pipe.zcard(f"{self._prefix}_idx:active_workflow:{workflow}")
+        total, *sizes = await pipe.execute()
+        return {
+            "total": total,
+            "by_workflow": {workflow: size for workflow, size in zip(workflows, sizes) if workflow}
+        }
+
+    async def evict(self, max_sessions: int = 0) -> List[Tuple[str, str]]:
+        """
+        Same contract as InMemorySessionStore.evict, across every worker's sessions. Sessions are
+        found in batches of EVICT_BATCH, then each is removed by REMOVE_SCRIPT only if it has not
+        been saved since it was found.
+        """
+        evicted = []
+        cutoff = time.time() - self.ttl_seconds
+        while True:
+            batch = await self._redis.zrangebyscore(self._activity_key, "-inf", cutoff, start=0, num=EVICT_BATCH, withscores=True)
+            removed = await self._remove_found(batch)
+            evicted += [(session_id, "idle") for session_id in removed]
+            if len(batch) < EVICT_BATCH or not removed:
+                break
+        while max_sessions:
+            excess = min(await self._redis.zcard(self._activity_key) - max_sessions, EVICT_BATCH)
+            if excess <= 0:
+                break
+            batch = await self._redis.zrange(self._activity_key, 0, excess - 1, withscores=True)
+            removed = await self._remove_found(batch)
+            evicted += [(session_id, "lru") for session_id in removed]
+            if not removed:
+                break
+        return evicted
+
+    def stats(self) -> dict:
+        return {"backend": self.name, "conflicts": self.conflicts, "lock_timeouts": self.lock_timeouts}
+
+# -------------------------------------------------------------------------------------------------
+# INTERNAL FUNCTIONS
+# -------------------------------------------------------------------------------------------------
+
+    def _key(self, session_id: str) -> str:
+        return f"{self._prefix}:{session_id}"
+
+    def _index_key(self, name: str, value: str) -> str:
+        return f"{self._prefix}_idx:{name}:{value}"
+
+    def _session_keys(self, session_id: str, stored_index: Tuple[str, str]) -> List[str]:
+        """KEYS of a session, in the order UNINDEX_LUA expects them."""
+        active_workflow, kyc_step = stored_index
+        return [
+            self._key(session_id),
+            self._activity_key,
+            self._index_key("active_workflow", active_workflow),
+            f"{self._prefix}_idx:active_workflow",
+            self._index_key("kyc_step", kyc_step),
+            f"{self._prefix}_idx:kyc_step"
+        ]
+
+    async def _stored_index(self, session_id: str) -> Tuple[str, str]:
+        active_workflow, kyc_step = await self._redis.hmget(self._key(session_id), "active_workflow", "kyc_step")
+        return (active_workflow or b"").decode(), (kyc_step or b"").decode()
+
+    async def _remove_found(self, found: List[Tuple[bytes, float]]) -> List[str]:
+        """
+        Removes the (session_id, last-save time) pairs found by `evict`, unless saved since;
+        two round trips per batch. Returns the ids that were removed.
+        """
+        session_ids = [session_id.decode() for session_id, _ in found]
+        pipe = self._redis.pipeline(transaction=False)
+        for session_id in session_ids:
+            pipe.hmget(self._key(session_id), "active_workflow", "kyc_step")
+        stored_indexes = [
+            ((active_workflow or b"").decode(), (kyc_step or b"").decode())
+            for active_workflow, kyc_step in await pipe.execute()
+        ]
+
+        pipe = self._redis.pipeline(transaction=False)
+        for session_id, (_, saved_at), stored_index in zip(session_ids, found, stored_indexes):
+            await self._remove_script(
+                keys=self._session_keys(session_id, stored_index), args=[session_id, *stored_index, repr(saved_at)], client=pipe
+            )
+        # STALE_INDEX here means the session was saved after its index was read; it is no longer a candidate
+        return [session_id for session_id, removed in zip(session_ids, await pipe.execute()) if removed == 1]
+
+
+@lru_cache
+def get_session_store():
+    """Process-wide session store, backed by SESSION_STORE_BACKEND."""
+    settings = get_settings().session_store
+    if settings.backend == "memory":
+        store = InMemorySessionStore(ttl_seconds=settings.ttl_seconds, lock_wait_seconds=settings.lock_wait_seconds)
+    elif settings.backend == "redis":
+        from memory.redis_client import get_redis
+
+        store = RedisSessionStore(
+            get_redis(),
+            ttl_seconds=settings.ttl_seconds,
+            lock_wait_seconds=settings.lock_wait_seconds,
+            lock_ttl_seconds=settings.lock_ttl_seconds
+        )
+    else:
+        raise ValueError(f"Unknown SESSION_STORE_BACKEND {settings.backend!r}; expected memory or redis")
+    logger.info(f"Session store: {store.name}, sessions expire {settings.ttl_seconds:.0f}s after their last turn")
+    return store
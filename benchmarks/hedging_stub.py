@@ -0,0 +1,128 @@
+"""
+Hedged-request benchmark against a local OpenAI-compatible stub with injected latency.
+
+Starts a stub `/v1/chat/completions` server in-process, then sends the same structured request
+(shaped like `MainOrchestrator._get_intent`) with hedging off and on, and prints latency
+percentiles, hedge counts and how many requests reached the stub.
+
+    python -m benchmarks.hedging_stub --requests 400 --slow-probability 0.03 --slow-latency 2.0
+
+Needs the usual .env for the other settings; the LLM endpoint is pointed at the stub.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import time
+
+import uvicorn
+from fastapi import FastAPI, Request
+
+STUB_CALLS = {"n": 0}
+
+
+def build_stub(base_latency: float, slow_probability: float, slow_latency: float) -> FastAPI:
+    stub = FastAPI()
+
+    @stub.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        STUB_CALLS["n"] += 1
+        body = await request.json()
+        slow = random.random() < slow_probability
+        await asyncio.sleep(slow_latency if slow else random.uniform(0.5, 1.5) * base_latency)
+
+        content = "stub"
+        response_format = body.get("response_format") or {}
+        if response_format.get("type") == "json_schema":
+            content = json.dumps({
+                "intent": "User is providing information for a currently active workflow.",
+                "argument": None,
+                "user_provides_data": True,
+                "reason": "stub"
+            })
+        return {
+            "id": "stub", "object": "chat.completion", "created": int(time.time()), "model": body["model"],
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2}
+        }
+
+    return stub
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentile(samples, p: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+async def run_phase(factory, parser, requests: int, concurrency: int, hedge: bool):
+    latencies = []
+    slots = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        async with slots:
+            started = time.perf_counter()
+            # Distinct prompts so neither the cache nor single-flight hides upstream latency
+            await factory._get_structured_response(
+                human_prompt=f"123456 ({i})", parser=parser, sys_prompt="bench", use_cache=False, hedge=hedge
+            )
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return latencies
+
+
+async def main(args):
+    port = free_port()
+    os.environ["GEMINI_BASE_URL"] = f"http://127.0.0.1:{port}/v1"
+    os.environ.setdefault("GEMINI_API_KEY", "stub")
+
+    from llm.factory import LLMFactory, close_http_client
+    from llm.hedging import get_hedger
+    from models.intent import OrchestratorDecision
+
+    server = uvicorn.Server(uvicorn.Config(
+        build_stub(args.base_latency, args.slow_probability, args.slow_latency),
+        host="127.0.0.1", port=port, log_level="warning"
+    ))
+    serve = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    factory = LLMFactory(base_url=os.environ["GEMINI_BASE_URL"])
+    hedger = get_hedger()
+    try:
+        for hedge in (False, True):
+            calls_before = STUB_CALLS["n"]
+            latencies = await run_phase(factory, OrchestratorDecision, args.requests, args.concurrency, hedge)
+            print(
+                f"hedge={'on ' if hedge else 'off'} "
+                f"p50={statistics.median(latencies) * 1000:7.1f}ms "
+                f"p95={percentile(latencies, 0.95) * 1000:7.1f}ms "
+                f"p99={percentile(latencies, 0.99) * 1000:7.1f}ms "
+                f"upstream_calls={STUB_CALLS['n'] - calls_before}"
+            )
+        print("hedger:", hedger.stats())
+    finally:
+        await close_http_client()
+        server.should_exit = True
+        await serve
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--base-latency", type=float, default=0.05)
+    parser.add_argument("--slow-probability", type=float, default=0.03)
+    parser.add_argument("--slow-latency", type=float, default=2.0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,204 @@
+"""
+Redis round trips per turn in MemoryManager, against a local Redis stand-in with injected latency.
+
+Starts a minimal RESP server in-process (just the commands MemoryManager uses) that waits
+--rtt-ms before answering each batch it reads, the way a remote Redis answers a pipeline in one
+network round trip. Runs the same turns (get_memory_context, then add_turn) through the
+command-per-call sequence MemoryManager used to make and through MemoryManager itself, and prints
+round trips and latency per turn for both.
+
+    python -m benchmarks.memory_round_trips --sessions 20 --turns 30 --rtt-ms 1.0
+
+L2 summarization is switched off so that only the Redis traffic of a turn is measured.
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+
+class RedisStandIn:
+    """In-process RESP3 server holding strings, counters and lists; enough for MemoryManager, not a Redis (no expiry)."""
+
+    def __init__(self, rtt: float):
+        self.rtt = rtt
+        self.data = {}
+        # Bumped on every write to a key, for WATCH
+        self.versions = {}
+        self.round_trips = 0
+        self.commands = 0
+
+    async def serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        buffer, queued, watched = b"", None, {}
+        while chunk := await reader.read(65536):
+            buffer += chunk
+            replies = []
+            while (parsed := parse_command(buffer)) is not None:
+                command, buffer = parsed
+                name = command[0].upper()
+                if name == b"MULTI":
+                    queued, reply = [], b"+OK\r\n"
+                elif name == b"EXEC":
+                    if any(self.versions.get(key, 0) != version for key, version in watched.items()):
+                        reply = b"_\r\n"
+                    else:
+                        reply = b"*%d\r\n" % len(queued) + b"".join(self.execute(queued_command) for queued_command in queued)
+                    queued, watched = None, {}
+                elif name == b"DISCARD":
+                    queued, watched, reply = None, {}, b"+OK\r\n"
+                elif name == b"WATCH":
+                    watched.update({key: self.versions.get(key, 0) for key in command[1:]})
+                    reply = b"+OK\r\n"
+                elif name == b"UNWATCH":
+                    watched, reply = {}, b"+OK\r\n"
+                elif queued is not None:
+                    queued.append(command)
+                    reply = b"+QUEUED\r\n"
+                else:
+                    reply = self.execute(command)
+                replies.append(reply)
+            if replies:
+                self.round_trips += 1
+                await asyncio.sleep(self.rtt)
+                writer.write(b"".join(replies))
+                await writer.drain()
+        writer.close()
+
+    def execute(self, command: list) -> bytes:
+        self.commands += 1
+        name, args = command[0].upper(), command[1:]
+        if name in (b"LPUSH", b"LTRIM", b"SET", b"DEL", b"INCRBY"):
+            for key in (args if name == b"DEL" else args[:1]):
+                self.versions[key] = self.versions.get(key, 0) + 1
+        if name == b"HELLO":
+            return b"%1\r\n+proto\r\n:3\r\n"
+        if name in (b"AUTH", b"CLIENT", b"SELECT"):
+            return b"+OK\r\n"
+        if name == b"LPUSH":
+            values = self.data.setdefault(args[0], [])
+            for value in args[1:]:
+                values.insert(0, value)
+            return b":%d\r\n" % len(values)
+        if name == b"LTRIM":
+            values = self.data.get(args[0], [])
+            values = values[slice_of(values, args[1], args[2])]
+            if values:
+                self.data[args[0]] = values
+            else:
+                self.data.pop(args[0], None)
+            return b"+OK\r\n"
+        if name == b"LLEN":
+            return b":%d\r\n" % len(self.data.get(args[0], []))
+        if name == b"LRANGE":
+            values = self.data.get(args[0], [])
+            values = values[slice_of(values, args[1], args[2])]
+            return b"*%d\r\n" % len(values) + b"".join(bulk(value) for value in values)
+        if name == b"EXISTS":
+            return b":%d\r\n" % sum(key in self.data for key in args)
+        if name == b"INCRBY":
+            self.data[args[0]] = b"%d" % (int(self.data.get(args[0], b"0")) + int(args[1]))
+            return b":%s\r\n" % self.data[args[0]]
+        if name == b"GET":
+            return bulk(self.data.get(args[0]))
+        if name == b"SET":
+            self.data[args[0]] = args[1]
+            return b"+OK\r\n"
+        if name == b"DEL":
+            return b":%d\r\n" % sum(self.data.pop(key, None) is not None for key in args)
+        return b"-ERR unknown command '%s'\r\n" % name
+
+
+def slice_of(values: list, start: bytes, stop: bytes) -> slice:
+    stop = int(stop)
+    return slice(int(start), len(values) + stop + 1 if stop < 0 else stop + 1)
+
+
+def bulk(value) -> bytes:
+    return b"_\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+
+
+def parse_command(buffer: bytes):
+    """One RESP array of bulk strings off the front of the buffer, or None if it is incomplete."""
+    end = buffer.find(b"\r\n")
+    if not buffer.startswith(b"*") or end < 0:
+        return None
+    position, command = end + 2, []
+    for _ in range(int(buffer[1:end])):
+        end = buffer.find(b"\r\n", position)
+        if end < 0:
+            return None
+        size = int(buffer[position + 1:end])
+        position = end + 2
+        if len(buffer) < position + size + 2:
+            return None
+        command.append(buffer[position:position + size])
+        position += size + 2
+    return command, buffer[position:]
+
+
+async def command_per_call_turn(manager, user_message: str, ai_message: str):
+    """The Redis traffic of one turn as MemoryManager made it before pipelining: six round trips."""
+    redis_client = manager.redis_client
+    await redis_client.lrange(manager.working_memory_key, 0, -1)
+    await redis_client.get(manager.episodic_memory_key)
+    await redis_client.lpush(manager.working_memory_key, f"AI: {ai_message}")
+    await redis_client.lpush(manager.working_memory_key, f"User: {user_message}")
+    await redis_client.ltrim(manager.working_memory_key, 0, manager.working_memory_turns * 2 - 1)
+    await redis_client.llen(manager.working_memory_key)
+
+
+async def pipelined_turn(manager, user_message: str, ai_message: str):
+    await manager.get_memory_context(user_message)
+    await manager.add_turn(user_message, ai_message, "pan")
+
+
+async def run(label: str, turn, stand_in: RedisStandIn, args):
+    from memory.memory import MemoryManager
+
+    async def session(index: int, latencies: list):
+        manager = MemoryManager(f"api-session-round-trips-{label}-{index}")
+        for number in range(args.turns):
+            started = time.perf_counter()
+            await turn(manager, f"message {number}", f"reply {number}")
+            latencies.append(time.perf_counter() - started)
+        await manager.clear()
+
+    latencies = []
+    round_trips_before = stand_in.round_trips
+    await asyncio.gather(*(session(index, latencies) for index in range(args.sessions)))
+    turns = args.sessions * args.turns
+    latencies.sort()
+    print(
+        f"{label:18s} round_trips/turn={(stand_in.round_trips - round_trips_before) / turns:5.2f} "
+        f"p50={latencies[len(latencies) // 2] * 1e3:6.2f}ms p95={latencies[int(len(latencies) * 0.95)] * 1e3:6.2f}ms"
+    )
+
+
+async def main(args):
+    stand_in = RedisStandIn(args.rtt_ms / 1e3)
+    server = await asyncio.start_server(stand_in.serve, "127.0.0.1", 0)
+    os.environ["REDIS_HOST"] = "127.0.0.1"
+    os.environ["REDIS_PORT"] = str(server.sockets[0].getsockname()[1])
+    os.environ["REDIS_MAX_CONNECTIONS"] = str(args.sessions)
+
+    import memory.memory
+    from memory.redis_client import close_redis
+
+    memory.memory.SUMMARIZATION_THRESHOLD = float("inf")
+    # No mem0 calls are made on this path; skip the client's API-key check over HTTP
+    memory.memory.get_mem0_client = lambda: None
+
+    await run("command-per-call", command_per_call_turn, stand_in, args)
+    await run("pipelined", pipelined_turn, stand_in, args)
+
+    await close_redis()
+    server.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=20, help="concurrent sessions")
+    parser.add_argument("--turns", type=int, default=30, help="turns per session")
+    parser.add_argument("--rtt-ms", type=float, default=1.0, help="latency the stand-in adds to every round trip")
+    asyncio.run(main(parser.parse_args()))
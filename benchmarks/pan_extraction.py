@@ -0,0 +1,73 @@
+"""
+Cases for the rule-based PAN details parser (tools/pan_tools.py) that runs ahead of the LLM parser.
+
+Each case is a message, the details already collected (set in correction mode) and the expected
+result: the parsed details, or None where the message must be left to the LLM. Covers the formats
+the PAN prompts ask for, including the numbered "1. PAN: ... 2. Name: ... 3. DOB: ..." one, names
+that start with a label word, and correction replies that carry no labelled field.
+
+    python -m benchmarks.pan_extraction
+
+Exits non-zero if any case gives a different result.
+"""
+
+import argparse
+import sys
+
+EXISTING = {"pan_card_number": "ABCDE1234F", "pan_card_holders_name": "Ananya Sharma", "date_of_birth": "01/01/1990"}
+
+
+def details(pan: str, name: str, dob: str) -> dict:
+    return {"pan_card_number": pan, "date_of_birth": dob, "pan_card_holders_name": name}
+
+
+CASES = [
+    # First entry of the details
+    ("ABCDE1234F, Ananya Sharma, 01/01/1990", None, details("ABCDE1234F", "Ananya Sharma", "01/01/1990")),
+    ("PAN: ABCDE1234F | Name: Ananya Sharma | DOB - 1 Jan 1990", None, details("ABCDE1234F", "Ananya Sharma", "01/01/1990")),
+    ("ABCDE1234F,Pan Kumar,01/01/1990", None, details("ABCDE1234F", "Pan Kumar", "01/01/1990")),
+    ("Name: Pan Kumar, PAN: ABCDE1234F, DOB: 01/01/1990", None, details("ABCDE1234F", "Pan Kumar", "01/01/1990")),
+    ("PAN number ABCDE1234F, Ananya Sharma, date of birth 1990-01-01", None, details("ABCDE1234F", "Ananya Sharma", "01/01/1990")),
+    ("1. PAN: ABCDE1234F\n2. Name: John Doe\n3. DOB: 01/01/1990", None, details("ABCDE1234F", "John Doe", "01/01/1990")),
+    ("1. PAN: ABCDE1234F 2. Name: John Doe 3. DOB: 01/01/1990", None, details("ABCDE1234F", "John Doe", "01/01/1990")),
+    ("1. ABCDE1234F\n2. John Doe\n3. 01/01/1990", None, details("ABCDE1234F", "John Doe", "01/01/1990")),
+    ("• PAN: ABCDE1234F\n• Name: John Doe\n• DOB: 15 March 1985", None, details("ABCDE1234F", "John Doe", "15/03/1985")),
+    ("my pan is ABCDE1234F and I was born on 01/01/1990, name Ananya", None, None),
+    ("ABCDE1234F, 01/01/1990", None, None),
+    ("ABCDE1234F, Ananya Sharma, 31/02/1990", None, None),
+    # Corrections: labelled fields only
+    ("DOB: 02/02/1990", EXISTING, {**EXISTING, "date_of_birth": "02/02/1990"}),
+    ("Name: Pan Kumar", EXISTING, {**EXISTING, "pan_card_holders_name": "Pan Kumar"}),
+    ("1. PAN: FGHIJ5678K\n2. Name: Rajesh Kumar\n3. DOB: 15/03/1985", EXISTING, details("FGHIJ5678K", "Rajesh Kumar", "15/03/1985")),
+    ("yes", EXISTING, None),
+    ("same", EXISTING, None),
+    ("Rajesh Kumar", EXISTING, None),
+    ("FGHIJ5678K", EXISTING, None),
+    ("15/03/1985", EXISTING, None),
+    ("Name: Rajesh Kumar, rest is fine", EXISTING, None),
+]
+
+
+def main(args):
+    from tools.pan_tools import PanDetailsExtractor
+
+    extractor = PanDetailsExtractor()
+    failures = 0
+    for message, existing, expected in CASES:
+        result = extractor.extract(message, existing=existing)
+        if result != expected:
+            failures += 1
+            mode = "correction" if existing is not None else "entry"
+            print(f"FAIL {mode} {message!r}: {result} != {expected}")
+        elif args.verbose:
+            print(f"ok   {message!r}")
+
+    print(f"{len(CASES) - failures}/{len(CASES)} cases ok, stats={extractor.stats()}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--verbose", action="store_true", help="print every case, not only failures")
+    main(parser.parse_args())
@@ -0,0 +1,99 @@
+"""
+Session churn check for the idle-session reaper.
+
+Starts waves of sessions that each get part of the way through the PAN workflow (so they leave
+checkpoints behind) and are then abandoned, the way a closed browser tab abandons one. Between
+waves the reaper sweeps with a short idle TTL and a session cap. Prints, per wave, the resident
+sessions, checkpoint threads and traced Python memory; with the reaper working all three level off
+instead of growing with the number of sessions started.
+
+    python -m benchmarks.session_churn --waves 20 --sessions 200 --max-sessions 150
+
+Uses the in-memory session store and checkpointer and the scripted LLM backend. There is no Redis
+here, so the sessions' conversation memory is not cleared; everything else the reaper releases is.
+Exits non-zero if memory at the last wave is more than --tolerance above the level after warm-up.
+"""
+
+import argparse
+import asyncio
+import gc
+import os
+import sys
+import time
+import tracemalloc
+import types
+
+
+async def start_abandoned_session(pan_agent, store, session_id: str):
+    from app.session_store import SessionRecord
+    from state import new_overall_state
+
+    record = SessionRecord(session_id=session_id, state=new_overall_state(session_id))
+    record.state["active_workflow"] = "pan"
+    for message in ("", "ABCDE1234F, Ananya Sharma, 02/02/1970"):
+        record.state, _ = await pan_agent.handle_step(record.state, message)
+    await store.save(record)
+
+
+async def main(args):
+    os.environ.setdefault("LLM_BACKEND", "scripted")
+    os.environ.setdefault("LLM_SCRIPT_PATH", "benchmarks/scripted_responses.json")
+    os.environ.setdefault("GEMINI_API_KEY", "stub")
+    os.environ["SESSION_STORE_BACKEND"] = "memory"
+    os.environ["CHECKPOINTER_BACKEND"] = "memory"
+    os.environ["SESSION_TTL_SECONDS"] = str(args.ttl)
+
+    import agent.pan_agent
+    import app.session_reaper
+    from agent.checkpointer import get_checkpointer
+    from agent.kyc_agent import get_kyc_manager
+    from app.session_reaper import SessionReaper
+    from app.session_store import get_session_store
+
+    agent.pan_agent.time = types.SimpleNamespace(sleep=lambda seconds: None)
+    # No Redis here: leave the conversation memory alone and release the rest
+    app.session_reaper.MemoryManager = lambda session_id: types.SimpleNamespace(clear=lambda: asyncio.sleep(0))
+
+    pan_agent = get_kyc_manager().specialists["pan"]
+    store = get_session_store()
+    reaper = SessionReaper(max_sessions=args.max_sessions)
+    checkpoint_threads = get_checkpointer().store._checkpoints
+
+    tracemalloc.start()
+    # Waves alternate between LRU-only and idle sweeps, so compare the last wave with the warm-up wave of the same kind
+    baseline_wave = args.warmup + (args.waves - 1 - args.warmup) % 2
+    baseline = None
+    for wave in range(args.waves):
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            start_abandoned_session(pan_agent, store, f"api-session-churn-{wave}-{i}") for i in range(args.sessions)
+        ))
+        elapsed = time.perf_counter() - started
+        await asyncio.sleep(args.ttl * (wave % 2))  # every other wave, all remaining sessions go idle
+        await reaper.sweep()
+
+        gc.collect()
+        current, _ = tracemalloc.get_traced_memory()
+        if wave == baseline_wave:
+            baseline = current
+        print(
+            f"wave={wave:3d} started={args.sessions * (wave + 1):6d} resident={reaper.resident_sessions:5d} "
+            f"threads={len(checkpoint_threads):5d} evicted={reaper.evicted} "
+            f"memory={current / 1e6:7.2f}MB wave_time={elapsed:.2f}s"
+        )
+
+    growth = (current - baseline) / baseline if baseline else 0.0
+    print(f"memory growth after warm-up: {growth:+.1%}")
+    if growth > args.tolerance:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--waves", type=int, default=20)
+    parser.add_argument("--sessions", type=int, default=200, help="sessions started per wave")
+    parser.add_argument("--max-sessions", type=int, default=150)
+    parser.add_argument("--ttl", type=float, default=0.5, help="idle TTL (s) of a session")
+    parser.add_argument("--warmup", type=int, default=4, help="waves before the memory baseline is taken")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,110 @@
+"""
+Admin session listing over a large in-memory session store.
+
+Fills the store with --sessions sessions spread over the workflows and KYC steps, a share of them
+re-saved so their index entries move, then times: the first page unfiltered and per filter, a page
+deep into the listing reached by following cursors, the /health counts, and a save. With the
+indexes in app/session_store.py none of these depend on the number of sessions; the full walk
+at the end checks that cursor pagination returns every session exactly once.
+
+    python -m benchmarks.session_listing --sessions 50000 --page-size 50
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import time
+
+WORKFLOWS = [None, "aadhaar", "pan", "form60", "passport", "dl"]
+STEPS = [None, "awaiting_details", "awaiting_details_confirmation", "awaiting_ovd_choice", "verification_pending"]
+
+
+def per_call_ms(started: float, calls: int) -> float:
+    return (time.perf_counter() - started) / calls * 1e3
+
+
+async def timed(label: str, fn, repeat: int):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = await fn()
+    print(f"{label:40s} {per_call_ms(started, repeat):8.3f}ms")
+    return result
+
+
+async def main(args):
+    os.environ["SESSION_STORE_BACKEND"] = "memory"
+    from app.session_store import SessionRecord, get_session_store
+    from state import new_overall_state
+
+    rng = random.Random(7)
+    store = get_session_store()
+    records = []
+    started = time.perf_counter()
+    for i in range(args.sessions):
+        session_id = f"api-session-listing-{i}"
+        record = SessionRecord(session_id=session_id, state=new_overall_state(session_id))
+        record.state["active_workflow"] = rng.choice(WORKFLOWS)
+        record.state["kyc_step"] = rng.choice(STEPS)
+        await store.save(record)
+        records.append(record)
+    for record in rng.sample(records, len(records) // 4):
+        record.state["kyc_step"] = rng.choice(STEPS)
+        await store.save(record)
+    print(f"saved {args.sessions} sessions (+{len(records) // 4} re-saves) in {time.perf_counter() - started:.2f}s")
+
+    limit = args.page_size
+    await timed("first page", lambda: store.list_page(limit), args.repeat)
+    await timed("first page, active_workflow=pan", lambda: store.list_page(limit, active_workflow="pan"), args.repeat)
+    await timed(
+        "first page, workflow=pan + step",
+        lambda: store.list_page(limit, active_workflow="pan", kyc_step="awaiting_details"),
+        args.repeat
+    )
+    await timed("first page, active_within=60s", lambda: store.list_page(limit, active_within=60), args.repeat)
+
+    cursor = None
+    for _ in range(args.deep_pages):
+        _, cursor = await store.list_page(limit, cursor)
+    await timed(f"page {args.deep_pages + 1} via cursor", lambda: store.list_page(limit, cursor), args.repeat)
+    await timed("counts (/health)", store.counts, args.repeat)
+
+    record = records[0]
+
+    async def save():
+        await store.save(record)
+
+    await timed("save", save, args.repeat)
+
+    seen, cursor = set(), None
+    started = time.perf_counter()
+    while True:
+        page, cursor = await store.list_page(limit, cursor)
+        seen.update(summary.session_id for summary in page)
+        if cursor is None:
+            break
+    print(f"{'full walk':40s} {(time.perf_counter() - started) * 1e3:8.1f}ms, {len(seen)} sessions")
+    assert len(seen) == args.sessions, f"walk returned {len(seen)} of {args.sessions} sessions"
+    counts = await store.counts()
+    assert counts["total"] == args.sessions
+    pan = [summary async for summary in walk(store, limit, active_workflow="pan")]
+    assert len(pan) == counts["by_workflow"]["pan"], (len(pan), counts["by_workflow"]["pan"])
+
+
+async def walk(store, limit: int, **filters):
+    cursor = None
+    while True:
+        page, cursor = await store.list_page(limit, cursor, **filters)
+        for summary in page:
+            yield summary
+        if cursor is None:
+            return
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=50000)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--deep-pages", type=int, default=500, help="pages followed before timing a deep page")
+    parser.add_argument("--repeat", type=int, default=200)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,225 @@
+"""
+Concurrency check for the process-wide specialist agents.
+
+Drives many sessions through one PanAgent, one Form60Agent and one DLAgent at the same time, with
+random jitter so that their graph steps interleave, then checks that every session ended with its
+own details, retry counters and outcome. Any per-session value kept on an agent instance instead
+of in the graph state shows up here as a session seeing another session's counters.
+
+    python -m benchmarks.shared_agents --sessions 200
+    python -m benchmarks.shared_agents --sessions 50 --checkpointer sqlite
+
+Uses the scripted LLM backend; the well-formed PAN input below never reaches it. With a blocking
+checkpointer (sqlite), also checks that no checkpoint read or write ran on the event loop: a turn
+that reads its checkpoint synchronously stalls every other session for the length of the query.
+Exits non-zero if any session's result is wrong or a blocking call was made on the loop.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import types
+
+NSDL_ROWS = [
+    ("ABCDE1234F", "Ananya Sharma", "01/01/1990"),
+    ("FGHIJ5678K", "Rajesh Kumar", "15/03/1985"),
+    ("LMNOP9012Q", "Priya Sharma", "22/07/1992"),
+    ("RSTUV3456W", "Amit Patel", "08/12/1988"),
+    ("XYZAB7890C", "Sunita Singh", "25/05/1995"),
+]
+WRONG_DOB = "02/02/1970"
+# What the PAN OCR stand-in returns after an image upload
+OCR_PAN = ("ABCDE1234F", "Ananya Sharma", "01/01/1990")
+
+
+class EventLoopGuard:
+    """Wraps a checkpoint store and counts the calls made on the event loop's thread."""
+
+    def __init__(self, store, loop_thread: int):
+        self.store = store
+        self.loop_thread = loop_thread
+        self.calls_on_loop = {}
+
+    def __getattr__(self, name):
+        value = getattr(self.store, name)
+        if not callable(value):
+            return value
+
+        def call(*args, **kwargs):
+            if threading.get_ident() == self.loop_thread:
+                self.calls_on_loop[name] = self.calls_on_loop.get(name, 0) + 1
+            return value(*args, **kwargs)
+        return call
+
+
+def new_state(session_id: str, workflow: str) -> dict:
+    return {
+        "session_id": session_id,
+        "active_workflow": workflow,
+        "kyc_step": None,
+        "completed_workflows": [],
+        "aadhar_details": {},
+        "pan_details": {},
+        "Form_60": {},
+    }
+
+
+def pan_plan(i: int):
+    """
+    Three paths through the PAN graph, chosen by session number:
+    0: details confirmed and verified first time
+    1: wrong DOB, rejected at confirmation and corrected (sets `correction`)
+    2: wrong DOB confirmed, NSDL fails, image upload, verified on the second NSDL call
+    """
+    pan, name, dob = NSDL_ROWS[i % len(NSDL_ROWS)]
+    variant = i % 3
+    if variant == 0:
+        messages = ["", f"{pan}, {name}, {dob}", "yes"]
+        expected = {"details": (pan, name, dob), "correction": False, "nsdl_verification_count": 1, "full_workflow_retry": 0}
+    elif variant == 1:
+        messages = ["", f"{pan}, {name}, {WRONG_DOB}", "no", f"DOB: {dob}", "yes"]
+        expected = {"details": (pan, name, dob), "correction": True, "nsdl_verification_count": 1, "full_workflow_retry": 0}
+    else:
+        messages = ["", f"{pan}, {name}, {WRONG_DOB}", "yes", "uploaded", "yes"]
+        expected = {"details": OCR_PAN, "correction": False, "nsdl_verification_count": 2, "full_workflow_retry": 1}
+    return messages, expected
+
+
+def form60_plan(i: int):
+    invalid_first = i % 2 == 1
+    messages = [""] + (["not a number"] if invalid_first else []) + [str(i), str(i * 10)]
+    expected = {"form60": {"agricultural_income": i, "other_income": i * 10}, "retries": int(invalid_first)}
+    return messages, expected
+
+
+def dl_plan(i: int):
+    """Rejects the extracted details 0, 1 or 2 times; the second rejection ends the workflow."""
+    rejections = i % 3
+    messages = ["", "uploaded"] + ["no", "uploaded"] * min(rejections, 1) + ["no" if rejections == 2 else "yes"]
+    expected = {
+        "status": "FAILURE" if rejections == 2 else "SUCCESS",
+        "full_workflow_retry": min(rejections, 1) + 1,
+    }
+    return messages, expected
+
+
+async def drive(agent, session_id: str, workflow: str, messages, jitter: float):
+    state = new_state(session_id, workflow)
+    replies = []
+    for message in messages:
+        await asyncio.sleep(random.random() * jitter)
+        state, reply = await agent.handle_step(state, message)
+        replies.append(reply)
+    return state, replies
+
+
+async def run_workflow(agent, workflow: str, plan, sessions: int, jitter: float, check):
+    plans = [plan(i) for i in range(sessions)]
+    session_ids = [f"bench-{workflow}-{i}" for i in range(sessions)]
+    started = time.perf_counter()
+    results = await asyncio.gather(*(
+        drive(agent, session_ids[i], workflow, plans[i][0], jitter) for i in range(sessions)
+    ))
+    elapsed = time.perf_counter() - started
+
+    failures = []
+    for i, (state, replies) in enumerate(results):
+        values = (await agent.graph.aget_state(agent.graph_config(session_ids[i]))).values
+        problem = check(state, replies, values, plans[i][1])
+        if problem:
+            failures.append(f"{session_ids[i]}: {problem}")
+
+    # Clearing one session must not touch the others
+    await agent.clear_session(session_ids[0])
+    if (await agent.graph.aget_state(agent.graph_config(session_ids[0]))).values:
+        failures.append(f"{session_ids[0]}: checkpoints survived clear_session")
+    if sessions > 1 and not (await agent.graph.aget_state(agent.graph_config(session_ids[1]))).values:
+        failures.append(f"{session_ids[1]}: checkpoints lost when another session was cleared")
+
+    steps = sum(len(p[0]) for p in plans)
+    print(f"{workflow:7s} sessions={sessions} steps={steps} elapsed={elapsed:.2f}s failures={len(failures)}")
+    return failures
+
+
+def check_pan(state, replies, values, expected):
+    pan, name, dob = expected["details"]
+    details = state.get("pan_details") or {}
+    if (details.get("pan_card_number"), details.get("pan_card_holders_name"), details.get("date_of_birth")) != (pan, name, dob):
+        return f"pan_details {details} != {expected['details']}"
+    if "pan" not in state["completed_workflows"] or values.get("status") != "SUCCESS":
+        return f"status {values.get('status')}"
+    for key in ("correction", "nsdl_verification_count", "full_workflow_retry"):
+        if values.get(key) != expected[key]:
+            return f"{key} {values.get(key)} != {expected[key]}"
+    return None
+
+
+def check_form60(state, replies, values, expected):
+    if state["Form_60"] != expected["form60"]:
+        return f"Form_60 {state['Form_60']} != {expected['form60']}"
+    if state["form60_retries"] != expected["retries"]:
+        return f"retries {state['form60_retries']} != {expected['retries']}"
+    return None
+
+
+def check_dl(state, replies, values, expected):
+    if values.get("status") != expected["status"]:
+        return f"status {values.get('status')} != {expected['status']}"
+    if values.get("full_workflow_retry") != expected["full_workflow_retry"]:
+        return f"full_workflow_retry {values.get('full_workflow_retry')} != {expected['full_workflow_retry']}"
+    # The upload prompt after a rejection depends on the session's own retry counter
+    if len(replies) > 3 and "re-upload" not in replies[2]:
+        return f"expected a re-upload prompt, got {replies[2]!r}"
+    return None
+
+
+async def main(args):
+    os.environ.setdefault("LLM_BACKEND", "scripted")
+    os.environ.setdefault("LLM_SCRIPT_PATH", "benchmarks/scripted_responses.json")
+    os.environ.setdefault("GEMINI_API_KEY", "stub")
+    os.environ["CHECKPOINTER_BACKEND"] = args.checkpointer
+    if args.checkpointer == "sqlite":
+        os.environ["CHECKPOINTER_SQLITE_PATH"] = os.path.join(tempfile.mkdtemp(), "checkpoints.sqlite")
+    random.seed(args.seed)
+
+    import agent.dl_agent
+    import agent.pan_agent
+    from agent.checkpointer import get_checkpointer
+    from agent.kyc_agent import get_kyc_manager
+
+    checkpointer = get_checkpointer()
+    guard = checkpointer.store = EventLoopGuard(checkpointer.store, threading.get_ident())
+
+    # The OCR stand-ins sleep for two seconds to mimic latency; that only slows this check down
+    no_delay = types.SimpleNamespace(sleep=lambda seconds: None)
+    agent.pan_agent.time = no_delay
+    agent.dl_agent.time = no_delay
+
+    specialists = get_kyc_manager().specialists
+    failures = []
+    failures += await run_workflow(specialists["pan"], "pan", pan_plan, args.sessions, args.jitter, check_pan)
+    failures += await run_workflow(specialists["form60"], "form60", form60_plan, args.sessions, args.jitter, check_form60)
+    failures += await run_workflow(specialists["dl"], "dl", dl_plan, args.sessions, args.jitter, check_dl)
+
+    if guard.blocking and guard.calls_on_loop:
+        failures.append(f"blocking {args.checkpointer} checkpointer called on the event loop: {guard.calls_on_loop}")
+
+    for failure in failures[:20]:
+        print("FAIL", failure)
+    if failures:
+        sys.exit(1)
+    print("all sessions isolated")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--jitter", type=float, default=0.005, help="max random delay (s) before each step")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--checkpointer", choices=["memory", "sqlite"], default="memory", help="CHECKPOINTER_BACKEND")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,118 @@
+"""
+Serialization cost of OverallState, JSON against the compact encoding in state.py.
+
+Every /chat turn reads the session from the session store and writes it back, so the session's
+state is decoded and encoded once per request. Prints encode and decode time per state and the
+encoded size, for a fresh session, one in the middle of PAN verification and one that finished KYC,
+both for the bare state and for the whole session record. The compact side is the session store's
+own codec: state.state_to_compact inside app/session_store.encode_record.
+
+    python -m benchmarks.state_codec --iterations 20000
+"""
+
+import argparse
+import json
+import time
+from dataclasses import asdict
+
+import ormsgpack
+
+from state import new_overall_state, state_from_compact, state_to_compact
+
+SESSION_ID = "api-session-3f2b9c1e-7d4a-4e8b-9a61-0c5d2e8f4b17"
+GREETING = (
+    "Hello! I'm RIA, your TATA AIA assistant. I'll help you complete your KYC today. "
+    "You can verify with PAN, Aadhaar, a Driving Licence or a Passport. Shall we begin?"
+)
+VERIFICATION = {
+    "verification_status": "success",
+    "verification_message": "Details match the records",
+    "verification_timestamp": "2025-09-19T10:31:12.482913",
+    "verification_doc": "pan",
+}
+
+
+def sample_states() -> dict:
+    fresh = new_overall_state(SESSION_ID, GREETING)
+
+    in_progress = new_overall_state(SESSION_ID, GREETING)
+    in_progress.update({
+        "active_workflow": "pan",
+        "kyc_step": "awaiting_pan_details_confirmation",
+        "ai_response": "I found these details: PAN ABCDE1234F, Ananya Sharma, 01/01/1990. Are they correct?",
+        "pan_details": {"pan_card_number": "ABCDE1234F", "pan_card_holders_name": "Ananya Sharma", "date_of_birth": "01/01/1990"},
+        "pan_probe_complete": True,
+    })
+
+    completed = new_overall_state(SESSION_ID, GREETING)
+    completed.update({
+        "ai_response": "Your KYC is complete. Is there anything else I can help you with?",
+        "completed_workflows": ["aadhaar", "pan"],
+        "aadhar_details": {"aadhar_number": "XXXXXXXX4321", "date_of_birth": "01/01/1990", "name": "Ananya Sharma", "new_doc_needed": False},
+        "aadhar_verification_status": {**VERIFICATION, "verification_doc": "aadhaar"},
+        "pan_details": {"pan_card_number": "ABCDE1234F", "pan_card_holders_name": "Ananya Sharma", "date_of_birth": "01/01/1990"},
+        "pan_verification_status": VERIFICATION,
+        "pan_probe_complete": True,
+        "match": True,
+    })
+    return {"fresh": fresh, "pan in progress": in_progress, "kyc completed": completed}
+
+
+def per_call_us(fn, arg, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn(arg)
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def json_encode(value) -> bytes:
+    return json.dumps(value, separators=(",", ":")).encode()
+
+
+def compact_encode(state) -> bytes:
+    # The state's share of encode_record, without the record fields around it
+    return ormsgpack.packb(state_to_compact(state))
+
+
+def compact_decode(payload: bytes):
+    return state_from_compact(ormsgpack.unpackb(payload))
+
+
+def report(label: str, codecs: dict, value, iterations: int):
+    for name, (encode, decode) in codecs.items():
+        payload = encode(value)
+        print(
+            f"{label:24s} {name:9s} bytes={len(payload):5d} "
+            f"encode={per_call_us(encode, value, iterations):6.2f}us decode={per_call_us(decode, payload, iterations):6.2f}us"
+        )
+
+
+def main(args):
+    from app.session_store import SessionRecord, decode_record, encode_record
+
+    state_codecs = {"json": (json_encode, json.loads), "compact": (compact_encode, compact_decode)}
+
+    def json_record(record):
+        payload = asdict(record)
+        del payload["version"], payload["stored_index"]
+        return json_encode(payload)
+
+    record_codecs = {
+        "json": (json_record, lambda payload: SessionRecord(**json.loads(payload), version=1)),
+        "compact": (encode_record, lambda payload: decode_record(payload, 1)),
+    }
+
+    for label, state in sample_states().items():
+        assert compact_decode(compact_encode(state)) == state
+        report(label, state_codecs, state, args.iterations)
+    print()
+    for label, state in sample_states().items():
+        record = SessionRecord(session_id=SESSION_ID, state=state, user_id="user-42", metadata={"channel": "web"}, version=1)
+        assert decode_record(encode_record(record), 1) == record
+        report(f"record/{label}", record_codecs, record, args.iterations)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    main(parser.parse_args())
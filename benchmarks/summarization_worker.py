@@ -0,0 +1,121 @@
+"""
+Turn latency with episodic memory summaries written inline and by the background worker.
+
+Runs concurrent sessions through MemoryManager (get_memory_context, then add_turn) against the
+Redis stand-in from benchmarks.memory_round_trips and the scripted LLM backend with a fixed
+summarization latency. Inline, the turn that fills the working memory waits for the summary, as
+add_turn used to; with memory/summarizer.py the turn only enqueues it. Prints turn latency for
+both, and for the worker the summaries written, their lag after the debounce window and the
+deepest queue seen.
+
+    python -m benchmarks.summarization_worker --sessions 50 --turns 20 --llm-latency 0.8
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+
+class InlineSummarizer:
+    """Stands in for the worker: remembers the sessions that asked, for the turn to summarize itself."""
+
+    def __init__(self):
+        self.requested = set()
+
+    def enqueue(self, session_id: str) -> bool:
+        self.requested.add(session_id)
+        return True
+
+
+def percentile(values: list, fraction: float) -> float:
+    return sorted(values)[min(int(len(values) * fraction), len(values) - 1)]
+
+
+async def run_sessions(label: str, args, inline: InlineSummarizer = None):
+    from memory.memory import MemoryManager
+
+    latencies = []
+
+    async def session(index: int):
+        manager = MemoryManager(f"api-session-summaries-{label}-{index}")
+        for number in range(args.turns):
+            started = time.perf_counter()
+            await manager.get_memory_context(f"message {number}")
+            await manager.add_turn(f"message {number}", f"reply {number}", "pan")
+            if inline is not None and manager.session_id in inline.requested:
+                inline.requested.discard(manager.session_id)
+                await manager.update_summary()
+            latencies.append(time.perf_counter() - started)
+            await asyncio.sleep(args.think_time)
+
+    await asyncio.gather(*(session(index) for index in range(args.sessions)))
+    print(
+        f"{label:8s} turn p50={percentile(latencies, 0.5) * 1e3:7.1f}ms p95={percentile(latencies, 0.95) * 1e3:7.1f}ms "
+        f"max={max(latencies) * 1e3:7.1f}ms"
+    )
+
+
+async def main(args):
+    from benchmarks.memory_round_trips import RedisStandIn
+
+    stand_in = RedisStandIn(args.rtt_ms / 1e3)
+    server = await asyncio.start_server(stand_in.serve, "127.0.0.1", 0)
+    os.environ["REDIS_HOST"] = "127.0.0.1"
+    os.environ["REDIS_PORT"] = str(server.sockets[0].getsockname()[1])
+    os.environ["LLM_BACKEND"] = "scripted"
+    os.environ["LLM_SCRIPT_PATH"] = "benchmarks/scripted_responses.json"
+    os.environ["LLM_SCRIPTED_LATENCY"] = f"fixed:{args.llm_latency}"
+    os.environ["SUMMARIZATION_DEBOUNCE_SECONDS"] = str(args.debounce)
+    os.environ.setdefault("GEMINI_API_KEY", "stub")
+
+    import memory.memory
+    from memory.redis_client import close_redis
+    from memory.summarizer import get_summarization_worker
+    from prometheus_client import REGISTRY
+
+    # No mem0 calls are made on this path; skip the client's API-key check over HTTP
+    memory.memory.get_mem0_client = lambda: None
+
+    inline = InlineSummarizer()
+    memory.memory.get_summarization_worker = lambda: inline
+    await run_sessions("inline", args, inline)
+
+    worker = get_summarization_worker()
+    memory.memory.get_summarization_worker = lambda: worker
+    deepest = 0
+
+    async def sample_depth():
+        nonlocal deepest
+        while True:
+            deepest = max(deepest, worker.stats()["queued"])
+            await asyncio.sleep(0.01)
+
+    sampler = asyncio.create_task(sample_depth())
+    await run_sessions("worker", args)
+    while worker.stats()["queued"] or worker.stats()["in_flight"]:
+        await asyncio.sleep(0.05)
+    sampler.cancel()
+
+    stats = worker.stats()
+    lag_count = REGISTRY.get_sample_value("kyc_summarization_lag_seconds_count")
+    mean_lag = REGISTRY.get_sample_value("kyc_summarization_lag_seconds_sum") / lag_count if lag_count else 0.0
+    print(
+        f"worker   summaries completed={stats['completed']} deferred={stats['deferred']} failed={stats['failed']} "
+        f"coalesced={stats['coalesced']} dropped={stats['dropped']} mean_lag={mean_lag:.2f}s deepest_queue={deepest}"
+    )
+
+    await worker.stop()
+    await close_redis()
+    server.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=50, help="concurrent sessions")
+    parser.add_argument("--turns", type=int, default=20, help="turns per session")
+    parser.add_argument("--llm-latency", type=float, default=0.8, help="seconds per scripted summarization call")
+    parser.add_argument("--debounce", type=float, default=0.5, help="SUMMARIZATION_DEBOUNCE_SECONDS")
+    parser.add_argument("--think-time", type=float, default=0.05, help="seconds between a session's turns")
+    parser.add_argument("--rtt-ms", type=float, default=0.2, help="latency the Redis stand-in adds to every round trip")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,147 @@
+"""
+Turns added while an episodic memory summary is pending must not be lost.
+
+Against the Redis stand-in from benchmarks.memory_round_trips, interleaves MemoryManager.add_turn
+with update_summary the way the background worker (memory/summarizer.py) does:
+
+  - turns added during the debounce window, before the summary starts, are summarized with the rest
+  - turns added while the summarization LLM call runs stay in the working memory
+  - clearing the session while the call runs leaves no summary key behind
+  - while summaries are dropped, the working memory is still capped at WORKING_MEMORY_MAX_ENTRIES
+  - with a MemoryManager built per turn, as /chat builds them, a full working memory asks for a
+    summary every SUMMARIZATION_EVERY_TURNS turns, not on every turn
+
+Every turn must end up either in the summarized lines or in the working memory afterwards. The
+summarization LLM call is replaced by one that records its prompt and waits until released.
+Exits non-zero on the first failed check.
+
+    python -m benchmarks.summary_interleaving
+"""
+
+import argparse
+import asyncio
+import os
+
+
+class RecordingSummarizer:
+    """Stands in for the worker: records the sessions that asked, the check decides when to summarize."""
+
+    def __init__(self):
+        self.requested = []
+        self.full = False
+
+    def enqueue(self, session_id: str) -> bool:
+        self.requested.append(session_id)
+        return not self.full
+
+
+class HeldSummaryCall:
+    """Replaces the summarization LLM call; holds it open until `release` so turns can interleave."""
+
+    def __init__(self):
+        self.prompts = []
+        self.started = asyncio.Event()
+        self.released = asyncio.Event()
+
+    async def __call__(self, prompt: str, **kwargs) -> str:
+        self.prompts.append(prompt)
+        self.started.set()
+        await self.released.wait()
+        return f"summary #{len(self.prompts)}"
+
+
+async def add_turns(manager, first: int, count: int):
+    for number in range(first, first + count):
+        await manager.add_turn(f"u{number}", f"a{number}", "pan")
+
+
+async def check_turns_kept(manager, llm: HeldSummaryCall, turns: int, label: str):
+    working_memory, summary = await manager._read_redis_memory()
+    summarized = "\n".join(llm.prompts)
+    for number in range(turns):
+        for line in (f"User: u{number}", f"AI: a{number}"):
+            assert f"{line}\n" in summarized + "\n" or line in working_memory, f"{label}: {line!r} was lost"
+    print(f"{label}: ok ({len(working_memory)} entries left in working memory, summary={summary!r})")
+    return working_memory, summary
+
+
+async def main(args):
+    from benchmarks.memory_round_trips import RedisStandIn
+
+    stand_in = RedisStandIn(args.rtt_ms / 1e3)
+    server = await asyncio.start_server(stand_in.serve, "127.0.0.1", 0)
+    os.environ["REDIS_HOST"] = "127.0.0.1"
+    os.environ["REDIS_PORT"] = str(server.sockets[0].getsockname()[1])
+    os.environ.setdefault("GEMINI_API_KEY", "stub")
+
+    import memory.memory
+    from memory.memory import MemoryManager, SUMMARIZATION_EVERY_TURNS, SUMMARIZATION_THRESHOLD, WORKING_MEMORY_MAX_ENTRIES
+    from memory.redis_client import close_redis
+
+    # No mem0 calls are made on this path; skip the client's API-key check over HTTP
+    memory.memory.get_mem0_client = lambda: None
+    summarizer = RecordingSummarizer()
+    memory.memory.get_summarization_worker = lambda: summarizer
+    full = SUMMARIZATION_THRESHOLD // 2
+
+    # Turns during the LLM call stay in the working memory
+    manager = MemoryManager("api-session-interleave-during-call")
+    manager.llm_client._get_normal_response = llm = HeldSummaryCall()
+    await add_turns(manager, 0, full)
+    assert summarizer.requested == [manager.session_id], summarizer.requested
+    summary = asyncio.create_task(manager.update_summary())
+    await llm.started.wait()
+    await add_turns(manager, full, 2)
+    llm.released.set()
+    assert await summary
+    working_memory, stored = await check_turns_kept(manager, llm, full + 2, "turns during the summary call")
+    assert working_memory == ["AI: a6", "User: u6", "AI: a7", "User: u7"] and stored == "summary #1", (working_memory, stored)
+
+    # Turns during the debounce window, before the summary starts, are summarized too
+    manager = MemoryManager("api-session-interleave-debounce")
+    manager.llm_client._get_normal_response = llm = HeldSummaryCall()
+    await add_turns(manager, 0, full + args.debounce_turns)
+    llm.released.set()
+    assert await manager.update_summary()
+    working_memory, _ = await check_turns_kept(manager, llm, full + args.debounce_turns, "turns during the debounce window")
+    assert working_memory == [], working_memory
+
+    # While every summary request is dropped by a full queue, the working memory is still capped
+    summarizer.full = True
+    await add_turns(manager, 100, WORKING_MEMORY_MAX_ENTRIES // 2 + 3)
+    working_memory, _ = await manager._read_redis_memory()
+    assert len(working_memory) == WORKING_MEMORY_MAX_ENTRIES, len(working_memory)
+    summarizer.full = False
+    print(f"summaries dropped: ok (working memory capped at {len(working_memory)} entries)")
+
+    # A MemoryManager per turn still asks for a summary only every SUMMARIZATION_EVERY_TURNS turns
+    session_id, turns = "api-session-interleave-per-request", full + 2 * SUMMARIZATION_EVERY_TURNS
+    for number in range(turns):
+        await MemoryManager(session_id).add_turn(f"u{number}", f"a{number}", "pan")
+    requests = summarizer.requested.count(session_id)
+    assert requests == 3, f"{requests} summary requests in {turns} turns"
+    await MemoryManager(session_id).clear()
+    print(f"manager per turn: ok ({requests} summary requests in {turns} turns)")
+
+    # A session cleared during the call gets no summary key back
+    manager = MemoryManager("api-session-interleave-cleared")
+    manager.llm_client._get_normal_response = llm = HeldSummaryCall()
+    await add_turns(manager, 0, full)
+    summary = asyncio.create_task(manager.update_summary())
+    await llm.started.wait()
+    await manager.clear()
+    llm.released.set()
+    await summary
+    leftover = await manager.redis_client.exists(manager.working_memory_key, manager.episodic_memory_key)
+    assert leftover == 0, f"{leftover} keys left behind by a cleared session"
+    print("session cleared during the summary call: ok (no keys left)")
+
+    await close_redis()
+    server.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--debounce-turns", type=int, default=5, help="turns added before the summary starts")
+    parser.add_argument("--rtt-ms", type=float, default=0.5, help="latency the Redis stand-in adds to every round trip")
+    asyncio.run(main(parser.parse_args()))
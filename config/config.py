@@ -13,6 +13,87 @@ class DocumentIntelligenceSettings(BaseSettings):
 class LLMSettings(BaseSettings):
     api_key: str = os.getenv("GEMINI_API_KEY")
     base_url: str = os.getenv("GEMINI_BASE_URL")
+    timeout: float = float(os.getenv("LLM_TIMEOUT", "30.0"))
+    # Concurrent upstream requests per model; LLM_MODEL_CONCURRENCY overrides it per model ("gemini-2.5-pro=4,...")
+    max_concurrency: int = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+    model_concurrency: str = os.getenv("LLM_MODEL_CONCURRENCY", "")
+    # Seconds a background request (e.g. summarization) may queue before it is dropped
+    background_max_wait: float = float(os.getenv("LLM_BACKGROUND_MAX_WAIT", "10.0"))
+    # Hedged requests for call sites that opt in: duplicate a request still running after the
+    # given percentile of recent latency, spending at most `hedge_budget` extra requests
+    hedge_enabled: bool = os.getenv("LLM_HEDGE_ENABLED", "true").lower() == "true"
+    hedge_percentile: float = float(os.getenv("LLM_HEDGE_PERCENTILE", "0.95"))
+    hedge_budget: float = float(os.getenv("LLM_HEDGE_BUDGET", "0.05"))
+    hedge_min_samples: int = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+    # live | record | replay | scripted (see llm/backends.py). replay and scripted need no network.
+    backend: str = os.getenv("LLM_BACKEND", "live")
+    cassette_path: str = os.getenv("LLM_CASSETTE_PATH", "llm_cassette.jsonl")
+    script_path: str = os.getenv("LLM_SCRIPT_PATH", "")
+    scripted_latency: str = os.getenv("LLM_SCRIPTED_LATENCY", "fixed:0")
+    max_connections: int = int(os.getenv("LLM_MAX_CONNECTIONS", "32"))
+    max_keepalive_connections: int = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "16"))
+
+class LLMCacheSettings(BaseSettings):
+    enabled: bool = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+    max_entries: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024"))
+    ttl_seconds: float = float(os.getenv("LLM_CACHE_TTL_SECONDS", "3600"))
+    # Optional SQLite file shared by all uvicorn workers on the host. Empty disables the disk tier.
+    disk_path: str = os.getenv("LLM_CACHE_DISK_PATH", "")
+
+class LLMModelPolicySettings(BaseSettings):
+    # Model tiers per call site, cheapest first. A call escalates to the next tier only when the
+    # structured response cannot be parsed or fails validation.
+    intent: str = os.getenv("LLM_MODELS_INTENT", "gemini-2.5-flash-lite,gemini-2.5-flash")
+    insurance_check: str = os.getenv("LLM_MODELS_INSURANCE_CHECK", "gemini-2.5-flash-lite,gemini-2.5-flash")
+    pan_probe_analysis: str = os.getenv("LLM_MODELS_PAN_PROBE_ANALYSIS", "gemini-2.5-flash-lite,gemini-2.5-flash")
+    general_query: str = os.getenv("LLM_MODELS_GENERAL_QUERY", "gemini-2.5-flash")
+    # Episodic memory summaries are written in the background, so the cheapest tier is enough
+    summarization: str = os.getenv("LLM_MODELS_SUMMARIZATION", "gemini-2.5-flash-lite,gemini-2.5-flash")
+
+class GeneralQuerySettings(BaseSettings):
+    # two_step | single_call | speculative (see GeneralQueryAgent)
+    mode: str = os.getenv("GENERAL_QUERY_MODE", "two_step")
+    # Vetted Q&A pairs answered without the LLM (see tools/faq_index.py). Empty disables the index.
+    faq_path: str = os.getenv("GENERAL_QUERY_FAQ_PATH", "data/faq.json")
+    faq_min_confidence: float = float(os.getenv("GENERAL_QUERY_FAQ_MIN_CONFIDENCE", "0.6"))
+
+class GreetingSettings(BaseSettings):
+    # Generated greeting shared by the workers on a host. Empty keeps it in memory only.
+    cache_path: str = os.getenv("GREETING_CACHE_PATH", "greeting_cache.json")
+    ttl_seconds: float = float(os.getenv("GREETING_CACHE_TTL_SECONDS", "86400"))
+
+class CheckpointerSettings(BaseSettings):
+    # memory | sqlite | redis (see agent/checkpointer.py). sqlite is shared by the workers on one host,
+    # redis by every node.
+    backend: str = os.getenv("CHECKPOINTER_BACKEND", "memory")
+    sqlite_path: str = os.getenv("CHECKPOINTER_SQLITE_PATH", "checkpoints.sqlite")
+    # Checkpoints kept per session thread; older ones are pruned on every write
+    keep_latest: int = int(os.getenv("CHECKPOINTER_KEEP_LATEST", "3"))
+    # Redis only: drop a thread's checkpoints this long after its last write. 0 keeps them until the session is cleared.
+    redis_ttl_seconds: int = int(os.getenv("CHECKPOINTER_REDIS_TTL_SECONDS", "86400"))
+
+class SessionStoreSettings(BaseSettings):
+    # memory | redis (see app/session_store.py). Use redis whenever more than one worker serves /chat.
+    backend: str = os.getenv("SESSION_STORE_BACKEND", "memory")
+    # Sessions are dropped this long after their last turn
+    ttl_seconds: float = float(os.getenv("SESSION_TTL_SECONDS", "86400"))
+    # Beyond this many sessions the least recently active are evicted. 0 disables the cap.
+    max_sessions: int = int(os.getenv("SESSION_MAX_SESSIONS", "10000"))
+    # How often the reaper evicts idle sessions (see app/session_reaper.py)
+    reaper_interval_seconds: float = float(os.getenv("SESSION_REAPER_INTERVAL_SECONDS", "60"))
+    # Turns of one session are serialized; a turn waits this long for the one before it, then gets a 409
+    lock_wait_seconds: float = float(os.getenv("SESSION_LOCK_WAIT_SECONDS", "30"))
+    # A turn's lock is released after this long even if the turn never finishes (e.g. its worker died)
+    lock_ttl_seconds: float = float(os.getenv("SESSION_LOCK_TTL_SECONDS", "120"))
+
+class SummarizationSettings(BaseSettings):
+    # Sessions waiting for an episodic memory summary (see memory/summarizer.py); beyond this, requests
+    # are dropped and the session is summarized on a later turn
+    queue_size: int = int(os.getenv("SUMMARIZATION_QUEUE_SIZE", "1000"))
+    # A session is summarized this long after its first request; requests in between are coalesced
+    debounce_seconds: float = float(os.getenv("SUMMARIZATION_DEBOUNCE_SECONDS", "5"))
+    # Summaries written concurrently, across sessions
+    workers: int = int(os.getenv("SUMMARIZATION_WORKERS", "2"))
 
 class CohereSettings(BaseSettings):
     api_key: str = os.getenv("COHERE_API_KEY")
@@ -30,8 +111,15 @@ class Mem0Settings(BaseSettings):
 
 class RedisDbSettings(BaseSettings):
     host: str = os.getenv("REDIS_HOST")
+    port: int = int(os.getenv("REDIS_PORT", "10908"))
+    username: str = os.getenv("REDIS_USERNAME", "default")
     password: str = os.getenv("REDIS_PASSWORD")
     db_name: str = os.getenv("REDIS_DB_NAME")
+    # Size of the process-wide connection pool (see memory/redis_client.py); callers wait for a free
+    # connection beyond it, up to pool_timeout seconds
+    max_connections: int = int(os.getenv("REDIS_MAX_CONNECTIONS", "32"))
+    pool_timeout: float = float(os.getenv("REDIS_POOL_TIMEOUT", "5.0"))
+    socket_timeout: float = float(os.getenv("REDIS_SOCKET_TIMEOUT", "5.0"))
 
 class LangSmithSettings(BaseSettings):
     tracing: str = os.getenv("LANGSMITH_TRACING", "false")
@@ -55,6 +143,13 @@ class Settings(BaseSettings):
     # External service configurations
     document_intelligence: DocumentIntelligenceSettings = DocumentIntelligenceSettings()
     llm: LLMSettings = LLMSettings()
+    llm_cache: LLMCacheSettings = LLMCacheSettings()
+    llm_models: LLMModelPolicySettings = LLMModelPolicySettings()
+    general_query: GeneralQuerySettings = GeneralQuerySettings()
+    greeting: GreetingSettings = GreetingSettings()
+    checkpointer: CheckpointerSettings = CheckpointerSettings()
+    session_store: SessionStoreSettings = SessionStoreSettings()
+    summarization: SummarizationSettings = SummarizationSettings()
     cohere: CohereSettings = CohereSettings()
     chromadb: ChromaDbSettings = ChromaDbSettings()
     redisdb: RedisDbSettings = RedisDbSettings()
@@ -3,7 +3,19 @@ Greeting prompts for the KYC system.
 These prompts handle the initial greeting and option presentation.
 """
 
-from llm import LLMFactory
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from functools import lru_cache
+from typing import Optional
+
+from config.config import get_settings
+from llm import get_llm_factory, Priority
+
+logger = logging.getLogger(__name__)
 
 GREETING_LLM_PROMPT = """
 You are RIA, a professional insurance agent working for Tata AIA Life Insurance. Your role is to provide a warm, professional greeting and present clear KYC verification options based on customer eligibility and document availability.
@@ -107,33 +119,168 @@ AVOID:
 • Any response without proper markdown formatting
 """
 
-def generate_greeting_message() -> str:
+GREETING_HUMAN_PROMPT = "Generate a professional KYC greeting message that presents all four verification options (PAN, Aadhaar, Driving License, Passport) with clear conditions. Emphasize that PAN and Aadhaar are most preferred for Indian customers, while Passport is mandatory for foreign nationals. Guide users to select the appropriate document based on their nationality and document availability."
+
+# Served whenever no generated greeting is available yet
+FALLBACK_GREETING = (
+        "## Namaste!\n\n"
+        "I am **RIA**, your dedicated insurance agent from **Tata AIA Life Insurance**. "
+        "I'm here to assist you with your **KYC verification process**, an essential step to ensure your policy is active and secure as per regulatory guidelines.\n\n"
+        "### Available KYC Verification Options:\n\n"
+        "1. **PAN Card Verification** - For Indian citizens with PAN card readily available *(Most Preferred)*\n"
+        "2. **Aadhaar Card Verification** - For Indian citizens with Aadhaar card readily available *(Most Preferred)*\n"
+        "3. **Driving License Verification** - For customers with valid Indian Driving License *(Alternative Option)*\n"
+        "4. **Passport Verification** - For foreign nationals or as alternative document *(Required for Foreign Nationals)*\n\n"
+        "> **For Indian Customers:** PAN and Aadhaar verification are most preferred and fastest.\n"
+        "> **For Foreign Nationals:** Please proceed with Passport verification.\n\n"
+        "Please select the verification option based on the document you have readily available to begin your KYC process."
+)
+
+# A cached greeting is only reused while the prompts that produced it are unchanged
+GREETING_VERSION = hashlib.sha256((GREETING_LLM_PROMPT + GREETING_HUMAN_PROMPT).encode()).hexdigest()[:16]
+
+# After a failed refresh, wait this long before asking the LLM again
+REFRESH_RETRY_SECONDS = 60.0
+
+
+async def generate_greeting_message() -> str:
     """
     Generates a personalized greeting message using LLM with improved document options.
     This function creates dynamic greetings with clear KYC verification paths.
+    Falls back to FALLBACK_GREETING when the LLM call fails.
     """
-    
-    llm_client = LLMFactory()
-    
+    return await _request_greeting() or FALLBACK_GREETING
+
+
+async def _request_greeting() -> Optional[str]:
+    llm_client = get_llm_factory()
     try:
-        greeting = llm_client._get_normal_response(
-            human_prompt="Generate a professional KYC greeting message that presents all four verification options (PAN, Aadhaar, Driving License, Passport) with clear conditions. Emphasize that PAN and Aadhaar are most preferred for Indian customers, while Passport is mandatory for foreign nationals. Guide users to select the appropriate document based on their nationality and document availability.",
-            sys_prompt=GREETING_LLM_PROMPT
+        return await llm_client._get_normal_response(
+            human_prompt=GREETING_HUMAN_PROMPT,
+            sys_prompt=GREETING_LLM_PROMPT,
+            use_cache=False,
+            priority=Priority.STANDARD,
+            call_site="greeting"
         )
-        return greeting
     except Exception as e:
         print(f"Error generating greeting: {e}")
-        # Enhanced fallback greeting with all four options
-        return (
-            "## Namaste!\n\n"
-            "I am **RIA**, your dedicated insurance agent from **Tata AIA Life Insurance**. "
-            "I'm here to assist you with your **KYC verification process**, an essential step to ensure your policy is active and secure as per regulatory guidelines.\n\n"
-            "### Available KYC Verification Options:\n\n"
-            "1. **PAN Card Verification** - For Indian citizens with PAN card readily available *(Most Preferred)*\n"
-            "2. **Aadhaar Card Verification** - For Indian citizens with Aadhaar card readily available *(Most Preferred)*\n"
-            "3. **Driving License Verification** - For customers with valid Indian Driving License *(Alternative Option)*\n"
-            "4. **Passport Verification** - For foreign nationals or as alternative document *(Required for Foreign Nationals)*\n\n"
-            "> **For Indian Customers:** PAN and Aadhaar verification are most preferred and fastest.\n"
-            "> **For Foreign Nationals:** Please proceed with Passport verification.\n\n"
-            "Please select the verification option based on the document you have readily available to begin your KYC process."
-        )
\ No newline at end of file
+        return None
+
+
+class GreetingCache:
+    """
+    Generated greeting persisted to a local JSON file, so that a worker never waits on the LLM to greet.
+
+    `get()` returns the cached greeting (or FALLBACK_GREETING while the cache is cold) immediately and,
+    when the greeting is missing, stale or from an older prompt version, regenerates it in the
+    background. The file is replaced atomically, so workers on the same host share it safely; a
+    worker whose copy went stale re-reads the file first, and only regenerates if that is stale too.
+    """
+    def __init__(self, path: str, ttl_seconds: float):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.greeting: Optional[str] = None
+        self.generated_at = 0.0
+        self.loaded = False
+        # Modification time of the file when last read, so an unchanged file is not parsed again
+        self.loaded_mtime: Optional[float] = None
+        self.next_attempt = 0.0
+        self._refresh_task: Optional[asyncio.Task] = None
+
+# -------------------------------------------------------------------------------------------------
+# PUBLIC FUNCTIONS
+# -------------------------------------------------------------------------------------------------
+
+    def get(self) -> str:
+        if not self.loaded:
+            self._load()
+        if self._is_stale() and self._can_refresh():
+            # Another worker on this host may have refreshed the shared file already
+            self._load()
+            if self._is_stale():
+                self.refresh_in_background()
+        return self.greeting or FALLBACK_GREETING
+
+    def refresh_in_background(self) -> None:
+        """Starts a refresh unless one is running or a failed one is backing off. Needs a running loop."""
+        if not self._can_refresh():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._refresh_task = loop.create_task(self.refresh())
+
+    async def refresh(self) -> bool:
+        greeting = await _request_greeting()
+        if not greeting:
+            self.next_attempt = time.time() + REFRESH_RETRY_SECONDS
+            logger.warning(f"Greeting refresh failed; retrying in {REFRESH_RETRY_SECONDS:.0f}s")
+            return False
+
+        self.greeting = greeting
+        self.generated_at = time.time()
+        if self.path:
+            try:
+                await asyncio.to_thread(self._save)
+            except OSError as e:
+                logger.warning(f"Could not write greeting cache {self.path}: {e}")
+        return True
+
+# -------------------------------------------------------------------------------------------------
+# INTERNAL FUNCTIONS
+# -------------------------------------------------------------------------------------------------
+
+    def _is_stale(self) -> bool:
+        return self.greeting is None or time.time() - self.generated_at > self.ttl_seconds
+
+    def _can_refresh(self) -> bool:
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return False
+        return time.time() >= self.next_attempt
+
+    def _load(self) -> None:
+        self.loaded = True
+        if not self.path:
+            return
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return
+        if mtime == self.loaded_mtime:
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable greeting cache {self.path}: {e}")
+            return
+        self.loaded_mtime = mtime
+        if entry.get("version") != GREETING_VERSION or not entry.get("greeting"):
+            return
+        if entry.get("generated_at", 0.0) < self.generated_at:
+            # Older than the greeting this worker generated itself
+            return
+        self.greeting = entry["greeting"]
+        self.generated_at = entry.get("generated_at", 0.0)
+
+    def _save(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": GREETING_VERSION, "generated_at": self.generated_at, "greeting": self.greeting}, f)
+        os.replace(temp_path, self.path)
+
+
+@lru_cache
+def get_greeting_cache() -> GreetingCache:
+    """Process-wide greeting cache built from the GREETING_* settings."""
+    settings = get_settings().greeting
+    return GreetingCache(settings.cache_path, settings.ttl_seconds)
+
+
+def get_greeting() -> str:
+    """The greeting to open a session with. Never blocks on the LLM."""
+    return get_greeting_cache().get()
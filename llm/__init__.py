@@ -0,0 +1,2 @@
+from llm.factory import LLMFactory, get_llm_factory, close_http_client, DEFAULT_MODEL
+from llm.scheduler import Priority, LLMRequestDropped, get_llm_scheduler
@@ -0,0 +1,271 @@
+"""
+Pluggable transports behind LLMFactory.
+
+- live:     the real OpenAI-compatible endpoint
+- record:   live, and every response is appended to a cassette file
+- replay:   answers only from a cassette, by request fingerprint; no network
+- scripted: canned responses from a script file with a configurable latency distribution; no network
+
+Selected with LLM_BACKEND; see LLMSettings for the file paths and latency spec.
+"""
+
+import asyncio
+import json
+import math
+import random
+import re
+import threading
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import AsyncIterator, Dict, List, Optional
+
+from openai import AsyncOpenAI
+
+from llm.cache import make_cache_key
+from monitoring.metrics import TokenUsage
+
+
+class BackendMiss(Exception):
+    """Raised by offline backends when they have no response for a request."""
+
+
+def fingerprint(model_id: str, messages: List[dict], parser=None) -> str:
+    """Same fingerprint as the response cache: model, system prompt, human prompt and parser schema."""
+    sys_prompt = next((m["content"] for m in messages if m["role"] == "system"), None)
+    human_prompt = next((m["content"] for m in reversed(messages) if m["role"] == "user"), "")
+    return make_cache_key(model_id, sys_prompt, human_prompt, parser)
+
+
+def _chunk(text: str) -> List[str]:
+    """Splits text into word-sized deltas to imitate a token stream."""
+    return re.findall(r"\S+\s*|\s+", text) or [text]
+
+
+def _record_usage(usage: Optional[TokenUsage], reported) -> None:
+    if usage is not None and reported is not None:
+        usage.prompt_tokens = reported.prompt_tokens or 0
+        usage.completion_tokens = reported.completion_tokens or 0
+
+
+class LLMBackend(ABC):
+    """
+    Every method takes an optional TokenUsage that the backend fills in from the provider's
+    reported usage (offline backends leave it empty).
+    """
+    @abstractmethod
+    async def parse(self, model_id: str, messages: List[dict], parser, timeout: float, usage: TokenUsage = None):
+        """Returns the response parsed into `parser`, a pydantic model class."""
+
+    @abstractmethod
+    async def complete(self, model_id: str, messages: List[dict], timeout: float, usage: TokenUsage = None) -> Optional[str]:
+        """Returns the full text response."""
+
+    @abstractmethod
+    def stream(self, model_id: str, messages: List[dict], timeout: float, usage: TokenUsage = None) -> AsyncIterator[str]:
+        """Yields the text response as it is generated; implemented as an async generator."""
+
+
+class LiveBackend(LLMBackend):
+    def __init__(self, client: AsyncOpenAI):
+        self.client = client
+
+    async def parse(self, model_id, messages, parser, timeout, usage=None):
+        response = await self.client.beta.chat.completions.parse(
+            model = model_id,
+            messages = messages,
+            response_format = parser,
+            timeout = timeout
+        )
+        _record_usage(usage, response.usage)
+        return response.choices[0].message.parsed
+
+    async def complete(self, model_id, messages, timeout, usage=None):
+        response = await self.client.chat.completions.create(
+            model = model_id,
+            messages = messages,
+            timeout = timeout
+        )
+        _record_usage(usage, response.usage)
+        return response.choices[0].message.content
+
+    async def stream(self, model_id, messages, timeout, usage=None):
+        stream = await self.client.chat.completions.create(
+            model = model_id,
+            messages = messages,
+            timeout = timeout,
+            stream = True,
+            # Without this, OpenAI-compatible endpoints report no usage on a stream
+            stream_options = {"include_usage": True}
+        )
+        async for chunk in stream:
+            # Usage comes on the last chunk, which has no choices
+            _record_usage(usage, getattr(chunk, "usage", None))
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
+
+
+class Cassette:
+    """
+    JSON-lines file of recorded responses keyed by request fingerprint.
+    Recorded prompts can contain customer data; keep cassettes out of version control.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        try:
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.entries[entry["key"]] = entry["response"]
+        except FileNotFoundError:
+            pass
+
+    def get(self, key: str) -> Optional[str]:
+        return self.entries.get(key)
+
+    def append(self, key: str, model_id: str, messages: List[dict], response: str):
+        self.entries[key] = response
+        line = json.dumps({"key": key, "model": model_id, "messages": messages, "response": response})
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+@lru_cache
+def get_cassette(path: str) -> Cassette:
+    return Cassette(path)
+
+
+class RecordingBackend(LLMBackend):
+    def __init__(self, live: LLMBackend, cassette: Cassette):
+        self.live = live
+        self.cassette = cassette
+
+    async def parse(self, model_id, messages, parser, timeout, usage=None):
+        parsed = await self.live.parse(model_id, messages, parser, timeout, usage)
+        if parsed is not None:
+            await asyncio.to_thread(
+                self.cassette.append, fingerprint(model_id, messages, parser), model_id, messages, parsed.model_dump_json()
+            )
+        return parsed
+
+    async def complete(self, model_id, messages, timeout, usage=None):
+        content = await self.live.complete(model_id, messages, timeout, usage)
+        if content is not None:
+            await asyncio.to_thread(self.cassette.append, fingerprint(model_id, messages), model_id, messages, content)
+        return content
+
+    async def stream(self, model_id, messages, timeout, usage=None):
+        chunks = []
+        async for delta in self.live.stream(model_id, messages, timeout, usage):
+            chunks.append(delta)
+            yield delta
+        if chunks:
+            await asyncio.to_thread(self.cassette.append, fingerprint(model_id, messages), model_id, messages, "".join(chunks))
+
+
+class ReplayBackend(LLMBackend):
+    def __init__(self, cassette: Cassette):
+        self.cassette = cassette
+
+    def _lookup(self, key: str) -> str:
+        response = self.cassette.get(key)
+        if response is None:
+            raise BackendMiss(f"No recorded response for request {key[:12]} in {self.cassette.path}")
+        return response
+
+    async def parse(self, model_id, messages, parser, timeout, usage=None):
+        return parser.model_validate_json(self._lookup(fingerprint(model_id, messages, parser)))
+
+    async def complete(self, model_id, messages, timeout, usage=None):
+        return self._lookup(fingerprint(model_id, messages))
+
+    async def stream(self, model_id, messages, timeout, usage=None):
+        for delta in _chunk(self._lookup(fingerprint(model_id, messages))):
+            yield delta
+
+
+class LatencyModel:
+    """
+    Samples response latency from a spec string:
+    "fixed:0.3", "uniform:0.1,0.5", or "lognormal:<median>,<sigma>[,<slow probability>,<slow seconds>]".
+    """
+    def __init__(self, spec: str = "fixed:0"):
+        kind, _, args = spec.partition(":")
+        self.kind = kind.strip()
+        self.args = [float(arg) for arg in args.split(",") if arg.strip()]
+        if self.kind not in ("fixed", "uniform", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {spec}")
+
+    def sample(self) -> float:
+        if self.kind == "fixed":
+            return self.args[0] if self.args else 0.0
+        if self.kind == "uniform":
+            return random.uniform(self.args[0], self.args[1])
+        median, sigma = self.args[0], self.args[1]
+        if len(self.args) >= 4 and random.random() < self.args[2]:
+            return self.args[3]
+        return random.lognormvariate(math.log(median), sigma)
+
+
+class ScriptedBackend(LLMBackend):
+    """
+    Canned responses from a JSON script:
+
+        {
+          "structured": {"OrchestratorDecision": {"intent": "...", "user_provides_data": true, "reason": "..."}},
+          "text": [{"contains": "topic classification", "response": "INSURANCE"}],
+          "default_text": "Scripted answer."
+        }
+
+    Structured responses are looked up by parser class name; text rules match a substring of the
+    system or user prompt, first match wins. Every call sleeps for a sample of the latency model.
+    """
+    def __init__(self, script: dict, latency: LatencyModel):
+        self.structured = script.get("structured", {})
+        self.text_rules = script.get("text", [])
+        self.default_text = script.get("default_text")
+        self.latency = latency
+
+    async def parse(self, model_id, messages, parser, timeout, usage=None):
+        await asyncio.sleep(self.latency.sample())
+        payload = self.structured.get(parser.__name__)
+        if payload is None:
+            raise BackendMiss(f"No scripted response for {parser.__name__}")
+        return parser.model_validate(payload)
+
+    async def complete(self, model_id, messages, timeout, usage=None):
+        await asyncio.sleep(self.latency.sample())
+        return self._text(messages)
+
+    async def stream(self, model_id, messages, timeout, usage=None):
+        await asyncio.sleep(self.latency.sample())
+        for delta in _chunk(self._text(messages)):
+            yield delta
+
+    def _text(self, messages: List[dict]) -> str:
+        prompt = "\n".join(m["content"] for m in messages)
+        for rule in self.text_rules:
+            if rule["contains"] in prompt:
+                return rule["response"]
+        if self.default_text is None:
+            raise BackendMiss("No scripted text response matched")
+        return self.default_text
+
+
+def create_backend(kind: str, client: AsyncOpenAI, cassette_path: str = "", script_path: str = "", latency: str = "fixed:0") -> LLMBackend:
+    if kind == "live":
+        return LiveBackend(client)
+    if kind == "record":
+        return RecordingBackend(LiveBackend(client), get_cassette(cassette_path))
+    if kind == "replay":
+        return ReplayBackend(get_cassette(cassette_path))
+    if kind == "scripted":
+        with open(script_path, encoding="utf-8") as f:
+            script = json.load(f)
+        return ScriptedBackend(script, LatencyModel(latency))
+    raise ValueError(f"Unknown LLM backend: {kind}")
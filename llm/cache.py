@@ -0,0 +1,162 @@
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from config.config import get_settings
+
+
+@lru_cache(maxsize=None)
+def _parser_schema(parser) -> str:
+    """Stable text form of a pydantic parser, so a schema change invalidates old entries."""
+    if parser is None:
+        return ""
+    return json.dumps(parser.model_json_schema(), sort_keys=True)
+
+
+def make_cache_key(
+        model_id: str,
+        sys_prompt: Optional[str],
+        human_prompt: str,
+        parser=None
+    ) -> str:
+    """
+    Fingerprint of an LLM request: model, system prompt, human prompt and parser schema.
+    """
+    sys_prompt_hash = hashlib.sha256((sys_prompt or "").encode()).hexdigest()
+    material = "\x1f".join([model_id, sys_prompt_hash, human_prompt, _parser_schema(parser)])
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+class ResponseCache:
+    """
+    Two-tier cache for LLM responses.
+
+    L1 is an in-process LRU with a TTL. L2 is an optional SQLite file, so every uvicorn
+    worker on the host can reuse a response one of them already paid for.
+    Values are stored serialized (plain text, or JSON for structured responses) and
+    decoded on every hit, so callers never share a mutable object.
+    """
+    def __init__(
+            self,
+            max_entries: int = 1024,
+            ttl_seconds: float = 3600,
+            disk_path: str = ""
+        ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._disk = None
+        self._disk_lock = threading.Lock()
+        if disk_path:
+            self._disk = sqlite3.connect(disk_path, check_same_thread=False, isolation_level=None)
+            self._disk.execute("PRAGMA journal_mode=WAL")
+            self._disk.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+# -------------------------------------------------------------------------------------------------
+# PUBLIC FUNCTIONS
+# -------------------------------------------------------------------------------------------------
+
+    async def get(self, key: str, parser=None):
+        """
+        Returns the decoded cached response, or None on a miss.
+        """
+        payload = self._memory_get(key)
+        if payload is None and self._disk is not None:
+            payload = await asyncio.to_thread(self._disk_get, key)
+            if payload is not None:
+                self.disk_hits += 1
+                self._memory_set(key, payload)
+
+        if payload is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return self._decode(payload, parser)
+
+    async def set(self, key: str, value, parser=None):
+        if value is None:
+            return
+        payload = self._encode(value, parser)
+        self._memory_set(key, payload)
+        if self._disk is not None:
+            await asyncio.to_thread(self._disk_set, key, payload)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._entries)
+        }
+
+# -------------------------------------------------------------------------------------------------
+# PRIVATE FUNCTIONS
+# -------------------------------------------------------------------------------------------------
+
+    def _memory_get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, payload = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return payload
+
+    def _memory_set(self, key: str, payload: str):
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _disk_get(self, key: str) -> Optional[str]:
+        with self._disk_lock:
+            row = self._disk.execute(
+                "SELECT value FROM llm_cache WHERE key = ? AND expires_at >= ?", (key, time.time())
+            ).fetchone()
+        return row[0] if row else None
+
+    def _disk_set(self, key: str, payload: str):
+        with self._disk_lock:
+            self._disk.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, payload, time.time() + self.ttl_seconds)
+            )
+
+    def _encode(self, value, parser) -> str:
+        return value.model_dump_json() if parser is not None else value
+
+    def _decode(self, payload: str, parser):
+        return parser.model_validate_json(payload) if parser is not None else payload
+
+
+@lru_cache
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Process-wide response cache, or None when caching is disabled in settings.
+    """
+    settings = get_settings().llm_cache
+    if not settings.enabled:
+        return None
+    return ResponseCache(
+        max_entries=settings.max_entries,
+        ttl_seconds=settings.ttl_seconds,
+        disk_path=settings.disk_path
+    )
@@ -0,0 +1,346 @@
+import logging
+from functools import lru_cache
+from typing import AsyncIterator, Callable
+
+import httpx
+from openai import AsyncOpenAI
+from langsmith.wrappers import wrap_openai
+
+from config.config import Settings, get_settings
+from llm.cache import get_response_cache, make_cache_key
+from llm.singleflight import get_single_flight
+from llm.scheduler import Priority, get_llm_scheduler
+from llm.hedging import get_hedger
+from llm.tiering import get_model_policy
+from llm.backends import create_backend
+from monitoring.metrics import track_llm_call
+
+DEFAULT_MODEL = "gemini-2.5-flash"
+
+logger = logging.getLogger(__name__)
+
+# -------------------------------------------------------------------------------------------------
+# PROCESS-WIDE CONNECTION POOL
+# Every LLMFactory shares one httpx pool, so connections are reused across sessions. Admission
+# (per-model concurrency and priority) is handled by the shared scheduler in llm/scheduler.py.
+# -------------------------------------------------------------------------------------------------
+
+_http_client: httpx.AsyncClient = None
+
+
+def _get_http_client(settings: Settings) -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.llm.max_connections,
+                max_keepalive_connections=settings.llm.max_keepalive_connections
+            ),
+            timeout=settings.llm.timeout
+        )
+    return _http_client
+
+
+@lru_cache
+def _get_llm_client(base_url: str, api_key: str) -> AsyncOpenAI:
+    """
+    One wrapped AsyncOpenAI client per endpoint, all of them on the shared connection pool.
+    """
+    return wrap_openai(AsyncOpenAI(
+        api_key = api_key,
+        base_url = base_url,
+        http_client = _get_http_client(get_settings())
+    ))
+
+
+async def close_http_client():
+    """
+    Closes the shared connection pool and drops the clients bound to it. Called on application shutdown.
+    """
+    global _http_client
+    if _http_client is not None and not _http_client.is_closed:
+        await _http_client.aclose()
+    _http_client = None
+    _get_llm_client.cache_clear()
+    get_llm_factory.cache_clear()
+
+
+class LLMFactory:
+    def __init__(
+            self,
+            model_id: str = DEFAULT_MODEL,
+            base_url: str = None
+        ):
+
+        settings = get_settings()
+        self.model_id = model_id
+        self.base_url = base_url or settings.llm.base_url
+        self.timeout = settings.llm.timeout
+        self.scheduler = get_llm_scheduler()
+        self.hedger = get_hedger()
+        self.hedging_enabled = settings.llm.hedge_enabled
+        self.llm_client = _get_llm_client(self.base_url, settings.llm.api_key)
+        self.backend = create_backend(
+            settings.llm.backend,
+            self.llm_client,
+            cassette_path = settings.llm.cassette_path,
+            script_path = settings.llm.script_path,
+            latency = settings.llm.scripted_latency
+        )
+        self.cache = get_response_cache()
+        self.single_flight = get_single_flight()
+        self.model_policy = get_model_policy()
+
+    async def _get_structured_response(
+            self,
+            human_prompt: str,
+            parser,
+            model_id: str = None,
+            sys_prompt: str = None,
+            timeout: float = None,
+            use_cache: bool = True,
+            priority: Priority = Priority.INTERACTIVE,
+            hedge: bool = False,
+            call_site: str = None,
+            validate: Callable = None
+        ):
+
+        """
+            Gets a structured response from a language model using the provided parameters.
+            Args:
+                model_id (str, optional): The identifier for the language model to use. Defaults to the factory's model.
+                sys_prompt (str, optional): System prompt to provide context to the model. If None, only the user message is sent.
+                human_prompt (str): The user's message or prompt to send to the model.
+                parser (dict): The response format parser configuration.
+                timeout (float, optional): Per-call timeout in seconds. Defaults to the configured LLM timeout.
+                use_cache (bool, optional): Set to False for non-deterministic or PII-bearing prompts.
+                priority (Priority, optional): Scheduling class; BACKGROUND requests may be dropped under load.
+                hedge (bool, optional): Send a duplicate request if this one is slower than recent ones (see llm/hedging.py).
+                call_site (str, optional): Name of the calling site; selects its model tiers from the LLM_MODELS_* settings.
+                    Ignored when `model_id` is given.
+                validate (callable, optional): Extra check on the response; a rejected response escalates to the next tier.
+            Returns:
+                The parsed structured response from the model.
+            Note:
+                This method uses the beta API endpoint for parsing chat completions.
+        """
+        if sys_prompt:
+            messages = [
+                {'role':'system', 'content':sys_prompt},
+                {'role':'user', 'content': human_prompt}
+            ]
+        else:
+            messages = [
+                {'role':'user', 'content': human_prompt}
+            ]
+
+        tiers = [model_id] if model_id else self.model_policy.tiers(call_site, self.model_id)
+        return await self.model_policy.run(
+            call_site,
+            tiers,
+            lambda tier_model: self._structured_request(
+                tier_model, messages, human_prompt, parser, sys_prompt, timeout, use_cache, priority, hedge, call_site
+            ),
+            validate
+        )
+
+    async def _get_normal_response(
+            self,
+            human_prompt: str,
+            model_id: str = None,
+            sys_prompt: str = "",
+            timeout: float = None,
+            use_cache: bool = True,
+            priority: Priority = Priority.INTERACTIVE,
+            hedge: bool = False,
+            call_site: str = None,
+            validate: Callable = None
+        ):
+
+        """
+            Gets a structured response from a language model using the provided parameters.
+            Args:
+                model_id (str, optional): The identifier for the language model to use. Defaults to the factory's model.
+                sys_prompt (str, optional): System prompt to provide context to the model. If None, only the user message is sent.
+                human_prompt (str): The user's message or prompt to send to the model.
+                timeout (float, optional): Per-call timeout in seconds. Defaults to the configured LLM timeout.
+                use_cache (bool, optional): Set to False for non-deterministic or PII-bearing prompts.
+                priority (Priority, optional): Scheduling class; BACKGROUND requests may be dropped under load.
+                hedge (bool, optional): Send a duplicate request if this one is slower than recent ones (see llm/hedging.py).
+                call_site (str, optional): Name of the calling site; selects its model tiers from the LLM_MODELS_* settings.
+                    Ignored when `model_id` is given.
+                validate (callable, optional): Extra check on the response; a rejected response escalates to the next tier.
+            Returns:
+                The parsed structured response from the model.
+        """
+        if sys_prompt:
+            messages = [
+                {'role':'system', 'content':sys_prompt},
+                {'role':'user', 'content': human_prompt}
+            ]
+        else:
+            messages = [
+                {'role':'user', 'content': human_prompt}
+            ]
+
+        tiers = [model_id] if model_id else self.model_policy.tiers(call_site, self.model_id)
+        return await self.model_policy.run(
+            call_site,
+            tiers,
+            lambda tier_model: self._normal_request(
+                tier_model, messages, human_prompt, sys_prompt, timeout, use_cache, priority, hedge, call_site
+            ),
+            validate
+        )
+
+    async def _stream_normal_response(
+            self,
+            human_prompt: str,
+            model_id: str = None,
+            sys_prompt: str = "",
+            timeout: float = None,
+            use_cache: bool = True,
+            priority: Priority = Priority.INTERACTIVE,
+            call_site: str = None
+        ) -> AsyncIterator[str]:
+
+        """
+            Streaming variant of `_get_normal_response`. Yields text deltas as the model produces them.
+            A cache hit is yielded as a single chunk, and a completed stream is written back to the cache.
+            On error the stream simply ends, so callers should treat an empty stream like a None response.
+            `call_site` labels the request's metrics and picks the first of its model tiers.
+        """
+        if sys_prompt:
+            messages = [
+                {'role':'system', 'content':sys_prompt},
+                {'role':'user', 'content': human_prompt}
+            ]
+        else:
+            messages = [
+                {'role':'user', 'content': human_prompt}
+            ]
+
+        # Streams are not escalated; they use the call site's first tier
+        model_id = model_id or self.model_policy.tiers(call_site, self.model_id)[0]
+        cache_key = None
+        if use_cache and self.cache is not None:
+            cache_key = make_cache_key(model_id, sys_prompt, human_prompt)
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                yield cached
+                return
+
+        chunks = []
+        try:
+            async with self.scheduler.slot(model_id, priority):
+                with track_llm_call(call_site, model_id) as usage:
+                    async for delta in self.backend.stream(model_id, messages, timeout or self.timeout, usage):
+                        chunks.append(delta)
+                        yield delta
+
+        except Exception as e:
+            logger.warning(f"LLM stream failed ({call_site or 'default'}, {model_id}): {type(e).__name__}: {e}")
+            return
+
+        if cache_key and chunks:
+            await self.cache.set(cache_key, "".join(chunks))
+
+    async def _structured_request(
+            self,
+            model_id: str,
+            messages: list,
+            human_prompt: str,
+            parser,
+            sys_prompt: str,
+            timeout: float,
+            use_cache: bool,
+            priority: Priority,
+            hedge: bool,
+            call_site: str
+        ):
+        """One structured request to a single model: cache, single-flight, scheduler slot and optional hedge."""
+        request_key = make_cache_key(model_id, sys_prompt, human_prompt, parser)
+        cache_key = None
+        if use_cache and self.cache is not None:
+            cache_key = request_key
+            cached = await self.cache.get(cache_key, parser)
+            if cached is not None:
+                return cached
+
+        async def attempt():
+            async with self.scheduler.slot(model_id, priority):
+                with track_llm_call(call_site, model_id) as usage:
+                    return await self.backend.parse(model_id, messages, parser, timeout or self.timeout, usage)
+
+        async def call():
+            parsed = await self._send(model_id, attempt, hedge)
+            if cache_key:
+                await self.cache.set(cache_key, parsed, parser)
+            return parsed
+
+        try:
+            # Identical concurrent requests share one upstream call
+            parsed = await self.single_flight.do(f"{priority}:{request_key}", call)
+            # Coalesced callers get their own copy, since agents mutate the parsed model
+            return parsed.model_copy(deep=True) if parsed is not None else None
+
+        except Exception as e:
+            logger.warning(f"LLM request failed ({call_site or 'default'}, {model_id}): {type(e).__name__}: {e}")
+            return None
+
+    async def _normal_request(
+            self,
+            model_id: str,
+            messages: list,
+            human_prompt: str,
+            sys_prompt: str,
+            timeout: float,
+            use_cache: bool,
+            priority: Priority,
+            hedge: bool,
+            call_site: str
+        ):
+        """One plain-text request to a single model: cache, single-flight, scheduler slot and optional hedge."""
+        request_key = make_cache_key(model_id, sys_prompt, human_prompt)
+        cache_key = None
+        if use_cache and self.cache is not None:
+            cache_key = request_key
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        async def attempt():
+            async with self.scheduler.slot(model_id, priority):
+                with track_llm_call(call_site, model_id) as usage:
+                    return await self.backend.complete(model_id, messages, timeout or self.timeout, usage)
+
+        async def call():
+            content = await self._send(model_id, attempt, hedge)
+            if cache_key:
+                await self.cache.set(cache_key, content)
+            return content
+
+        try:
+            return await self.single_flight.do(f"{priority}:{request_key}", call)
+
+        except Exception as e:
+            logger.warning(f"LLM request failed ({call_site or 'default'}, {model_id}): {type(e).__name__}: {e}")
+            return None
+
+    async def _send(self, model_id: str, attempt, hedge: bool):
+        """Runs one upstream attempt, hedged when the call site opted in and hedging is enabled."""
+        if hedge and self.hedging_enabled:
+            return await self.hedger.run(model_id, attempt)
+        return await attempt()
+
+
+@lru_cache
+def get_llm_factory(
+        model_id: str = DEFAULT_MODEL,
+        base_url: str = None
+    ) -> LLMFactory:
+    """
+    Returns the process-wide LLMFactory for a model and endpoint, creating it on first use.
+    Agents share these instances instead of building their own per session.
+    """
+    return LLMFactory(model_id=model_id, base_url=base_url)
@@ -0,0 +1,139 @@
+import asyncio
+import math
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+from config.config import get_settings
+
+T = TypeVar("T")
+
+
+class LatencyTracker:
+    """
+    Sliding window of recent successful request latencies, per model. A primary attempt cancelled
+    because its hedge won counts with its elapsed time, a lower bound on its latency: leaving it out
+    would keep only the fast requests and pull the hedging percentile down.
+    """
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, model_id: str, seconds: float):
+        self._samples.setdefault(model_id, deque(maxlen=self.window)).append(seconds)
+
+    def percentile(self, model_id: str, percentile: float, min_samples: int = 1) -> Optional[float]:
+        samples = self._samples.get(model_id)
+        if not samples or len(samples) < min_samples:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, math.ceil(percentile * len(ordered)) - 1)
+        return ordered[max(index, 0)]
+
+
+class Hedger:
+    """
+    Hedged requests: if the first attempt has not returned by the `percentile` latency of recent
+    requests, a duplicate is started and whichever finishes first wins; the other is cancelled.
+
+    Hedges are capped at `budget` of all hedged-eligible requests (0.05 = at most 5% extra upstream
+    calls), and no hedging happens until `min_samples` latencies have been observed for the model.
+    """
+    def __init__(
+            self,
+            percentile: float = 0.95,
+            budget: float = 0.05,
+            min_samples: int = 20,
+            window: int = 200,
+            min_delay: float = 0.05
+        ):
+        self.percentile = percentile
+        self.budget = budget
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.latencies = LatencyTracker(window)
+
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.budget_exhausted = 0
+
+# -------------------------------------------------------------------------------------------------
+# PUBLIC FUNCTIONS
+# -------------------------------------------------------------------------------------------------
+
+    async def run(self, model_id: str, attempt: Callable[[], Awaitable[T]]) -> T:
+        """
+        Runs `attempt`, hedging it with a second call of `attempt` when the first is slow.
+        """
+        self.requests += 1
+        delay = self.latencies.percentile(model_id, self.percentile, self.min_samples)
+
+        started = time.monotonic()
+        primary = asyncio.ensure_future(attempt())
+        hedge = None
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait({primary}, timeout=max(delay, self.min_delay))
+                if not done and self._within_budget():
+                    self.hedges += 1
+                    hedge_started = time.monotonic()
+                    hedge = asyncio.ensure_future(attempt())
+
+            if hedge is None:
+                result = await primary
+                self.latencies.record(model_id, time.monotonic() - started)
+                return result
+
+            pending = {primary, hedge}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # Prefer a successful result; only surface an error once both attempts have failed
+                for task in done:
+                    if task.exception() is None:
+                        now = time.monotonic()
+                        if task is hedge:
+                            self.hedge_wins += 1
+                            if not primary.done():
+                                # Censored sample: the primary would have taken at least this long
+                                self.latencies.record(model_id, now - started)
+                        self.latencies.record(model_id, now - (hedge_started if task is hedge else started))
+                        return task.result()
+            return primary.result()
+
+        finally:
+            # The losing attempt, or both if the caller was cancelled
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "hedge_rate": self.hedges / self.requests if self.requests else 0.0,
+            "budget_exhausted": self.budget_exhausted
+        }
+
+# -------------------------------------------------------------------------------------------------
+# PRIVATE FUNCTIONS
+# -------------------------------------------------------------------------------------------------
+
+    def _within_budget(self) -> bool:
+        if self.hedges + 1 > self.budget * self.requests:
+            self.budget_exhausted += 1
+            return False
+        return True
+
+
+@lru_cache
+def get_hedger() -> Hedger:
+    """Process-wide hedger shared by every LLMFactory."""
+    settings = get_settings().llm
+    return Hedger(
+        percentile=settings.hedge_percentile,
+        budget=settings.hedge_budget,
+        min_samples=settings.hedge_min_samples
+    )
@@ -0,0 +1,159 @@
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from config.config import get_settings
+
+
+class Priority(IntEnum):
+    """Lower value is served first."""
+    INTERACTIVE = 0  # a user is waiting on this turn
+    STANDARD = 1     # startup and other non-turn work
+    BACKGROUND = 2   # summarization, analytics
+
+
+class LLMRequestDropped(Exception):
+    """Raised when a low-priority request waits longer than the configured maximum for a slot."""
+
+
+class _ModelQueue:
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.active = 0
+        self.waiters: List[Tuple[int, int, asyncio.Future]] = []
+
+
+class LLMScheduler:
+    """
+    Admission control for upstream LLM calls.
+
+    Each model gets `max_concurrency` slots (or its own limit from `model_limits`). When every slot
+    is busy, callers queue by priority and then arrival order, so interactive turns overtake
+    background work. Background requests give up after `background_max_wait` seconds with
+    LLMRequestDropped instead of holding a place in the queue behind user traffic.
+    """
+    def __init__(
+            self,
+            max_concurrency: int = 16,
+            model_limits: Optional[Dict[str, int]] = None,
+            background_max_wait: float = 10.0
+        ):
+        self.max_concurrency = max_concurrency
+        self.model_limits = model_limits or {}
+        self.background_max_wait = background_max_wait
+        self._queues: Dict[str, _ModelQueue] = {}
+        self._sequence = itertools.count()
+
+        self.admitted = {priority.name: 0 for priority in Priority}
+        self.dropped = 0
+        self.total_wait = 0.0
+
+# -------------------------------------------------------------------------------------------------
+# PUBLIC FUNCTIONS
+# -------------------------------------------------------------------------------------------------
+
+    @asynccontextmanager
+    async def slot(self, model_id: str, priority: Priority = Priority.INTERACTIVE):
+        """
+        Holds one of the model's slots for the duration of the block.
+        """
+        queue = self._queue(model_id)
+        started = time.monotonic()
+        await self._acquire(queue, priority)
+        self.admitted[priority.name] += 1
+        self.total_wait += time.monotonic() - started
+        try:
+            yield
+        finally:
+            self._release(queue)
+
+    def queue_depth(self, model_id: str = None) -> int:
+        """Requests waiting for a slot, for one model or across all of them."""
+        if model_id is None:
+            return sum(len(queue.waiters) for queue in self._queues.values())
+        queue = self._queues.get(model_id)
+        return len(queue.waiters) if queue else 0
+
+    def stats(self) -> dict:
+        admitted = sum(self.admitted.values())
+        return {
+            "admitted": dict(self.admitted),
+            "dropped": self.dropped,
+            "avg_wait_seconds": self.total_wait / admitted if admitted else 0.0,
+            "models": {
+                model_id: {"active": queue.active, "limit": queue.limit, "queue_depth": len(queue.waiters)}
+                for model_id, queue in self._queues.items()
+            }
+        }
+
+# -------------------------------------------------------------------------------------------------
+# PRIVATE FUNCTIONS
+# -------------------------------------------------------------------------------------------------
+
+    def _queue(self, model_id: str) -> _ModelQueue:
+        queue = self._queues.get(model_id)
+        if queue is None:
+            queue = _ModelQueue(self.model_limits.get(model_id, self.max_concurrency))
+            self._queues[model_id] = queue
+        return queue
+
+    async def _acquire(self, queue: _ModelQueue, priority: Priority):
+        if queue.active < queue.limit and not queue.waiters:
+            queue.active += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        entry = (int(priority), next(self._sequence), waiter)
+        heapq.heappush(queue.waiters, entry)
+
+        timeout = self.background_max_wait if priority >= Priority.BACKGROUND else None
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout)
+        except BaseException as e:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as we gave up; pass it on
+                self._release(queue)
+            else:
+                waiter.cancel()
+                queue.waiters.remove(entry)
+                heapq.heapify(queue.waiters)
+            if isinstance(e, asyncio.TimeoutError):
+                self.dropped += 1
+                raise LLMRequestDropped(
+                    f"Background LLM request waited more than {self.background_max_wait}s for a slot"
+                ) from None
+            raise
+
+    def _release(self, queue: _ModelQueue):
+        # Hand the slot straight to the next waiter so it cannot be taken by a newcomer
+        while queue.waiters:
+            _, _, waiter = heapq.heappop(queue.waiters)
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        queue.active -= 1
+
+
+def _parse_model_limits(raw: str) -> Dict[str, int]:
+    """Parses "gemini-2.5-pro=4,gemini-2.5-flash=16" into {model_id: limit}."""
+    limits = {}
+    for item in filter(None, (part.strip() for part in raw.split(","))):
+        model_id, _, limit = item.partition("=")
+        limits[model_id.strip()] = int(limit)
+    return limits
+
+
+@lru_cache
+def get_llm_scheduler() -> LLMScheduler:
+    """Process-wide scheduler shared by every LLMFactory."""
+    settings = get_settings().llm
+    return LLMScheduler(
+        max_concurrency=settings.max_concurrency,
+        model_limits=_parse_model_limits(settings.model_concurrency),
+        background_max_wait=settings.background_max_wait
+    )
@@ -0,0 +1,51 @@
+import asyncio
+from functools import lru_cache
+from typing import Awaitable, Callable, Dict, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical requests.
+
+    The first caller for a key starts the upstream call as a task; callers that arrive while it is
+    still in flight await the same task instead of issuing their own. Each caller awaits through
+    `asyncio.shield`, so one caller being cancelled (e.g. a dropped connection) does not cancel
+    the request for the others. Nothing is kept once the task finishes; caching is a separate layer.
+    """
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        self.calls += 1
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done, key=key: self._forget(key, done))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight)
+        }
+
+    def _forget(self, key: str, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception as retrieved in case every caller was cancelled before it finished
+        if not task.cancelled():
+            task.exception()
+
+
+@lru_cache
+def get_single_flight() -> SingleFlight:
+    """Process-wide single-flight group shared by every LLMFactory."""
+    return SingleFlight()
@@ -0,0 +1,97 @@
+import logging
+import time
+from collections import defaultdict
+from functools import lru_cache
+from typing import Awaitable, Callable, Dict, List, Optional, TypeVar
+
+from config.config import get_settings
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+
+class ModelPolicy:
+    """
+    Per-call-site model tiers.
+
+    A call site (e.g. "intent") is served by its cheapest model first and escalates to the next tier
+    only when the response is None (unparseable, failed validation upstream, or errored) or the
+    caller's `validate` check rejects it. Call sites without a policy use the factory's model.
+    """
+    def __init__(self, tiers: Dict[str, List[str]]):
+        self._tiers = tiers
+
+        self.requests: Dict[str, int] = defaultdict(int)
+        self.escalations: Dict[str, int] = defaultdict(int)
+        self.model_calls: Dict[str, int] = defaultdict(int)
+        self.model_failures: Dict[str, int] = defaultdict(int)
+        self.model_seconds: Dict[str, float] = defaultdict(float)
+
+# -------------------------------------------------------------------------------------------------
+# PUBLIC FUNCTIONS
+# -------------------------------------------------------------------------------------------------
+
+    def tiers(self, call_site: Optional[str], default_model: str) -> List[str]:
+        return self._tiers.get(call_site) or [default_model]
+
+    async def run(
+            self,
+            call_site: Optional[str],
+            tiers: List[str],
+            request: Callable[[str], Awaitable[Optional[T]]],
+            validate: Optional[Callable[[T], bool]] = None
+        ) -> Optional[T]:
+        """
+        Calls `request(model_id)` tier by tier until a response passes. Returns the last response
+        (possibly None) if every tier fails.
+        """
+        site = call_site or "default"
+        self.requests[site] += 1
+        result = None
+        for level, model_id in enumerate(tiers):
+            started = time.monotonic()
+            result = await request(model_id)
+            passed = result is not None and (validate is None or validate(result))
+
+            self.model_calls[model_id] += 1
+            self.model_seconds[model_id] += time.monotonic() - started
+            if passed:
+                return result
+
+            self.model_failures[model_id] += 1
+            if level + 1 < len(tiers):
+                self.escalations[site] += 1
+                logger.info(f"{site}: escalating from {model_id} to {tiers[level + 1]}")
+        return result
+
+    def stats(self) -> dict:
+        return {
+            "call_sites": {
+                site: {
+                    "requests": requests,
+                    "escalations": self.escalations[site],
+                    "escalation_rate": self.escalations[site] / requests if requests else 0.0
+                }
+                for site, requests in self.requests.items()
+            },
+            "models": {
+                model_id: {
+                    "calls": calls,
+                    "failures": self.model_failures[model_id],
+                    "avg_latency_seconds": self.model_seconds[model_id] / calls if calls else 0.0
+                }
+                for model_id, calls in self.model_calls.items()
+            }
+        }
+
+
+@lru_cache
+def get_model_policy() -> ModelPolicy:
+    """Process-wide model policy built from the LLM_MODELS_* settings."""
+    settings = get_settings().llm_models
+    tiers = {
+        call_site: [model.strip() for model in value.split(",") if model.strip()]
+        for call_site, value in settings.model_dump().items()
+    }
+    return ModelPolicy(tiers)
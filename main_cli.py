@@ -1,13 +1,12 @@
 import asyncio
 import uuid
 from orchestrator.router import MainOrchestrator
-from state import OverallState
-from typing_extensions import cast
+from state import new_overall_state
 
 import traceback
 
 from memory.memory import MemoryManager
-from greet import generate_greeting_message
+from greet import get_greeting
 
 async def main():
     """
@@ -16,7 +15,8 @@ async def main():
     print("--- TATA AIA Conversational Agent ---")
     print("Type 'exit' or 'quit' to end the conversation.")
 
-    greeting_message = generate_greeting_message()
+    # Cached greeting (or the fallback on a cold cache); a stale one is refreshed for the next run
+    greeting_message = get_greeting()
     print("\n", "RIA: ",greeting_message)
     print("-" * 35)
 
@@ -28,30 +28,7 @@ async def main():
     # 2. Initialize the Main Orchestrator
     orchestrator = MainOrchestrator(memory_client)
     
-    # This dictionary MUST contain all the keys defined in your OverallState TypedDict.
-    # We use `cast` to inform the type checker that this dictionary adheres to the TypedDict structure.
-    state: OverallState = cast(OverallState, {
-        "session_id": session_id,
-        "input_message": "",
-        "ai_response": greeting_message,
-        "active_workflow": None,
-        "kyc_step": None,
-        "completed_workflows": [],
-        
-        # Specialist Agent States
-        "aadhar_details": {},
-        "aadhar_verification_status": {},
-        "aadhaar_retries": 0,
-        
-        "pan_details": {},
-        "pan_verification_status": {},
-        "pan_retries": 0,
-        "match": None,
-        
-        "Form_60": {},
-        
-        "human_response": "" # Placeholder for human-in-the-loop
-    })
+    state = new_overall_state(session_id, greeting_message)
 
     # 3. Start the conversational loop
     while True:
@@ -1,13 +1,30 @@
-import redis
+import logging
+from functools import lru_cache
 from mem0 import MemoryClient
-from typing_extensions import List, Dict, Any
+import redis
+from typing_extensions import List, Dict, Any, Tuple
 
-from config.config import Settings
-from llm import LLMFactory
+from config.config import get_settings
+from llm import get_llm_factory, Priority
+from memory.redis_client import get_redis
+from memory.summarizer import get_summarization_worker
 from prompts.prompts import SUMMARIZATION_PROMPT_TEMPLATE
 
 WORKING_MEMORY_TURNS = 6
 SUMMARIZATION_THRESHOLD = WORKING_MEMORY_TURNS * 2
+# Turns leave the working memory when they are summarized, not when newer turns arrive, so none is
+# dropped unsummarized. This cap only bounds the buffer while summaries keep failing or being dropped;
+# a summary that overlaps the cap being hit can lose the turns trimmed meanwhile.
+WORKING_MEMORY_MAX_ENTRIES = SUMMARIZATION_THRESHOLD * 8
+# Once the working memory is full, a summary is asked for every this many turns
+SUMMARIZATION_EVERY_TURNS = 3
+
+logger = logging.getLogger(__name__)
+
+@lru_cache
+def get_mem0_client() -> MemoryClient:
+    """Process-wide mem0 client; creating one validates the API key over HTTP, so it is done once."""
+    return MemoryClient(api_key=get_settings().mem0.api_key)
 
 class MemoryManager:
     def __init__(
@@ -17,33 +34,27 @@ class MemoryManager:
         """
         Memory Client Initialization
         """
-        self.settings = Settings()
+        self.settings = get_settings()
         self.session_id= session_id
-        self.update_L2_memory_threshold = 3 
-
-        self.redis_client = redis.Redis(
-            host=self.settings.redisdb.host,
-            port=10908,
-            decode_responses=True,
-            username="default", 
-            password=self.settings.redisdb.password,
-        )
+
+        # Shared by every session; constructing a MemoryManager opens no connections
+        self.redis_client = get_redis()
         
-        self.mem0 = MemoryClient(
-            api_key=self.settings.mem0.api_key
-        )
+        self.mem0 = get_mem0_client()
         
-        self.llm_client = LLMFactory()
+        self.llm_client = get_llm_factory()
 
         self.working_memory_key = f"session:{session_id}:working_memory"
         self.episodic_memory_key = f"session:{session_id}:episodic_memory"
+        # Turns of the session so far; kept in Redis because a MemoryManager is built per request
+        self.turn_count_key = f"session:{session_id}:turn_count"
         self.working_memory_turns = WORKING_MEMORY_TURNS
 
 # -------------------------------------------------------------------------------------------------
 # PUBLIC FUNCTIONS
 # -------------------------------------------------------------------------------------------------
   
-    def add_turn(
+    async def add_turn(
             self, 
             user_message: str, 
             ai_message: str,
@@ -54,7 +65,7 @@ class MemoryManager:
         This is called by the orchestrator after every turn.
         """
         # 1. Update L1 Working Memory (Redis)
-        self._add_to_working_memory(user_message, ai_message)
+        history_length, turn_count = await self._add_to_working_memory(user_message, ai_message)
 
         # 2. Update mem0's memory
         # self.mem0.add(
@@ -67,25 +78,21 @@ class MemoryManager:
         #     metadata={"category": active_workflow}
         # )
 
-        self.update_L2_memory_threshold += 1
-
         # 3. Check if it's time to trigger our custom L2 summarization
-        # the memory will be updated only if 3 new conversation states are added in to the redis queue
-        history_length = self.redis_client.llen(self.working_memory_key)
-        if history_length >= SUMMARIZATION_THRESHOLD and self.update_L2_memory_threshold >= 3:
-            self.update_L2_memory_threshold = 0
-            self._trigger_and_update_redis_summary()
+        # the memory will be updated only if 3 new conversation states are added in to the redis queue.
+        # The summary is written by the background worker (memory/summarizer.py); this turn doesn't wait for it
+        if history_length >= SUMMARIZATION_THRESHOLD and turn_count % SUMMARIZATION_EVERY_TURNS == 0:
+            get_summarization_worker().enqueue(self.session_id)
 
-    def get_memory_context(self, query: str) -> str:
+    async def get_memory_context(self, query: str) -> str:
         """
         Retrieves a comprehensive, formatted memory context from all layers
         to be injected into the main orchestrator's prompt.
         """
-        # 1. Get L1 context from Redis
-        working_memory = self._get_working_memory()
-
-        # 2. Get L2 context from Redis
-        redis_summary = self.redis_client.get(self.episodic_memory_key) or "No summary yet."
+        # 1. and 2. Get L1 and L2 context from Redis, in one round trip
+        history, redis_summary = await self._read_redis_memory(self.working_memory_turns * 2)
+        working_memory = "\n".join(history)
+        redis_summary = redis_summary or "No summary yet."
 
         # 3. Get L2/L3 context from mem0
         # mem0_memories = self.mem0.search(
@@ -106,55 +113,93 @@ class MemoryManager:
             f"**Recent Conversation History (L1):**\n{working_memory}"
         )
 
-# -------------------------------------------------------------------------------------------------
-# PRIVATE FUNCTIONS
-# -------------------------------------------------------------------------------------------------
-    
-    def _add_to_working_memory(
-        self, 
-        user_message: str, 
-        ai_message: str
-    ):
-        self.redis_client.lpush(self.working_memory_key, f"AI: {ai_message}")
-        self.redis_client.lpush(self.working_memory_key, f"User: {user_message}")
-        # Retaining only the last 3 questions and answers
-        self.redis_client.ltrim(self.working_memory_key, 0, (self.working_memory_turns * 2) - 1)
-
-
-    def _get_working_memory(self) -> str:
+    async def clear(self):
         """
-        Retrieves the last N turns as a single formatted string.
+        Deletes the session's working and episodic memory keys and its turn count (on session end or eviction).
         """
-        history = self.redis_client.lrange(self.working_memory_key, 0, -1)
-        # Reverse the list to get chronological order (oldest to newest)
-        return "\n".join(reversed(history))
-    
-    def _trigger_and_update_redis_summary(self):
+        await self.redis_client.delete(self.working_memory_key, self.episodic_memory_key, self.turn_count_key)
+
+    async def update_summary(self) -> bool:
         """
         Uses an LLM to create a new summary from the old one and recent history,
-        then updates the Redis L2 key and clears the L1 buffer.
+        then updates the Redis L2 key and drops the summarized turns from the L1 buffer.
+        Called by the background summarization worker. Returns False if the LLM call was dropped.
         """
         print(f"--- [Memory] Triggering L2 Redis summarization for session: {self.session_id} ---")
         
-        full_history = self._get_working_memory()
-        current_summary = self.redis_client.get(self.episodic_memory_key) or ""
+        history, current_summary = await self._read_redis_memory()
+        if not history:
+            # Already summarized, or the session was cleared while this was queued
+            return True
         
         prompt = SUMMARIZATION_PROMPT_TEMPLATE.format(
             current_summary=current_summary,
-            new_lines=full_history
+            new_lines="\n".join(history)
         )
         
-        try:
-            new_summary = self.llm_client._get_normal_response(prompt)
-            self.redis_client.set(self.episodic_memory_key, new_summary)
-            
-            # CRITICAL: After summarizing, we clear the working memory.
-            # This prevents the same information from being processed again and keeps
-            # the L1 buffer fresh with only post-summary turns.
-            self.redis_client.delete(self.working_memory_key)
-
-        except Exception as e:
-            print(f"Error during L2 Redis summarization: {e}")
+        new_summary = await self.llm_client._get_normal_response(
+            prompt, use_cache=False, priority=Priority.BACKGROUND, call_site="summarization"
+        )
+        if not new_summary:
+            # Dropped under load or failed; the working memory is kept, so it is retried on a later turn
+            logger.info(f"L2 summarization deferred for session: {self.session_id}")
+            return False
+
+        await self._store_summary(new_summary, len(history))
+        return True
+
+# -------------------------------------------------------------------------------------------------
+# PRIVATE FUNCTIONS
+# -------------------------------------------------------------------------------------------------
+    
+    async def _add_to_working_memory(
+        self, 
+        user_message: str, 
+        ai_message: str
+    ) -> Tuple[int, int]:
+        """
+        Pushes the turn, applies the WORKING_MEMORY_MAX_ENTRIES cap and counts the turn in one
+        MULTI/EXEC round trip; returns the buffer length and the session's turn count.
+        """
+        pipe = self.redis_client.pipeline()
+        pipe.lpush(self.working_memory_key, f"AI: {ai_message}", f"User: {user_message}")
+        pipe.ltrim(self.working_memory_key, 0, WORKING_MEMORY_MAX_ENTRIES - 1)
+        pipe.incr(self.turn_count_key)
+        pushed_length, _, turn_count = await pipe.execute()
+        return min(pushed_length, WORKING_MEMORY_MAX_ENTRIES), turn_count
+
+    async def _read_redis_memory(self, max_entries: int = 0) -> Tuple[List[str], str]:
+        """
+        Retrieves the last `max_entries` turns (0 = all), oldest first, and the L2 summary, in one round trip.
+        """
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.lrange(self.working_memory_key, 0, max_entries - 1)
+        pipe.get(self.episodic_memory_key)
+        history, summary = await pipe.execute()
+        # Reverse the list to get chronological order (oldest to newest)
+        return [line.decode() for line in reversed(history)], summary.decode() if summary else ""
+
+    async def _store_summary(self, summary: str, summarized_entries: int):
+        """
+        Writes the new summary and drops exactly the summarized turns, the oldest `summarized_entries`
+        of the buffer; turns pushed since are at the head and are kept. Nothing is written if the
+        session's memory was cleared meanwhile, so a dead session leaves no key behind.
+        """
+        async with self.redis_client.pipeline() as pipe:
+            while True:
+                try:
+                    await pipe.watch(self.working_memory_key)
+                    if not await pipe.exists(self.working_memory_key):
+                        await pipe.unwatch()
+                        return
+                    pipe.multi()
+                    pipe.set(self.episodic_memory_key, summary)
+                    pipe.ltrim(self.working_memory_key, 0, -summarized_entries - 1)
+                    await pipe.execute()
+                    return
+                except redis.WatchError:
+                    # A turn was pushed in between; the summarized turns are still the tail
+                    continue
     
     def _format_mem0_results(
         self, 
@@ -0,0 +1,96 @@
+import time
+from typing import Optional
+
+import redis
+import redis.asyncio
+
+from config.config import RedisDbSettings, get_settings
+
+# -------------------------------------------------------------------------------------------------
+# PROCESS-WIDE CONNECTION POOL
+# Session memory, the session store and the reaper share one redis.asyncio client on one bounded
+# pool, so connections are reused across sessions instead of opened per MemoryManager, and Redis
+# latency is awaited instead of blocking the event loop. Beyond REDIS_MAX_CONNECTIONS, callers wait
+# for a free connection.
+# -------------------------------------------------------------------------------------------------
+
+class InstrumentedConnectionPool(redis.asyncio.BlockingConnectionPool):
+    """BlockingConnectionPool that counts checkouts and the time spent waiting for them."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.acquired = 0
+        self.wait_seconds = 0.0
+        self.exhausted = 0
+        self.peak_in_use = 0
+
+    async def get_connection(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            connection = await super().get_connection(*args, **kwargs)
+        except redis.ConnectionError as e:
+            if str(e) == "No connection available.":
+                self.exhausted += 1
+            raise
+        finally:
+            self.wait_seconds += time.perf_counter() - started
+        self.acquired += 1
+        self.peak_in_use = max(self.peak_in_use, len(self._in_use_connections))
+        return connection
+
+    def stats(self) -> dict:
+        return {
+            "max_connections": self.max_connections,
+            "in_use": len(self._in_use_connections),
+            "idle": len(self._available_connections),
+            "peak_in_use": self.peak_in_use,
+            "acquired": self.acquired,
+            "wait_seconds": self.wait_seconds,
+            "exhausted": self.exhausted
+        }
+
+
+_redis_client: redis.asyncio.Redis = None
+
+
+def redis_connection_kwargs(settings: RedisDbSettings) -> dict:
+    """Connection settings shared by the async pool and the synchronous checkpointer client."""
+    return {
+        "host": settings.host,
+        "port": settings.port,
+        "username": settings.username,
+        "password": settings.password,
+        "socket_timeout": settings.socket_timeout
+    }
+
+
+def get_redis() -> redis.asyncio.Redis:
+    """
+    Process-wide async Redis client. Responses are bytes: the session store keeps binary payloads,
+    text callers decode.
+    """
+    global _redis_client
+    if _redis_client is None:
+        settings = get_settings().redisdb
+        pool = InstrumentedConnectionPool(
+            max_connections=settings.max_connections,
+            timeout=settings.pool_timeout,
+            **redis_connection_kwargs(settings)
+        )
+        _redis_client = redis.asyncio.Redis.from_pool(pool)
+    return _redis_client
+
+
+def get_redis_pool_stats() -> Optional[dict]:
+    """Pool utilization, or None if nothing has used Redis in this process."""
+    if _redis_client is None:
+        return None
+    return _redis_client.connection_pool.stats()
+
+
+async def close_redis():
+    """
+    Closes the pool's connections. Called on application shutdown.
+    """
+    if _redis_client is not None:
+        await _redis_client.connection_pool.disconnect()
@@ -0,0 +1,142 @@
+# Background summarization of episodic memory.
+# Summarizing a session's working memory is an LLM call; made inside add_turn it delayed the reply of
+# every few turns. The request path now only calls `enqueue`, and workers write the summary later:
+#   - the queue is bounded; when it is full the request is dropped and a later turn asks again
+#     (the working memory stays in Redis until it is summarized)
+#   - a session is summarized debounce_seconds after its first request; requests in between coalesce
+#   - at most one summary per session is in flight; requests arriving meanwhile are coalesced into it,
+#     and turns added meanwhile stay in the working memory for the next summary
+# Summaries go through the LLM scheduler as BACKGROUND work on the summarization model tier
+# (LLM_MODELS_SUMMARIZATION), so they never hold up a user's turn.
+
+import asyncio
+import logging
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional, Set
+
+from config.config import get_settings
+from monitoring.metrics import record_summarization_lag
+
+logger = logging.getLogger(__name__)
+
+
+class SummarizationWorker:
+    def __init__(self, queue_size: int = 1000, debounce_seconds: float = 5.0, workers: int = 2):
+        self.debounce_seconds = debounce_seconds
+        self.workers = workers
+        self._queue: Optional[asyncio.Queue] = None
+        self._queue_size = queue_size
+        self._tasks: List[asyncio.Task] = []
+        # Session -> when its summary is due; a session is in here from enqueue until its summary starts
+        self._due: Dict[str, float] = {}
+        self._in_flight: Set[str] = set()
+
+        self.completed = 0
+        self.deferred = 0
+        self.failed = 0
+        self.coalesced = 0
+        self.dropped = 0
+
+# -------------------------------------------------------------------------------------------------
+# PUBLIC FUNCTIONS
+# -------------------------------------------------------------------------------------------------
+
+    def enqueue(self, session_id: str) -> bool:
+        """
+        Asks for the session's working memory to be summarized. Never waits; returns False if the
+        request was dropped because the queue is full.
+        """
+        self.start()
+        if session_id in self._due or session_id in self._in_flight:
+            self.coalesced += 1
+            return True
+        try:
+            self._queue.put_nowait(session_id)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+        self._due[session_id] = time.monotonic() + self.debounce_seconds
+        return True
+
+    def start(self) -> None:
+        """Starts the workers on the running loop; enqueue calls it, so it only has to be called explicitly to start early."""
+        if not self._tasks:
+            self._queue = asyncio.Queue(maxsize=self._queue_size)
+            self._tasks = [asyncio.create_task(self._run()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Stops the workers; pending summaries are dropped and asked for again by later turns."""
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+        self._queue = None
+        self._due.clear()
+        self._in_flight.clear()
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        return {
+            "queued": len(self._due),
+            "in_flight": len(self._in_flight),
+            "oldest_wait_seconds": max([now - due for due in self._due.values()] + [0.0]),
+            "completed": self.completed,
+            "deferred": self.deferred,
+            "failed": self.failed,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped
+        }
+
+# -------------------------------------------------------------------------------------------------
+# INTERNAL FUNCTIONS
+# -------------------------------------------------------------------------------------------------
+
+    async def _run(self) -> None:
+        while True:
+            session_id = await self._queue.get()
+            try:
+                wait = self._due[session_id] - time.monotonic()
+                if wait > 0:
+                    # Not due yet: come back to it without holding up the sessions queued behind it
+                    asyncio.get_running_loop().call_later(wait, self._requeue, session_id)
+                    continue
+                await self._summarize(session_id)
+            finally:
+                self._queue.task_done()
+
+    def _requeue(self, session_id: str) -> None:
+        if self._queue is None:
+            return
+        try:
+            self._queue.put_nowait(session_id)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            self._due.pop(session_id, None)
+
+    async def _summarize(self, session_id: str) -> None:
+        from memory.memory import MemoryManager
+
+        due = self._due.pop(session_id)
+        self._in_flight.add(session_id)
+        try:
+            if await MemoryManager(session_id).update_summary():
+                self.completed += 1
+                record_summarization_lag(max(time.monotonic() - due, 0.0))
+            else:
+                self.deferred += 1
+        except Exception as e:
+            self.failed += 1
+            logger.warning(f"Episodic memory summarization failed for session {session_id}: {e}")
+        finally:
+            self._in_flight.discard(session_id)
+
+
+@lru_cache
+def get_summarization_worker() -> SummarizationWorker:
+    settings = get_settings().summarization
+    return SummarizationWorker(settings.queue_size, settings.debounce_seconds, settings.workers)
@@ -0,0 +1,222 @@
+"""
+Prometheus metrics for the KYC service, exposed on /metrics by app/main.py.
+
+Per-call LLM metrics are recorded as calls happen (`track_llm_call`), and so are checkpoint
+writes (`record_checkpoint_write`) and episodic memory summaries (`record_summarization_lag`).
+Counters that components already keep for themselves (cache, single-flight, scheduler, hedger,
+model tiers, fast paths, FAQ index, checkpointer, session reaper, Redis pool, summarization worker)
+are read from their `stats()` at scrape time by `ComponentStatsCollector`, so those components
+stay free of Prometheus imports.
+"""
+
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from prometheus_client import Counter, Histogram, REGISTRY
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+LLM_LATENCY_BUCKETS = (0.1, 0.25, 0.5, 0.75, 1, 1.5, 2, 3, 5, 8, 13, 21, 30)
+CHECKPOINT_SECONDS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+CHECKPOINT_BYTES_BUCKETS = (512, 1024, 2048, 4096, 8192, 16384, 32768, 65536, 131072, 262144)
+SUMMARIZATION_LAG_BUCKETS = (0.5, 1, 2, 3, 5, 8, 13, 21, 30, 60, 120)
+
+LLM_REQUEST_SECONDS = Histogram(
+    "kyc_llm_request_seconds",
+    "Upstream LLM request latency",
+    ["call_site", "model", "outcome"],
+    buckets=LLM_LATENCY_BUCKETS
+)
+LLM_TOKENS = Counter(
+    "kyc_llm_tokens",
+    "Tokens reported by the LLM provider",
+    ["call_site", "model", "kind"]
+)
+LLM_ERRORS = Counter(
+    "kyc_llm_errors",
+    "Failed upstream LLM requests",
+    ["call_site", "model", "error_type"]
+)
+
+CHECKPOINT_WRITE_SECONDS = Histogram(
+    "kyc_checkpoint_write_seconds",
+    "Time to serialize and store one graph checkpoint, including pruning",
+    ["backend"],
+    buckets=CHECKPOINT_SECONDS_BUCKETS
+)
+CHECKPOINT_BYTES = Histogram(
+    "kyc_checkpoint_bytes",
+    "Size of a stored graph checkpoint after compression",
+    ["backend"],
+    buckets=CHECKPOINT_BYTES_BUCKETS
+)
+
+SUMMARIZATION_LAG_SECONDS = Histogram(
+    "kyc_summarization_lag_seconds",
+    "Time from the end of a session's debounce window until its episodic memory summary was written",
+    buckets=SUMMARIZATION_LAG_BUCKETS
+)
+
+
+@dataclass
+class TokenUsage:
+    """Filled in by an LLM backend from `response.usage`."""
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+
+@contextmanager
+def track_llm_call(call_site: str, model_id: str):
+    """
+    Times one upstream request and records its tokens and errors.
+    Yields a TokenUsage for the backend to fill in. Cancelled requests (hedge losers, dropped clients)
+    are timed with outcome="cancelled" and do not count as errors.
+    """
+    call_site = call_site or "default"
+    usage = TokenUsage()
+    started = time.perf_counter()
+    outcome = "success"
+    try:
+        yield usage
+    except Exception as e:
+        outcome = "error"
+        LLM_ERRORS.labels(call_site, model_id, type(e).__name__).inc()
+        raise
+    except BaseException:
+        outcome = "cancelled"
+        raise
+    finally:
+        LLM_REQUEST_SECONDS.labels(call_site, model_id, outcome).observe(time.perf_counter() - started)
+        if usage.prompt_tokens:
+            LLM_TOKENS.labels(call_site, model_id, "prompt").inc(usage.prompt_tokens)
+        if usage.completion_tokens:
+            LLM_TOKENS.labels(call_site, model_id, "completion").inc(usage.completion_tokens)
+
+
+def record_checkpoint_write(backend: str, size_bytes: int, seconds: float) -> None:
+    CHECKPOINT_WRITE_SECONDS.labels(backend).observe(seconds)
+    CHECKPOINT_BYTES.labels(backend).observe(size_bytes)
+
+
+def record_summarization_lag(seconds: float) -> None:
+    SUMMARIZATION_LAG_SECONDS.observe(seconds)
+
+
+class ComponentStatsCollector:
+    """Exports the `stats()` counters of process-wide components at scrape time."""
+
+    def describe(self):
+        # Keeps registration from calling collect(), which would build the singletons at import
+        return []
+
+    def collect(self):
+        # Imported lazily so that importing this module never builds the singletons
+        from llm.cache import get_response_cache
+        from llm.singleflight import get_single_flight
+        from llm.scheduler import get_llm_scheduler
+        from llm.hedging import get_hedger
+        from llm.tiering import get_model_policy
+        from orchestrator.fast_path import step_intent_classifier
+        from tools.pan_tools import pan_details_extractor
+        from tools.faq_index import get_faq_index
+        from agent.checkpointer import get_checkpointer
+        from app.session_reaper import get_session_reaper
+        from app.session_store import get_session_store
+        from memory.redis_client import get_redis_pool_stats
+        from memory.summarizer import get_summarization_worker
+
+        cache = get_response_cache()
+        if cache is not None:
+            cache_stats = cache.stats()
+            lookups = CounterMetricFamily("kyc_llm_cache_lookups", "LLM response cache lookups", labels=["result"])
+            lookups.add_metric(["hit"], cache_stats["hits"])
+            lookups.add_metric(["miss"], cache_stats["misses"])
+            yield lookups
+            yield CounterMetricFamily("kyc_llm_cache_disk_hits", "LLM response cache hits served from disk", value=cache_stats["disk_hits"])
+            yield GaugeMetricFamily("kyc_llm_cache_entries", "Entries in the in-memory LLM response cache", value=cache_stats["size"])
+
+        single_flight = get_single_flight().stats()
+        yield CounterMetricFamily("kyc_llm_coalesced_calls", "LLM calls that joined an identical in-flight request", value=single_flight["coalesced"])
+
+        scheduler = get_llm_scheduler().stats()
+        admitted = CounterMetricFamily("kyc_llm_scheduler_admitted", "LLM requests admitted by the scheduler", labels=["priority"])
+        for priority, count in scheduler["admitted"].items():
+            admitted.add_metric([priority], count)
+        yield admitted
+        yield CounterMetricFamily("kyc_llm_scheduler_dropped", "Background LLM requests dropped after waiting too long", value=scheduler["dropped"])
+        depth = GaugeMetricFamily("kyc_llm_queue_depth", "LLM requests waiting for a slot", labels=["model"])
+        active = GaugeMetricFamily("kyc_llm_active_requests", "LLM requests holding a slot", labels=["model"])
+        for model_id, queue in scheduler["models"].items():
+            depth.add_metric([model_id], queue["queue_depth"])
+            active.add_metric([model_id], queue["active"])
+        yield depth
+        yield active
+
+        hedger = get_hedger().stats()
+        yield CounterMetricFamily("kyc_llm_hedges", "Hedged duplicate LLM requests sent", value=hedger["hedges"])
+        yield CounterMetricFamily("kyc_llm_hedge_wins", "Hedged LLM requests that beat the original", value=hedger["hedge_wins"])
+
+        policy = get_model_policy().stats()
+        requests = CounterMetricFamily("kyc_llm_tiered_requests", "LLM requests per call site", labels=["call_site"])
+        escalations = CounterMetricFamily("kyc_llm_escalations", "LLM requests escalated to a stronger model", labels=["call_site"])
+        for call_site, site_stats in policy["call_sites"].items():
+            requests.add_metric([call_site], site_stats["requests"])
+            escalations.add_metric([call_site], site_stats["escalations"])
+        yield requests
+        yield escalations
+
+        fast_paths = CounterMetricFamily("kyc_fast_path_lookups", "Deterministic parsing ahead of the LLM", labels=["parser", "result"])
+        for parser, stats in (("intent", step_intent_classifier.stats()), ("pan_details", pan_details_extractor.stats())):
+            fast_paths.add_metric([parser, "hit"], stats["hits"])
+            fast_paths.add_metric([parser, "miss"], stats["misses"])
+        yield fast_paths
+
+        faq_index = get_faq_index()
+        if faq_index is not None:
+            faq_stats = faq_index.stats()
+            lookups = CounterMetricFamily("kyc_faq_lookups", "General queries looked up in the FAQ index", labels=["result"])
+            lookups.add_metric(["hit"], faq_stats["hits"])
+            lookups.add_metric(["miss"], faq_stats["misses"])
+            yield lookups
+            yield CounterMetricFamily("kyc_faq_query_seconds", "Time spent scoring FAQ lookups", value=faq_stats["query_seconds"])
+            yield GaugeMetricFamily("kyc_faq_load_seconds", "Time taken to build the FAQ index", value=faq_stats["load_seconds"])
+            yield GaugeMetricFamily("kyc_faq_entries", "Entries in the FAQ index", value=faq_stats["entries"])
+
+        checkpointer = get_checkpointer().stats()
+        yield CounterMetricFamily("kyc_checkpoints_pruned", "Old graph checkpoints dropped to keep the latest per session", value=checkpointer["checkpoints_pruned"])
+
+        reaper = get_session_reaper().stats()
+        evictions = CounterMetricFamily("kyc_sessions_evicted", "Sessions evicted by the reaper", labels=["reason"])
+        for reason, count in reaper["evicted"].items():
+            evictions.add_metric([reason], count)
+        yield evictions
+        yield CounterMetricFamily("kyc_session_release_failures", "Evicted sessions whose checkpoints or memory could not be dropped", value=reaper["release_failures"])
+        yield GaugeMetricFamily("kyc_resident_sessions", "Sessions in the session store at the last sweep", value=reaper["resident_sessions"])
+
+        session_store = get_session_store().stats()
+        yield CounterMetricFamily("kyc_session_conflicts", "Session saves rejected because another request saved the session first", value=session_store["conflicts"])
+        yield CounterMetricFamily("kyc_session_lock_timeouts", "Turns rejected after waiting too long for the session's previous turn", value=session_store["lock_timeouts"])
+
+        redis_pool = get_redis_pool_stats()
+        if redis_pool is not None:
+            connections = GaugeMetricFamily("kyc_redis_pool_connections", "Connections in the shared Redis pool", labels=["state"])
+            connections.add_metric(["in_use"], redis_pool["in_use"])
+            connections.add_metric(["idle"], redis_pool["idle"])
+            yield connections
+            yield GaugeMetricFamily("kyc_redis_pool_max_connections", "Size limit of the shared Redis pool", value=redis_pool["max_connections"])
+            yield GaugeMetricFamily("kyc_redis_pool_peak_in_use", "Most Redis connections in use at once", value=redis_pool["peak_in_use"])
+            yield CounterMetricFamily("kyc_redis_pool_acquired", "Redis connections checked out of the shared pool", value=redis_pool["acquired"])
+            yield CounterMetricFamily("kyc_redis_pool_wait_seconds", "Time spent checking out Redis connections, including waits for a free one", value=redis_pool["wait_seconds"])
+            yield CounterMetricFamily("kyc_redis_pool_exhausted", "Redis checkouts that timed out with every connection in use", value=redis_pool["exhausted"])
+
+        summarizer = get_summarization_worker().stats()
+        yield GaugeMetricFamily("kyc_summarization_queue_depth", "Sessions waiting for an episodic memory summary", value=summarizer["queued"])
+        yield GaugeMetricFamily("kyc_summarization_in_flight", "Episodic memory summaries being written", value=summarizer["in_flight"])
+        yield GaugeMetricFamily("kyc_summarization_oldest_wait_seconds", "How long the longest-waiting session has been due for a summary", value=summarizer["oldest_wait_seconds"])
+        summaries = CounterMetricFamily("kyc_summarizations", "Episodic memory summarization requests", labels=["outcome"])
+        for outcome in ("completed", "deferred", "failed", "coalesced", "dropped"):
+            summaries.add_metric([outcome], summarizer[outcome])
+        yield summaries
+
+
+REGISTRY.register(ComponentStatsCollector())
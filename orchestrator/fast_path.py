@@ -0,0 +1,109 @@
+# Deterministic intent pre-classifier.
+# Most turns are plain data entry (an Aadhaar number, an OTP, a PAN, a yes/no, an income figure)
+# answering a question the active workflow just asked. For those the intent is obvious from
+# `kyc_step` alone, so we skip the LLM round trip and hand back an OrchestratorDecision directly.
+
+import re
+from typing import Optional
+
+from state import OverallState
+from models.intent import OrchestratorDecision, UserIntent
+
+AADHAAR_PATTERN = re.compile(r"^\d{4}[\s-]?\d{4}[\s-]?\d{4}$")
+OTP_PATTERN = re.compile(r"^\d{3}\s?\d{3}$")
+DIGITS_PATTERN = re.compile(r"^[\d\s-]+$")
+PAN_PATTERN = re.compile(r"^[A-Z]{5}[0-9]{4}[A-Z]$", re.IGNORECASE)
+PAN_IN_TEXT_PATTERN = re.compile(r"\b[A-Z]{5}[0-9]{4}[A-Z]\b", re.IGNORECASE)
+INTEGER_PATTERN = re.compile(r"^\d+$")
+YES_PATTERN = re.compile(r"^(yes|yes please|yes,? (it is|it's|that's|they are) (correct|right))[\s.!]*$", re.IGNORECASE)
+NO_PATTERN = re.compile(r"^(no|nope|no,? (it is|it's|that's|they are) (not correct|wrong|incorrect))[\s.!]*$", re.IGNORECASE)
+
+# Steps where the workflow asked for a number and will validate it itself
+DIGIT_STEPS = {"awaiting_aadhaar_input", "awaiting_otp_input"}
+YES_NO_STEPS = {
+    "awaiting_aadhaar_confirmation",
+    "awaiting_aadhar_details_acknowledgement",
+    "awaiting_pan_confirmation",
+    "awaiting_pan_details_acknowledgement",
+    "awaiting_dl_details_acknowledgement",
+    "awaiting_passport_details_acknowledgement",
+}
+INCOME_STEPS = {"awaiting_form60_agriculture_income", "awaiting_form60_other_source_income"}
+# The router hands these steps to the PAN probe regardless of intent
+PROBE_STEPS = {"awaiting_pan_probe_response", "awaiting_final_pan_decision"}
+
+
+class StepIntentClassifier:
+    """
+    Rule-based intent classifier keyed on the current `kyc_step`.
+    Returns a decision only when the message is unambiguous; otherwise None, and the caller
+    falls back to the LLM.
+    """
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    def classify(self, state: OverallState, user_message: str) -> Optional[OrchestratorDecision]:
+        decision = self._classify(state, (user_message or "").strip())
+        if decision is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return decision
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
+    def _classify(self, state: OverallState, message: str) -> Optional[OrchestratorDecision]:
+        kyc_step = state.get("kyc_step")
+        if not kyc_step or not message or "?" in message:
+            return None
+
+        if kyc_step in PROBE_STEPS:
+            return self._decision(UserIntent.CONTINUE_ACTIVE_WORKFLOW, True, kyc_step, "probe answer")
+
+        if not state.get("active_workflow"):
+            return None
+
+        if kyc_step == "awaiting_aadhaar_input" and AADHAAR_PATTERN.match(message):
+            return self._decision(UserIntent.CONTINUE_ACTIVE_WORKFLOW, True, kyc_step, "12-digit Aadhaar number")
+
+        if kyc_step == "awaiting_otp_input" and OTP_PATTERN.match(message):
+            return self._decision(UserIntent.CONTINUE_ACTIVE_WORKFLOW, True, kyc_step, "6-digit OTP")
+
+        if kyc_step in DIGIT_STEPS and DIGITS_PATTERN.match(message):
+            # Wrong length, but still clearly an attempt at the number; the workflow handles retries
+            return self._decision(UserIntent.CONTINUE_ACTIVE_WORKFLOW, True, kyc_step, "numeric input")
+
+        if kyc_step == "awaiting_pan_input_prefilled" and PAN_PATTERN.match(message):
+            return self._decision(UserIntent.CONTINUE_ACTIVE_WORKFLOW, True, kyc_step, "PAN number")
+
+        if kyc_step == "awaiting_pan_input_manual" and PAN_IN_TEXT_PATTERN.search(message):
+            return self._decision(UserIntent.CONTINUE_ACTIVE_WORKFLOW, True, kyc_step, "PAN details")
+
+        if kyc_step in INCOME_STEPS and INTEGER_PATTERN.match(message):
+            return self._decision(UserIntent.CONTINUE_ACTIVE_WORKFLOW, True, kyc_step, "income amount")
+
+        if kyc_step in YES_NO_STEPS:
+            if YES_PATTERN.match(message):
+                return self._decision(UserIntent.PROVIDE_CONFIRMATION_YES, False, kyc_step, "yes")
+            if NO_PATTERN.match(message):
+                return self._decision(UserIntent.PROVIDE_CONFIRMATION_NO, False, kyc_step, "no")
+
+        return None
+
+    def _decision(self, intent: UserIntent, provides_data: bool, kyc_step: str, matched: str) -> OrchestratorDecision:
+        return OrchestratorDecision(
+            intent=intent,
+            argument=None,
+            user_provides_data=provides_data,
+            reason=f"Fast path: '{matched}' at step '{kyc_step}'"
+        )
+
+
+step_intent_classifier = StepIntentClassifier()
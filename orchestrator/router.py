@@ -3,29 +3,33 @@
 
 from typing import Tuple, Literal
 
-from agent.kyc_agent import KYCManagerAgent
-from agent.genral_query_agent import GeneralQueryAgent
-from agent.pan_check_agent import PanCheckAgent
+from agent.kyc_agent import get_kyc_manager
+from agent.genral_query_agent import get_general_query_agent
+from agent.pan_check_agent import get_pan_check_agent
+from agent.base_agent import EventCallback
 from state import OverallState
 from models.intent import OrchestratorDecision, UserIntent
-from llm import LLMFactory 
+from llm import get_llm_factory
 from prompts.orchestrate import ORCHESTRATOR_PROMPT_TEMPLATE, FORM60_ROUTE_PROMPT
 from memory.memory import MemoryManager
+from orchestrator.fast_path import step_intent_classifier
 
 class MainOrchestrator:
     """
     The central routing agent for the entire system.
     It determines the user's high-level intent and delegates tasks to the appropriate manager agents.
+    One orchestrator is created per session, but the agents behind it are process-wide singletons,
+    so creating one is cheap.
     """
     def __init__(
         self,
         memory_client: MemoryManager
     ):
 
-        self.llm_client = LLMFactory()
-        self.kyc_manager = KYCManagerAgent()
-        self.general_query_agent = GeneralQueryAgent()
-        self.pan_check_agent = PanCheckAgent()
+        self.llm_client = get_llm_factory()
+        self.kyc_manager = get_kyc_manager()
+        self.general_query_agent = get_general_query_agent()
+        self.pan_check_agent = get_pan_check_agent()
         self.fallback_message = (
             "I'm sorry, I didn't quite understand that. Could you please rephrase?"
             "Shall we continue the current process"
@@ -38,7 +42,7 @@ class MainOrchestrator:
         to reliably determine the user's intent.
         """      
         # memory_context = self.memory_manager.get_memory_context(user_message)
-        memory_context = self.memory_manager.get_memory_context(
+        memory_context = await self.memory_manager.get_memory_context(
             query=user_message
         )
         
@@ -53,44 +57,57 @@ class MainOrchestrator:
         )
         
         try:
-            return self.llm_client._get_structured_response(
+            return await self.llm_client._get_structured_response(
                 # model_id="gemini-2.5-pro",
                 human_prompt = user_message, 
                 parser = OrchestratorDecision, 
-                sys_prompt = prompt
+                sys_prompt = prompt,
+                use_cache = False, # prompt carries the session's memory context
+                hedge = True, # on the critical path of every LLM-routed turn
+                call_site = "intent"
             )
         except Exception as e:
             print(f"Error during intent recognition: {e}")
             return OrchestratorDecision(intent=UserIntent.UNKNOWN, user_provides_data=False)
 
-    async def _start_workflow(self, workflow_name: Literal["aadhaar", "pan", "form60"], state: OverallState, user_message: str) -> Tuple[OverallState, str]:
+    async def _start_workflow(self, workflow_name: Literal["aadhaar", "pan", "form60"], state: OverallState, user_message: str, on_event: EventCallback = None) -> Tuple[OverallState, str]:
         state['active_workflow'] = workflow_name
         message_for_agent = "" if state.get("kyc_step") is None else user_message
         
-        updated_state, answer = await self.kyc_manager.delegate_to_specialist(state, message_for_agent)
+        updated_state, answer = await self.kyc_manager.delegate_to_specialist(state, message_for_agent, on_event)
         updated_state["ai_response"] = answer
         return updated_state, answer
 
-    async def route(self, state: OverallState, user_message: str) -> Tuple[OverallState, str]:
+    async def route(self, state: OverallState, user_message: str, on_event: EventCallback = None) -> Tuple[OverallState, str]:
         """
         The main entry point for the orchestrator.
-        1. Gets the structured intent from the LLM.
+        1. Gets the structured intent, from the step-aware fast path when the message is
+           plain data entry, otherwise from the LLM.
         2. Routes to the appropriate manager based on the intent.
         3. Returns the updated state and the response to the user.
+        `on_event` (optional) receives progress events and streamed answer tokens as the turn runs.
         """
         state['input_message'] = user_message
-        decision = await self._get_intent(state, user_message)
+        decision = step_intent_classifier.classify(state, user_message)
+        fast_path = decision is not None
+        if decision is None:
+            decision = await self._get_intent(state, user_message)
         current_kyc_step = state.get("kyc_step")
 
+        if on_event:
+            await on_event({"type": "progress", "stage": "intent", "intent": decision.intent.name, "fast_path": fast_path})
+
         print("\n", "*"*35, "\n", decision.intent, "\n", "*"*35,)
 
         if current_kyc_step == "awaiting_pan_probe_response":
+            if on_event:
+                await on_event({"type": "progress", "stage": "pan_check"})
             final_state, response_message = await self.pan_check_agent.handle_step(state, user_message)
             final_state["ai_response"] = response_message
             return final_state, response_message
         
         if current_kyc_step == "awaiting_final_pan_decision":
-            final_state, response_message = await self._start_workflow("pan" if "yes" in user_message.lower() else "form60", state, user_message)
+            final_state, response_message = await self._start_workflow("pan" if "yes" in user_message.lower() else "form60", state, user_message, on_event)
             return final_state, response_message
         
         all_required_workflows = {"aadhaar", "pan", "passport", "dl"} 
@@ -123,22 +140,22 @@ class MainOrchestrator:
         match decision.intent:
             case UserIntent.START_AADHAAR_VERIFICATION:
                 state['active_workflow'] = 'aadhaar'
-                final_state, response_message = await self.kyc_manager.delegate_to_specialist(state, user_message)
+                final_state, response_message = await self.kyc_manager.delegate_to_specialist(state, user_message, on_event)
                 final_state["ai_response"] = response_message
                 
             case UserIntent.START_PAN_VERIFICATION:
                 state['active_workflow'] = 'pan'
-                final_state, response_message = await self.kyc_manager.delegate_to_specialist(state, user_message)
+                final_state, response_message = await self.kyc_manager.delegate_to_specialist(state, user_message, on_event)
                 final_state["ai_response"] = response_message
 
             case UserIntent.START_PASSPORT_VERIFICATION:
                 state['active_workflow'] = 'passport'
-                final_state, response_message = await self.kyc_manager.delegate_to_specialist(state, user_message)
+                final_state, response_message = await self.kyc_manager.delegate_to_specialist(state, user_message, on_event)
                 final_state["ai_response"] = response_message
             
             case UserIntent.START_DL_VERIFICATION:
                 state['active_workflow'] = 'dl'
-                final_state, response_message = await self.kyc_manager.delegate_to_specialist(state, user_message)
+                final_state, response_message = await self.kyc_manager.delegate_to_specialist(state, user_message, on_event)
                 final_state["ai_response"] = response_message
 
             case UserIntent.START_FORM60_VERIFICATION:
@@ -146,13 +163,13 @@ class MainOrchestrator:
                     response_message = "You have completed this verification step. You need not do it again."
                 
                 state["active_workflow"] = "form60"
-                return await self._start_workflow("form60", state, user_message)
+                return await self._start_workflow("form60", state, user_message, on_event)
 
             case UserIntent.CONTINUE_ACTIVE_WORKFLOW:
                 if not state.get("active_workflow"):
                     return state, "I'm sorry, I'm not sure which process you want to continue. Could you clarify?"
                 
-                final_state, response_message = await self.kyc_manager.delegate_to_specialist(state, user_message)
+                final_state, response_message = await self.kyc_manager.delegate_to_specialist(state, user_message, on_event)
                 final_state["ai_response"] = response_message
             
             case UserIntent.PROVIDE_CONFIRMATION_NO:
@@ -164,7 +181,7 @@ class MainOrchestrator:
                     return updated_state, answer
 
                 # Otherwise, a workflow is active, and "no" is a response within that workflow.
-                updated_state, answer = await self.kyc_manager.delegate_to_specialist(state, user_message)
+                updated_state, answer = await self.kyc_manager.delegate_to_specialist(state, user_message, on_event)
                 updated_state["ai_response"] = answer
                 return updated_state, answer
             
@@ -176,14 +193,14 @@ class MainOrchestrator:
                     if remaining:
                         next_workflow = remaining.pop(0)
                         updated_state['active_workflow'] = next_workflow
-                        updated_state, answer = await self.kyc_manager.delegate_to_specialist(state, "")
+                        updated_state, answer = await self.kyc_manager.delegate_to_specialist(state, "", on_event)
                         updated_state["ai_response"] = answer
                     else:
                         updated_state = state
                         answer = "Great! All KYC steps are complete. Is there anything else I can help with?"
                 else:
                     # If a workflow is active, delegate the "yes" to the specialist.
-                    updated_state, answer = await self.kyc_manager.delegate_to_specialist(state, user_message)
+                    updated_state, answer = await self.kyc_manager.delegate_to_specialist(state, user_message, on_event)
                     updated_state["ai_response"] = answer
 
                 return updated_state, answer
@@ -191,7 +208,7 @@ class MainOrchestrator:
             case UserIntent.ASK_GENERAL_QUESTION:
                 # Note: This call does not modify the KYC state.
                 question = decision.argument or user_message
-                _updated_state, answer = await self.general_query_agent.handle_step(state, question)
+                _updated_state, answer = await self.general_query_agent.handle_step(state, question, on_event)
                 
                 # After answering, guide the user back to their pending task.
                 guidance = self._get_guidance_message(state)
@@ -221,11 +238,13 @@ class MainOrchestrator:
                 if not state.get("pan_probe_complete"):
                     # Start the PAN check probe workflow
                     state["active_workflow"] = "pan_check"
+                    if on_event:
+                        await on_event({"type": "progress", "stage": "pan_check"})
                     updated_state, answer = await self.pan_check_agent.handle_step(state, user_message)
                     updated_state["ai_response"] = answer
                     return updated_state, answer
                 else:
-                    return await self._start_workflow("form60", state, user_message)
+                    return await self._start_workflow("form60", state, user_message, on_event)
 
             case UserIntent.PROCEED_WITH_FORM60:
                 final_state = state
@@ -257,12 +276,18 @@ class MainOrchestrator:
                     response_message = fallback_message  # ← Only set here
                     final_state = state
                     
-        self.memory_manager.add_turn(user_message, response_message, state["active_workflow"])
+        await self.memory_manager.add_turn(user_message, response_message, state["active_workflow"])
         return final_state, response_message
+
+    @staticmethod
+    async def clear_session(session_id: str) -> None:
+        """Drops the session's workflow checkpoints from the shared agents (on session end or reset)."""
+        await get_kyc_manager().clear_session(session_id)
+        await get_pan_check_agent().clear_session(session_id)
     
     async def _handle_pan_probe_response(self, state: OverallState, user_message: str) -> Tuple[OverallState, str]:
         system_prompt = FORM60_ROUTE_PROMPT.format(question=state["ai_response"], user_message=user_message)
-        message = self.llm_client._get_normal_response(human_prompt=user_message, sys_prompt=system_prompt)
+        message = await self.llm_client._get_normal_response(human_prompt=user_message, sys_prompt=system_prompt, use_cache=False, call_site="form60_route")
         
         if "yes" in message.lower():
             state["kyc_step"] = "awaiting_final_pan_decision"
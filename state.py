@@ -1,4 +1,4 @@
-from typing_extensions import TypedDict, Optional, List, Dict, Literal
+from typing_extensions import TypedDict, Optional, List, Dict, Literal, cast
 from pydantic import BaseModel, Field
 
 
@@ -37,8 +37,14 @@ class Form60Data(TypedDict, total=False):
     agricultural_income: int
     other_income: int
 
-class OverallState(TypedDict):
+class OverallState(TypedDict, total=False):
+    """
+    Session-level state shared by the orchestrator and the specialist agents.
+    Create it with `new_overall_state`; store it with `encode_state` / `decode_state`.
+    """
     session_id: str
+    input_message: str
+    ai_response: str
     active_workflow: Optional[str]
     completed_workflows: List[str]
     kyc_step: Optional[str] # e.g., 'awaiting_pan_input', 'awaiting_confirmation'
@@ -49,17 +55,95 @@ class OverallState(TypedDict):
     # --- Logging & Context ---
     last_user_message: str
     last_agent_response: str
+    human_response: str # Placeholder for human-in-the-loop
     
     # --- Data Payloads from Specialist Agents ---
     aadhar_details: AadharDetailsState
     pan_details: PANDetailsState
     Form_60: Form60Data
     passport_details: PassportDetailsState
+    dl_details: DLDetailsState
     # voterId_details: VoterIdDetailsState # For future use
 
     # --- Verification Status Payloads ---
     aadhar_verification_status: VerificationState
     pan_verification_status: VerificationState
+    match: Optional[bool]
+
+    # --- Retry Counters ---
+    aadhar_retries: int
+    pan_retries: int
+    form60_retries: int
+    passport_retries: int
+    dl_retries: int
+
+# Wire layout of OverallState for `state_to_compact`: a field's position is its bit in the presence mask.
+# Append new fields only; removing or reordering one means bumping STATE_LAYOUT_VERSION.
+STATE_LAYOUT_VERSION = 2
+STATE_FIELDS = (
+    "session_id", "input_message", "ai_response", "active_workflow", "completed_workflows", "kyc_step",
+    "pan_probe_complete", "last_user_message", "last_agent_response", "human_response",
+    "aadhar_details", "pan_details", "Form_60", "passport_details", "dl_details",
+    "aadhar_verification_status", "pan_verification_status", "match",
+    "aadhar_retries", "pan_retries", "form60_retries", "passport_retries", "dl_retries",
+)
+_FIELD_SET = frozenset(STATE_FIELDS)
+
+
+def new_overall_state(session_id: str, greeting: str = "") -> OverallState:
+    """The state a session starts with, for the API and the CLI alike."""
+    return cast(OverallState, {
+        "session_id": session_id,
+        "input_message": "",
+        "ai_response": greeting,
+        "active_workflow": None,
+        "kyc_step": None,
+        "completed_workflows": [],
+        
+        # Specialist Agent States
+        "aadhar_details": {},
+        "aadhar_verification_status": {},
+        "aadhar_retries": 0,
+        
+        "pan_details": {},
+        "pan_verification_status": {},
+        "pan_retries": 0,
+        "match": None,
+        
+        "Form_60": {},
+        
+        "human_response": ""
+    })
+
+
+def state_to_compact(state: OverallState) -> list:
+    """
+    [layout version, presence mask, values of the present fields in layout order, extra keys or None].
+    Field names are not repeated per session; keys outside the layout still round-trip via the extras map.
+    """
+    mask = 0
+    values = []
+    for position, name in enumerate(STATE_FIELDS):
+        if name in state:
+            mask |= 1 << position
+            values.append(state[name])
+    extras = {key: value for key, value in state.items() if key not in _FIELD_SET} or None
+    return [STATE_LAYOUT_VERSION, mask, values, extras]
+
+
+def state_from_compact(compact: list) -> OverallState:
+    version, mask, values, extras = compact
+    if version != STATE_LAYOUT_VERSION:
+        raise ValueError(f"Unknown OverallState layout version {version}")
+    state = {}
+    present = iter(values)
+    for position, name in enumerate(STATE_FIELDS):
+        if mask >> position & 1:
+            state[name] = next(present)
+    if extras:
+        state.update(extras)
+    return cast(OverallState, state)
+
 
 class PanGraphState(TypedDict):
     """The state object that is passed between nodes in the PAN workflow graph."""
@@ -71,6 +155,9 @@ class PanGraphState(TypedDict):
     pan_details: dict
     retries: int
     decision: Optional[str]
+    correction: bool # the user rejected the parsed details and is re-entering them
+    nsdl_verification_count: int
+    full_workflow_retry: int # image uploads attempted
 
     last_executed_node: str
     response_to_user: str
@@ -89,6 +176,7 @@ class AadharGraphState(TypedDict):
     otp_retries: int
     aadhaar_no: str
     verified_data: Optional[Dict] # Temporarily hold data before committing to OverallState
+    full_workflow_retry: int # image uploads attempted
     
     # The final output to be sent to the user
     response_to_user: str
@@ -119,6 +207,7 @@ class PassportGraphState(TypedDict):
     
     # Internal State
     passport_details: PassportDetailsState
+    full_workflow_retry: int # image uploads attempted
     
     # Execution Tracking
     last_executed_node: str
@@ -134,6 +223,7 @@ class DLGraphState(TypedDict):
     
     # Internal State
     dl_details: DLDetailsState
+    full_workflow_retry: int # image uploads attempted
     
     # Execution Tracking
     last_executed_node: str
@@ -139,7 +139,7 @@ document.addEventListener('DOMContentLoaded', () => {
     }
 
     /**
-     * Sends a message to the backend
+     * Sends a message to the backend and renders the streamed reply as it arrives
      * @param {string} message - The user's message
      */
     async function sendMessage(message) {
@@ -148,9 +148,12 @@ document.addEventListener('DOMContentLoaded', () => {
             return;
         }
 
+        let botText = null;
+        let streamed = '';
+
         try {
             showTypingIndicator();
-            const response = await fetch(`${API_BASE_URL}/chat`, {
+            const response = await fetch(`${API_BASE_URL}/chat/stream`, {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
                 body: JSON.stringify({ message, session_id: sessionId }),
@@ -160,8 +163,24 @@ document.addEventListener('DOMContentLoaded', () => {
                 throw new Error(`HTTP error! status: ${response.status}`);
             }
 
-            const data = await response.json();
-            addMessage('bot', data.response_to_user);
+            await readEventStream(response, (event, data) => {
+                if (event === 'token') {
+                    if (!botText) {
+                        hideTypingIndicator();
+                        botText = addMessage('bot', '');
+                    }
+                    streamed += data.content;
+                    updateMessage(botText, streamed);
+                } else if (event === 'final') {
+                    if (botText) {
+                        updateMessage(botText, data.response_to_user);
+                    } else {
+                        addMessage('bot', data.response_to_user);
+                    }
+                } else if (event === 'error') {
+                    throw new Error(data.detail);
+                }
+            });
         } catch (error) {
             console.error('Error sending message:', error);
             addMessage('bot', 'An error occurred. Please try again.');
@@ -170,6 +189,37 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     }
 
+    /**
+     * Reads a Server-Sent Events response body, calling onEvent(event, data) for every frame
+     * @param {Response} response - The fetch response
+     * @param {function(string, object): void} onEvent - Frame handler
+     */
+    async function readEventStream(response, onEvent) {
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const frame = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+
+                let event = 'message';
+                let data = '';
+                for (const line of frame.split('\n')) {
+                    if (line.startsWith('event:')) event = line.slice(6).trim();
+                    else if (line.startsWith('data:')) data += line.slice(5).trim();
+                }
+                if (data) onEvent(event, JSON.parse(data));
+            }
+        }
+    }
+
     // --- UI Helper Functions ---
 
     /**
@@ -208,6 +258,19 @@ document.addEventListener('DOMContentLoaded', () => {
         
         chatWindow.appendChild(messageElement);
         scrollToBottom();
+        return messageText;
+    }
+
+    /**
+     * Re-renders a bot message in place, keeping its timestamp
+     * @param {HTMLElement} messageText - The element returned by addMessage
+     * @param {string} text - The full message content so far
+     */
+    function updateMessage(messageText, text) {
+        const timestamp = messageText.querySelector('.timestamp');
+        messageText.innerHTML = md.render(text);
+        messageText.appendChild(timestamp);
+        scrollToBottom();
     }
 
     function formatText(text) {
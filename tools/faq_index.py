@@ -0,0 +1,187 @@
+# In-process retrieval over vetted insurance Q&A pairs.
+# GeneralQueryAgent checks this index before going to the LLM: a confident match is answered
+# straight from the file, and anything else (no match, weak match) still goes to the model.
+# Scoring is plain BM25 over normalized tokens, so there is no vector DB or embedding call.
+
+import json
+import logging
+import math
+import os
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from config.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+CONTRACTION_PATTERN = re.compile(r"n['’]t\b|['’](s|re|ve|ll|d|m)\b")
+STOPWORDS = {
+    "a", "an", "the", "is", "are", "was", "were", "be", "been", "am", "do", "does", "did", "i", "me", "my",
+    "we", "our", "you", "your", "it", "its", "of", "in", "on", "at", "to", "for", "by", "with", "and", "or",
+    "what", "which", "who", "how", "can", "could", "would", "should", "will", "shall", "there", "this", "that",
+    "these", "those", "if", "about", "please", "tell", "explain", "mean", "meant", "any", "some", "so", "as",
+    "from", "into", "get", "have", "has", "need", "want", "know", "ria",
+}
+
+
+def _stem(token: str) -> str:
+    # Light suffix stripping; enough to match "claims"/"claim" and "covered"/"cover"
+    for suffix, replacement in (("ies", "y"), ("ing", ""), ("ed", ""), ("es", ""), ("s", "")):
+        if len(token) > len(suffix) + 3 and token.endswith(suffix):
+            return token[: -len(suffix)] + replacement
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    text = CONTRACTION_PATTERN.sub(lambda m: " not" if m.group(0)[0] == "n" else "", (text or "").lower())
+    return [_stem(token) for token in TOKEN_PATTERN.findall(text) if token not in STOPWORDS]
+
+
+@dataclass
+class FaqMatch:
+    answer: str
+    question: str
+    entry_id: str
+    confidence: float
+
+
+class FaqIndex:
+    """
+    BM25 index over the questions (and paraphrases) of a FAQ file:
+        [{"id": "...", "questions": ["...", ...], "answer": "..."}, ...]
+
+    `lookup` returns the best entry only when its confidence clears `min_confidence`, where
+    confidence is the smaller of
+    - the BM25 score relative to the matched question scored against itself, and
+    - the share of the query's IDF weight that the matched question contains,
+    so a short query that only shares a generic word, or a long query that merely contains a
+    FAQ question, both fall through to the LLM.
+    """
+    def __init__(self, entries: List[Dict], min_confidence: float = 0.6, k1: float = 1.5, b: float = 0.75):
+        self.min_confidence = min_confidence
+        self.k1 = k1
+        self.b = b
+
+        started = time.perf_counter()
+        self.entries = entries
+        # One document per question; several documents can point at the same entry
+        self.documents: List[Counter] = []
+        self.document_entries: List[int] = []
+        self.document_questions: List[str] = []
+        for position, entry in enumerate(entries):
+            for question in entry["questions"]:
+                tokens = tokenize(question)
+                if tokens:
+                    self.documents.append(Counter(tokens))
+                    self.document_entries.append(position)
+                    self.document_questions.append(question)
+
+        self.lengths = [sum(document.values()) for document in self.documents]
+        self.avg_length = sum(self.lengths) / len(self.lengths) if self.lengths else 0.0
+        document_frequency = Counter(term for document in self.documents for term in document)
+        total = len(self.documents)
+        self.idf = {
+            term: math.log(1 + (total - frequency + 0.5) / (frequency + 0.5))
+            for term, frequency in document_frequency.items()
+        }
+        self.postings: Dict[str, List[int]] = {}
+        for doc_id, document in enumerate(self.documents):
+            for term in document:
+                self.postings.setdefault(term, []).append(doc_id)
+        self.self_scores = [self._score(list(document.elements()), doc_id) for doc_id, document in enumerate(self.documents)]
+        self.load_seconds = time.perf_counter() - started
+
+        self.hits = 0
+        self.misses = 0
+        self.query_seconds = 0.0
+
+    @classmethod
+    def from_file(cls, path: str, min_confidence: float = 0.6) -> "FaqIndex":
+        with open(path, encoding="utf-8") as f:
+            entries = json.load(f)
+        return cls(entries, min_confidence)
+
+# -------------------------------------------------------------------------------------------------
+# PUBLIC FUNCTIONS
+# -------------------------------------------------------------------------------------------------
+
+    def lookup(self, query: str) -> Optional[FaqMatch]:
+        started = time.perf_counter()
+        match = self._lookup(tokenize(query))
+        self.query_seconds += time.perf_counter() - started
+        if match is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return match
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "load_seconds": self.load_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "query_seconds": self.query_seconds,
+            "avg_query_seconds": self.query_seconds / total if total else 0.0
+        }
+
+# -------------------------------------------------------------------------------------------------
+# INTERNAL FUNCTIONS
+# -------------------------------------------------------------------------------------------------
+
+    def _score(self, query_terms: List[str], doc_id: int) -> float:
+        document = self.documents[doc_id]
+        norm = self.k1 * (1 - self.b + self.b * self.lengths[doc_id] / self.avg_length)
+        score = 0.0
+        for term in query_terms:
+            frequency = document.get(term)
+            if frequency:
+                score += self.idf[term] * frequency * (self.k1 + 1) / (frequency + norm)
+        return score
+
+    def _lookup(self, query_terms: List[str]) -> Optional[FaqMatch]:
+        if not query_terms or not self.documents:
+            return None
+
+        candidates = {doc_id for term in set(query_terms) for doc_id in self.postings.get(term, ())}
+        if not candidates:
+            return None
+        scores = {doc_id: self._score(query_terms, doc_id) for doc_id in candidates}
+        best = max(scores, key=scores.get)
+
+        # Terms never seen in the FAQ get the highest IDF, so an off-index query scores low on coverage
+        max_idf = math.log(1 + (len(self.documents) + 0.5) / 0.5)
+        query_weight = sum(self.idf.get(term, max_idf) for term in set(query_terms))
+        matched_weight = sum(self.idf[term] for term in set(query_terms) if term in self.documents[best])
+        confidence = min(scores[best] / self.self_scores[best], matched_weight / query_weight)
+        if confidence < self.min_confidence:
+            return None
+
+        entry = self.entries[self.document_entries[best]]
+        return FaqMatch(
+            answer=entry["answer"],
+            question=self.document_questions[best],
+            entry_id=entry.get("id", str(self.document_entries[best])),
+            confidence=min(confidence, 1.0)
+        )
+
+
+@lru_cache
+def get_faq_index() -> Optional[FaqIndex]:
+    """Process-wide FAQ index from GENERAL_QUERY_FAQ_PATH, or None when no FAQ file is configured."""
+    settings = get_settings().general_query
+    if not settings.faq_path:
+        return None
+    if not os.path.exists(settings.faq_path):
+        logger.warning(f"FAQ file {settings.faq_path} not found; general queries go to the LLM")
+        return None
+    index = FaqIndex.from_file(settings.faq_path, settings.faq_min_confidence)
+    logger.info(f"Loaded {len(index.entries)} FAQ entries from {settings.faq_path} in {index.load_seconds * 1000:.1f} ms")
+    return index
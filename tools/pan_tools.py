@@ -1,5 +1,6 @@
     
 import re
+import datetime
 import pandas as pd
 import os
 from typing import Optional, Dict
@@ -84,4 +85,147 @@ def validate_income_format(income_str: str) -> bool:
         int(income_str)
         return True
     except ValueError:
-        return False
\ No newline at end of file
+        return False
+
+
+# --- Tool 5: Deterministic PAN Details Extraction (ahead of the LLM parser) ---
+_PAN_LABEL = r"pan(?:\s*card)?(?:\s*(?:number|no\.?|num))?"
+_NAME_LABEL = r"(?:full\s+|card\s*holder'?s?\s+)?name"
+_DOB_LABEL = r"(?:dob|d\.o\.b\.?|date\s+of\s+birth|birth\s*date)"
+_FIELD_LABEL = rf"(?:{_PAN_LABEL}|{_NAME_LABEL}|{_DOB_LABEL})"
+# A value's label is matched together with it ("PAN: ", "DOB - ", "date of birth "), so a label word is
+# only taken out of the message where it actually labels a value ("Pan Kumar" stays a name)
+PAN_NUMBER_PATTERN = re.compile(rf"(\b{_PAN_LABEL}\s*[:=\-]?\s*)?\b([A-Z]{{5}}[0-9]{{4}}[A-Z])\b", re.IGNORECASE)
+MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12
+}
+_MONTH_NAME = r"(jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?"
+_DATE_LABEL = rf"(\b{_DOB_LABEL}\s*[:=\-]?\s*)?"
+DATE_PATTERNS = [
+    # 01/01/1990, 1-1-1990, 01.01.1990, 01 01 1990
+    (re.compile(rf"{_DATE_LABEL}\b(\d{{1,2}})[/\-. ](\d{{1,2}})[/\-. ](\d{{4}})\b", re.IGNORECASE), ("day", "month", "year")),
+    # 1990-01-01
+    (re.compile(rf"{_DATE_LABEL}\b(\d{{4}})[/\-.](\d{{1,2}})[/\-.](\d{{1,2}})\b", re.IGNORECASE), ("year", "month", "day")),
+    # 1 Jan 1990, 1st January, 1990
+    (re.compile(rf"{_DATE_LABEL}\b(\d{{1,2}})(?:st|nd|rd|th)?[\s\-]+{_MONTH_NAME}[\s,\-]+(\d{{4}})\b", re.IGNORECASE), ("day", "month_name", "year")),
+    # January 1, 1990
+    (re.compile(rf"{_DATE_LABEL}\b{_MONTH_NAME}\s+(\d{{1,2}})(?:st|nd|rd|th)?,?\s+(\d{{4}})\b", re.IGNORECASE), ("month_name", "day", "year")),
+]
+# "1. PAN: ...", "2) Name: ...", "• DOB: ..." as the PAN prompts list the fields; taken out once the
+# PAN and date are, so a date's digits are never mistaken for a list number
+LIST_MARKER_PATTERN = re.compile(r"(?:^|(?<=\s))(?:\d{1,2}[.)]|•)(?=\s|$)", re.MULTILINE)
+NAME_LABEL_PATTERN = re.compile(
+    rf"\b{_NAME_LABEL}\s*[:=\-]\s*([A-Za-z][A-Za-z .']*?)\s*(?=[,;|\n]|\b{_FIELD_LABEL}\s*[:=\-]|$)",
+    re.IGNORECASE
+)
+# A label left without a value, e.g. "PAN:" with the number given elsewhere
+FIELD_LABEL_PATTERN = re.compile(rf"\b{_FIELD_LABEL}\s*[:=\-]", re.IGNORECASE)
+SEPARATOR_PATTERN = re.compile(r"[,;|\n]+")
+NAME_PATTERN = re.compile(r"^[A-Za-z][A-Za-z.']*(?:\s+[A-Za-z][A-Za-z.']*){0,4}$")
+# Words that mark a sentence rather than a bare name ("my name is ...", "it should be ...")
+FILLER_WORDS = {
+    "my", "is", "i", "i'm", "im", "am", "and", "the", "it", "its", "it's", "should", "be", "was",
+    "born", "on", "card", "number", "correct", "wrong", "incorrect", "not", "please", "change", "to", "name"
+}
+
+
+class PanDetailsExtractor:
+    """
+    Rule-based parser for manually typed PAN details, e.g. "ABCDE1234F, Ananya Sharma, 01/01/1990",
+    "PAN: ABCDE1234F | Name: Ananya Sharma | DOB - 1 Jan 1990" or the numbered "1. PAN: ... 2. Name: ...".
+    Only resolves input where every part of the message is accounted for; anything free-form
+    is left to the LLM. Dates are normalized to DD/MM/YYYY.
+    """
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    def extract(self, message: str, existing: Optional[Dict] = None) -> Optional[Dict]:
+        """
+        Returns a complete {pan_card_number, date_of_birth, pan_card_holders_name} dict or None.
+        With `existing` (correction mode), only labelled fields are accepted ("Name: ...", "DOB: ...")
+        and they replace the existing ones; a reply such as "yes" or "same" is left to the LLM.
+        """
+        fields = self._extract_fields(message or "", labelled_only=existing is not None)
+        if fields is not None and existing:
+            fields = {**{k: v for k, v in existing.items() if v}, **fields}
+
+        required = ("pan_card_number", "date_of_birth", "pan_card_holders_name")
+        if fields is None or not all(fields.get(key) for key in required):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return {key: fields[key] for key in required}
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
+    def _extract_fields(self, message: str, labelled_only: bool = False) -> Optional[Dict]:
+        fields = {}
+        remainder = message
+
+        pan_matches = list(PAN_NUMBER_PATTERN.finditer(remainder))
+        if len({m.group(2).upper() for m in pan_matches}) > 1:
+            return None
+        if labelled_only and any(not m.group(1) for m in pan_matches):
+            return None
+        if pan_matches:
+            fields["pan_card_number"] = pan_matches[0].group(2).upper()
+            remainder = PAN_NUMBER_PATTERN.sub(" ", remainder)
+
+        dates = []
+        for pattern, order in DATE_PATTERNS:
+            for match in pattern.finditer(remainder):
+                if labelled_only and not match.group(1):
+                    return None
+                dates.append(self._normalize_date(dict(zip(order, match.groups()[1:]))))
+            remainder = pattern.sub(" ", remainder)
+        if len(set(dates)) > 1 or None in dates:
+            return None
+        if dates:
+            fields["date_of_birth"] = dates[0]
+
+        remainder = LIST_MARKER_PATTERN.sub("\n", remainder)
+        labelled_names = NAME_LABEL_PATTERN.findall(remainder)
+        if len(labelled_names) > 1:
+            return None
+        if labelled_names:
+            fields["pan_card_holders_name"] = " ".join(labelled_names[0].split())
+            remainder = NAME_LABEL_PATTERN.sub(" ", remainder)
+
+        remainder = FIELD_LABEL_PATTERN.sub(" ", remainder)
+        leftovers = [part.strip(" .-:") for part in SEPARATOR_PATTERN.split(remainder)]
+        leftovers = [part for part in leftovers if part]
+
+        if leftovers:
+            # A single unlabelled chunk of plain words is the name; anything else is free-form text.
+            # Corrections take labelled fields only: a bare "yes" or "same" is not a new name.
+            if labelled_only or len(leftovers) > 1 or "pan_card_holders_name" in fields or not self._is_bare_name(leftovers[0]):
+                return None
+            fields["pan_card_holders_name"] = " ".join(leftovers[0].split())
+
+        return fields or None
+
+    def _is_bare_name(self, text: str) -> bool:
+        return bool(NAME_PATTERN.match(text)) and not any(word.lower() in FILLER_WORDS for word in text.split())
+
+    def _normalize_date(self, parts: Dict[str, str]) -> Optional[str]:
+        try:
+            if "month_name" in parts:
+                month = MONTHS[parts["month_name"][:3].lower()]
+            else:
+                month = int(parts["month"])
+            dob = datetime.date(int(parts["year"]), month, int(parts["day"]))
+        except (KeyError, ValueError):
+            return None
+        return dob.strftime("%d/%m/%Y")
+
+
+pan_details_extractor = PanDetailsExtractor()